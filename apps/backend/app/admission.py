@@ -0,0 +1,173 @@
+"""Admission control for upstream chat streams: bounded concurrency, fair queueing, fast 429s."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import os
+import time
+from collections import OrderedDict, deque
+from typing import Any, Optional
+
+
+class Saturated(Exception):
+    """No slot and no room to wait (or the wait timed out); ``retry_after`` is in whole seconds."""
+
+    def __init__(self, reason: str, retry_after: int) -> None:
+        super().__init__(reason)
+        self.retry_after = retry_after
+
+
+class Ticket:
+    """A held slot; :meth:`release` is idempotent so every exit path may call it."""
+
+    def __init__(self, controller: "AdmissionController") -> None:
+        self._controller = controller
+        self._acquired_at = time.monotonic()
+        self.released = False
+
+    def release(self) -> None:
+        if self.released:
+            return
+        self.released = True
+        self._controller._release(time.monotonic() - self._acquired_at)
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000.0, 1)
+
+
+def _percentile(values: list[float], p: float) -> Optional[float]:
+    if not values:
+        return None
+    k = min(len(values) - 1, max(0, math.ceil(p * len(values)) - 1))
+    return values[k]
+
+
+class AdmissionController:
+    """At most ``max_active`` holders; up to ``max_queue`` more wait, served round-robin by client.
+
+    Each client has its own FIFO, and a freed slot goes to the client after the one served last,
+    so one client retrying in a loop cannot starve the others. Slots are handed directly to the
+    next waiter on release (no thundering herd). All state lives on the event loop thread.
+    """
+
+    def __init__(
+        self,
+        max_active: int = 32,
+        max_queue: int = 64,
+        max_queued_per_client: int = 4,
+        queue_timeout: float = 30.0,
+    ) -> None:
+        self.max_active = max(1, max_active)
+        self.max_queue = max(0, max_queue)
+        self.max_queued_per_client = max(1, max_queued_per_client)
+        self.queue_timeout = queue_timeout
+        self._active = 0
+        self._queued = 0
+        self._waiters: OrderedDict[str, deque[asyncio.Future[None]]] = OrderedDict()
+        self._hold_avg = 5.0  # EMA of slot hold time, seconds; seeds the Retry-After estimate
+        self._waits: deque[float] = deque(maxlen=1024)
+        self.admitted = 0
+        self.queued_total = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    @classmethod
+    def from_env(cls) -> "AdmissionController":
+        return cls(
+            max_active=int(os.getenv("CHAT_MAX_CONCURRENCY", "32")),
+            max_queue=int(os.getenv("CHAT_MAX_QUEUE", "64")),
+            max_queued_per_client=int(os.getenv("CHAT_MAX_QUEUED_PER_CLIENT", "4")),
+            queue_timeout=float(os.getenv("CHAT_QUEUE_TIMEOUT", "30")),
+        )
+
+    def retry_after(self) -> int:
+        # Time for the queue ahead to drain through the active slots, at the observed hold time.
+        return max(1, math.ceil(self._hold_avg * (self._queued + 1) / self.max_active))
+
+    async def acquire(self, client: str) -> Ticket:
+        if self._active < self.max_active and self._queued == 0:
+            self._active += 1
+            self._admit(0.0)
+            return Ticket(self)
+
+        queue = self._waiters.get(client)
+        if self._queued >= self.max_queue or (queue is not None and len(queue) >= self.max_queued_per_client):
+            self.rejected += 1
+            raise Saturated("chat capacity exhausted", self.retry_after())
+
+        fut: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        if queue is None:
+            queue = self._waiters[client] = deque()
+        queue.append(fut)
+        self._queued += 1
+        self.queued_total += 1
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(fut, self.queue_timeout if self.queue_timeout > 0 else None)
+        except BaseException as e:
+            if fut.done() and not fut.cancelled():
+                # The slot was handed over just as we gave up; pass it on.
+                self._release(None)
+            else:
+                self._queued -= 1
+                self._forget(client, fut)
+            if isinstance(e, asyncio.TimeoutError):
+                self.timed_out += 1
+                raise Saturated("timed out waiting for a chat slot", self.retry_after()) from None
+            raise
+        self._admit(time.monotonic() - started)
+        return Ticket(self)
+
+    def _admit(self, waited: float) -> None:
+        self.admitted += 1
+        self._waits.append(waited)
+
+    def _forget(self, client: str, fut: asyncio.Future[None]) -> None:
+        queue = self._waiters.get(client)
+        if queue is None:
+            return
+        try:
+            queue.remove(fut)
+        except ValueError:
+            pass
+        if not queue:
+            del self._waiters[client]
+
+    def _release(self, held: Optional[float]) -> None:
+        if held is not None:
+            self._hold_avg += 0.1 * (held - self._hold_avg)
+        while self._waiters:
+            client, queue = next(iter(self._waiters.items()))
+            fut = queue.popleft()
+            if queue:
+                self._waiters.move_to_end(client)  # round-robin: this client goes to the back
+            else:
+                del self._waiters[client]
+            if not fut.done():
+                self._queued -= 1
+                fut.set_result(None)  # slot passes straight to the waiter; _active is unchanged
+                return
+        self._active -= 1
+
+    def stats(self) -> dict[str, Any]:
+        waits = sorted(self._waits)
+        return {
+            "maxActive": self.max_active,
+            "maxQueue": self.max_queue,
+            "active": self._active,
+            "queued": self._queued,
+            "waitingClients": len(self._waiters),
+            "admitted": self.admitted,
+            "queuedTotal": self.queued_total,
+            "rejected": self.rejected,
+            "timedOut": self.timed_out,
+            "holdAvgSeconds": round(self._hold_avg, 3),
+            "queueWaitMs": {
+                "p50": _ms(_percentile(waits, 0.50)),
+                "p95": _ms(_percentile(waits, 0.95)),
+                "p99": _ms(_percentile(waits, 0.99)),
+                "max": _ms(waits[-1] if waits else None),
+            },
+        }
@@ -0,0 +1,170 @@
+"""Per-session baselines for the face signals, so blink and brow thresholds fit the face and camera.
+
+During the first CALIBRATION_SECONDS of a session with a face in view, EAR and the normalized
+brow-eye distance are accumulated. The EAR baseline is the median of every sample, not of samples
+the default thresholds call open: those thresholds would cut off (or, for narrow eyes, drop
+entirely) the lower part of an open-eye distribution that sits near them. Blinks are a small
+minority of frames, so they barely move the median; samples below the blink threshold derived
+from it are then left out of the baseline mean/std. The blink thresholds and the brow reference
+are derived from those baselines. Afterwards the EAR baseline keeps following slow drift
+(lighting, distance to the camera) through an exponentially weighted update at
+CALIBRATION_ADAPT_RATE, skipping only frames the blink detector holds closed. The brow baseline
+stays fixed, since a drifting brow reference would slowly absorb sustained tension. Updates are
+O(1) per frame, plus one pass over the buffered EAR samples when calibration completes.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+import statistics
+import threading
+from typing import Any, Optional
+
+# Fallbacks used until a baseline exists (the original fixed constants).
+DEFAULT_CLOSE_TH = 0.20
+DEFAULT_OPEN_TH = 0.225
+DEFAULT_BROW_REF = 0.043
+DEFAULT_BROW_SPAN = 0.02
+
+# Blink thresholds relative to the open-eye EAR baseline; the defaults match a ~0.285 baseline.
+CLOSE_RATIO = 0.70
+OPEN_RATIO = 0.79
+# Brow span relative to the brow baseline, as in the defaults.
+BROW_SPAN_RATIO = DEFAULT_BROW_SPAN / DEFAULT_BROW_REF
+
+
+class RunningStats:
+    """Welford's online mean/variance."""
+
+    __slots__ = ("n", "mean", "m2")
+
+    def __init__(self) -> None:
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, x: float) -> None:
+        self.n += 1
+        d = x - self.mean
+        self.mean += d / self.n
+        self.m2 += d * (x - self.mean)
+
+    def add_weighted(self, x: float, alpha: float) -> None:
+        """Exponentially weighted update with weight ``alpha`` for ``x`` (n is left unchanged)."""
+        d = x - self.mean
+        self.mean += alpha * d
+        var = (1.0 - alpha) * (self.variance + alpha * d * d)
+        self.m2 = var * max(1, self.n - 1)
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.n - 1) if self.n > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"n": self.n, "mean": self.mean if self.n else None, "std": self.std if self.n else None}
+
+
+class BaselineCalibrator:
+    """Learns a session's open-eye EAR and relaxed brow baseline and derives thresholds from them.
+
+    ``close_th``/``open_th``/``brow_ref``/``brow_span`` are plain attributes read by the tracker
+    every frame; they hold the defaults until calibration completes. ``observe`` runs on the
+    tracker thread while ``reset``/``snapshot`` come from the API, hence the lock.
+    """
+
+    def __init__(self, seconds: float = 20.0, min_samples: int = 20, adapt_rate: float = 0.001) -> None:
+        self.seconds = seconds
+        self.min_samples = max(2, min_samples)
+        self.adapt_rate = adapt_rate
+        self._lock = threading.Lock()
+        self.reset()
+
+    @classmethod
+    def from_env(cls) -> "BaselineCalibrator":
+        return cls(
+            seconds=float(os.getenv("CALIBRATION_SECONDS", "20")),
+            min_samples=int(os.getenv("CALIBRATION_MIN_SAMPLES", "20")),
+            adapt_rate=float(os.getenv("CALIBRATION_ADAPT_RATE", "0.001")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.seconds > 0
+
+    def reset(self) -> None:
+        with self._lock:
+            self.ear = RunningStats()
+            self._ear_samples: list[float] = []
+            self.brow = RunningStats()
+            self.started: Optional[float] = None
+            self.elapsed = 0.0
+            self.calibrated = False
+            self.close_th = DEFAULT_CLOSE_TH
+            self.open_th = DEFAULT_OPEN_TH
+            self.brow_ref = DEFAULT_BROW_REF
+            self.brow_span = DEFAULT_BROW_SPAN
+
+    def observe(self, now: float, ear: float, brow_norm: float, eye_open: bool) -> None:
+        """Feed one frame with a face; ``eye_open`` is the blink detector's state, used once calibrated."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self.calibrated:
+                if self.adapt_rate > 0 and eye_open:
+                    self.ear.add_weighted(ear, self.adapt_rate)
+                    self._apply_ear()
+                return
+            if self.started is None or now < self.started:
+                # First face of the session, or a recorded source restarted.
+                self.started = now
+            self.elapsed = now - self.started
+            # Until calibrated the blink state comes from the default thresholds; keep every sample.
+            self._ear_samples.append(ear)
+            self.ear.add(ear)
+            self.brow.add(brow_norm)
+            if self.elapsed >= self.seconds and self.ear.n >= self.min_samples:
+                self.calibrated = True
+                self._settle_ear()
+                self._apply_ear()
+                self.brow_ref = self.brow.mean
+                self.brow_span = max(self.brow.mean * BROW_SPAN_RATIO, 1e-3)
+
+    def _settle_ear(self) -> None:
+        """Replace the all-samples EAR stats with those of the open-eye samples around the median."""
+        cut = statistics.median(self._ear_samples) * CLOSE_RATIO
+        ear = RunningStats()
+        for x in self._ear_samples:
+            if x >= cut:
+                ear.add(x)
+        self.ear = ear
+        self._ear_samples = []
+
+    def _apply_ear(self) -> None:
+        base = self.ear.mean
+        self.close_th = min(max(base * CLOSE_RATIO, 0.10), 0.30)
+        self.open_th = max(base * OPEN_RATIO, self.close_th + 0.01)
+
+    def snapshot(self) -> dict[str, Any]:
+        with self._lock:
+            if not self.enabled:
+                state = "disabled"
+            else:
+                state = "calibrated" if self.calibrated else "calibrating"
+            return {
+                "state": state,
+                "seconds": self.seconds,
+                "elapsed": self.elapsed,
+                "minSamples": self.min_samples,
+                "adaptRate": self.adapt_rate,
+                "ear": self.ear.as_dict(),
+                "brow": self.brow.as_dict(),
+                "closeThreshold": self.close_th,
+                "openThreshold": self.open_th,
+                "browReference": self.brow_ref,
+                "browSpan": self.brow_span,
+            }
@@ -0,0 +1,174 @@
+"""Content-addressed cache and single-flight sharing for upstream chat streams.
+
+Entries hold the raw model output (the token text before the analysis marker is split off), so
+a replay goes through exactly the same SSE path as a live reply.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Optional
+
+from .models import ChatMessage, FaceSignals
+
+# Face signals are bucketed so a retry a moment later (slightly different readings) still hits.
+_FACE_BUCKETS = {"stressIndex": 5.0, "blinkPerMin": 2.0, "jawOpenness": 0.05, "browTension": 0.05}
+
+
+def _bucket(value: Optional[float], size: float) -> Optional[float]:
+    return None if value is None else round(round(value / size) * size, 6)
+
+
+def cache_key(model: str, messages: list[ChatMessage], face: Optional[FaceSignals]) -> str:
+    face_key: Optional[dict[str, Any]] = None
+    if face and face.enabled:
+        face_key = {name: _bucket(getattr(face, name), size) for name, size in _FACE_BUCKETS.items()}
+        face_key["level"] = face.level
+    payload = {
+        "model": model,
+        "messages": [[m.role, " ".join(m.content.split())] for m in messages],
+        "face": face_key,
+    }
+    raw = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+class _Flight:
+    """One upstream stream being pumped into a shared token list for any number of followers."""
+
+    def __init__(self) -> None:
+        self.tokens: list[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+        self.task: Optional[asyncio.Task[None]] = None
+        self._wake = asyncio.Event()
+
+    def notify(self) -> None:
+        self._wake.set()
+        self._wake = asyncio.Event()
+
+    async def follow(self) -> AsyncIterator[str]:
+        i = 0
+        while True:
+            n = len(self.tokens)
+            if i < n:
+                # A follower that fell behind (or joined late) gets the backlog as one piece.
+                yield self.tokens[i] if n - i == 1 else "".join(self.tokens[i:n])
+                i = n
+                continue
+            if self.error is not None:
+                raise self.error
+            if self.done:
+                return
+            await self._wake.wait()
+
+
+class ChatResponseCache:
+    """TTL + LRU cache of completed replies, keyed by :func:`cache_key`.
+
+    Concurrent requests with the same key share one upstream stream; the stream is cancelled
+    when its last follower goes away, and only a reply that finished cleanly is stored.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_entries: int = 256) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, str]] = OrderedDict()
+        self._flights: dict[str, _Flight] = {}
+        self.hits = 0
+        self.joins = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls) -> "ChatResponseCache":
+        return cls(
+            ttl=float(os.getenv("CHAT_CACHE_TTL", "300")),
+            max_entries=int(os.getenv("CHAT_CACHE_SIZE", "256")),
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "inFlight": len(self._flights),
+            "hits": self.hits,
+            "joins": self.joins,
+            "misses": self.misses,
+        }
+
+    def _lookup(self, key: str) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires, text = entry
+        if expires < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return text
+
+    def _store(self, key: str, text: str) -> None:
+        self._entries[key] = (time.monotonic() + self.ttl, text)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def stream(self, key: str, upstream: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        """Tokens for ``key``: replayed from the cache, joined to an in-flight stream, or fetched."""
+        if not self.enabled:
+            async with aclosing(upstream()) as tokens:
+                async for token in tokens:
+                    yield token
+            return
+
+        cached = self._lookup(key)
+        if cached is not None:
+            self.hits += 1
+            yield cached
+            return
+
+        flight = self._flights.get(key)
+        if flight is None:
+            self.misses += 1
+            flight = _Flight()
+            self._flights[key] = flight
+            flight.task = asyncio.create_task(self._pump(key, flight, upstream))
+        else:
+            self.joins += 1
+
+        flight.followers += 1
+        try:
+            async for token in flight.follow():
+                yield token
+        finally:
+            flight.followers -= 1
+            if flight.followers == 0 and not flight.done and flight.task is not None:
+                flight.task.cancel()
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    async def _pump(self, key: str, flight: _Flight, upstream: Callable[[], AsyncIterator[str]]) -> None:
+        try:
+            async with aclosing(upstream()) as tokens:
+                async for token in tokens:
+                    flight.tokens.append(token)
+                    flight.notify()
+        except Exception as e:
+            flight.error = e
+        else:
+            self._store(key, "".join(flight.tokens))
+        finally:
+            flight.done = True
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+            flight.notify()
@@ -0,0 +1,81 @@
+"""Bound the chat history sent to the model: recent turns verbatim, older ones as a summary."""
+
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from .models import ChatMessage
+
+SUMMARY_HEADER = "RINGKASAN PERCAKAPAN SEBELUMNYA (pesan lama tidak dikirim ulang):"
+
+_SNIPPET_CHARS = 160
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token); only used for budgeting."""
+    return len(text) // 4 + 1
+
+
+def _snippet(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= _SNIPPET_CHARS else text[: _SNIPPET_CHARS - 3].rstrip() + "..."
+
+
+def rolling_summary(messages: list[ChatMessage], max_tokens: int) -> str:
+    """Extractive fallback: the most recent user messages, shortened, oldest first."""
+    lines: list[str] = []
+    used = 0
+    for m in reversed(messages):
+        if m.role != "user":
+            continue
+        line = f"- {_snippet(m.content)}"
+        cost = estimate_tokens(line)
+        if lines and used + cost > max_tokens:
+            break
+        lines.append(line)
+        used += cost
+    return "\n".join(reversed(lines))
+
+
+def compact_history(
+    messages: list[ChatMessage],
+    summary: Optional[str] = None,
+    keep_turns: Optional[int] = None,
+    token_budget: Optional[int] = None,
+) -> list[ChatMessage]:
+    """Keep the last ``keep_turns`` user turns (fewer if they exceed ``token_budget``) and replace
+    everything before them with one system message carrying ``summary`` (the client's latest
+    ``analysis.summary``) or, without one, a :func:`rolling_summary` of the dropped turns.
+
+    The latest turn is always kept. ``keep_turns <= 0`` (CHAT_HISTORY_TURNS=0) disables compaction.
+    """
+    if keep_turns is None:
+        keep_turns = int(os.getenv("CHAT_HISTORY_TURNS", "6"))
+    if token_budget is None:
+        token_budget = int(os.getenv("CHAT_HISTORY_TOKEN_BUDGET", "3000"))
+    if keep_turns <= 0:
+        return list(messages)
+
+    starts = [i for i, m in enumerate(messages) if m.role == "user"]
+    if not starts:
+        return list(messages)
+    kept = starts[-keep_turns:]
+
+    costs = [estimate_tokens(m.content) for m in messages]
+    total = sum(costs[kept[0] :])
+    while total > token_budget and len(kept) > 1:
+        total -= sum(costs[kept[0] : kept[1]])
+        kept.pop(0)
+
+    cut = kept[0]
+    if cut == starts[0]:
+        return list(messages)  # no user turn dropped
+
+    older = messages[:cut]
+    text = (summary or "").strip() or rolling_summary(older, max(64, token_budget // 4))
+    out = [m for m in older if m.role == "system"]  # caller-supplied guidance stays verbatim
+    if text:
+        out.append(ChatMessage(role="system", content=f"{SUMMARY_HEADER}\n{text}"))
+    out.extend(messages[cut:])
+    return out
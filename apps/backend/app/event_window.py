@@ -0,0 +1,59 @@
+"""Sliding-window event counting (blinks and other timestamped signal events)."""
+
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+
+class WindowedEventCounter:
+    """Counts events inside several trailing time windows in amortized O(1) per update.
+
+    Events are kept once, in time order; each window keeps a cursor to its first event that is
+    still inside ``[now - window, now]``. Cursors only move forward, and the consumed prefix is
+    dropped in bulk once it outweighs the live part, so nothing is rescanned frame to frame.
+    """
+
+    def __init__(self, windows: Iterable[float] = (10.0, 60.0)) -> None:
+        self.windows = tuple(sorted(set(float(w) for w in windows)))
+        if not self.windows or self.windows[0] <= 0:
+            raise ValueError("windows must be positive")
+        self._events: list[float] = []
+        self._starts = {w: 0 for w in self.windows}
+        self._now: Optional[float] = None
+
+    def reset(self) -> None:
+        self._events.clear()
+        self._starts = {w: 0 for w in self.windows}
+        self._now = None
+
+    def add(self, ts: float) -> None:
+        if (self._now is not None and ts < self._now) or (self._events and ts < self._events[-1]):
+            # Clock went backwards (e.g. a recorded source restarted); start over. Checked against
+            # the last advance() too, so that call does not reset again and drop this event.
+            self.reset()
+        self._events.append(ts)
+
+    def advance(self, now: float) -> None:
+        """Move every window to end at ``now``; ``now`` must not decrease between calls."""
+        if self._now is not None and now < self._now:
+            self.reset()
+        self._now = now
+        events = self._events
+        n = len(events)
+        for w in self.windows:
+            cutoff = now - w
+            i = self._starts[w]
+            while i < n and events[i] < cutoff:
+                i += 1
+            self._starts[w] = i
+
+        # The largest window has the smallest cursor; everything before it is expired.
+        head = self._starts[self.windows[-1]]
+        if head > 64 and head * 2 > n:
+            del events[:head]
+            for w in self.windows:
+                self._starts[w] -= head
+
+    def count(self, window: float) -> int:
+        """Events in the trailing ``window`` seconds as of the last :meth:`advance`."""
+        return len(self._events) - self._starts[float(window)]
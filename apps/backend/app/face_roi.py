@@ -0,0 +1,149 @@
+"""Face ROI tracking: run the landmarker on a crop around the last face instead of the full frame.
+
+The face usually covers a small, slowly moving part of a 720p/1080p frame. In ROI mode the
+square around the previous frame's face oval (plus a margin) is cropped, downscaled to at most
+TRACK_ROI_SIZE pixels and converted to RGB; converting and handing over the full frame is
+skipped. Landmarks found in the crop are mapped back to full-frame pixels, so features are
+computed exactly as before. When the face is lost, when the crop would cover most of the frame,
+and every TRACK_ROI_REFRESH frames, the next frame goes through full-frame detection again.
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from typing import Any, Optional, Sequence
+
+import numpy as np
+
+from .landmark_features import FEATURE_INDICES, landmark_points
+
+# MediaPipe face-mesh face oval; its extent is the face bounding box.
+FACE_OVAL = (
+    10, 338, 297, 332, 284, 251, 389, 356, 454, 323, 361, 288, 397, 365, 379, 378, 400, 377,
+    152, 148, 176, 149, 150, 136, 172, 58, 132, 93, 234, 127, 162, 21, 54, 103, 67, 109,
+)
+
+# A crop wider than this fraction of the short frame side saves too little; use the full frame.
+_MAX_COVERAGE = 0.9
+_MIN_SIDE = 32
+
+Window = tuple[int, int, int, int]  # x0, y0, x1, y1 in full-frame pixels
+
+
+@dataclass(frozen=True)
+class RoiConfig:
+    margin: float = 0.35  # added on each side, as a fraction of the face box side
+    size: int = 256  # crops larger than this are downscaled to it (longest side)
+    refresh: int = 60  # frames between forced full-frame passes; 0 = only when the face is lost
+
+    @classmethod
+    def from_env(cls) -> "RoiConfig":
+        return cls(
+            margin=float(os.getenv("TRACK_ROI_MARGIN", "0.35")),
+            size=max(_MIN_SIDE, int(os.getenv("TRACK_ROI_SIZE", "256"))),
+            refresh=max(0, int(os.getenv("TRACK_ROI_REFRESH", "60"))),
+        )
+
+
+class _Timing:
+    __slots__ = ("frames", "total_ms")
+
+    def __init__(self) -> None:
+        self.frames = 0
+        self.total_ms = 0.0
+
+    def mean(self) -> Optional[float]:
+        return self.total_ms / self.frames if self.frames else None
+
+
+class FaceRoi:
+    """Crop window for the next frame (``None`` = search the full frame) plus per-mode timings."""
+
+    def __init__(self, config: RoiConfig) -> None:
+        self.config = config
+        self.window: Optional[Window] = None
+        self.lost = 0
+        self._since_full = 0
+        self._full = _Timing()
+        self._roi = _Timing()
+        self._small: Optional[np.ndarray] = None
+        self._rgb: Optional[np.ndarray] = None
+
+    def plan(self) -> Optional[Window]:
+        if self.window is None:
+            return None
+        if self.config.refresh and self._since_full >= self.config.refresh:
+            return None
+        return self.window
+
+    def to_rgb(self, cv2: Any, frame: np.ndarray, window: Window) -> np.ndarray:
+        """Crop (and downscale) ``window`` of a BGR frame into a reused RGB buffer."""
+        x0, y0, x1, y1 = window
+        crop = frame[y0:y1, x0:x1]
+        side = max(x1 - x0, y1 - y0)
+        if side > self.config.size:
+            scale = self.config.size / side
+            shape = (max(1, round((y1 - y0) * scale)), max(1, round((x1 - x0) * scale)), 3)
+            # Bilinear: faces rarely need more than ~2x reduction, and INTER_AREA costs more than it saves.
+            if self._small is None or self._small.shape != shape:
+                self._small = np.empty(shape, dtype=frame.dtype)
+            cv2.resize(crop, (shape[1], shape[0]), dst=self._small, interpolation=cv2.INTER_LINEAR)
+            crop = self._small
+        if self._rgb is None or self._rgb.shape != crop.shape:
+            self._rgb = np.empty(crop.shape, dtype=frame.dtype)
+        cv2.cvtColor(crop, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self._rgb
+
+    @staticmethod
+    def points(
+        lm: Sequence[Any], window: Optional[Window], w: int, h: int, indices: Sequence[int] = FEATURE_INDICES
+    ) -> np.ndarray:
+        """Landmarks in full-frame pixels, whether they were found in the full frame or in ``window``."""
+        if window is None:
+            return landmark_points(lm, w, h, indices)
+        x0, y0, x1, y1 = window
+        pts = landmark_points(lm, x1 - x0, y1 - y0, indices)
+        pts += np.array((x0, y0), dtype=np.float32)
+        return pts
+
+    def update(self, lm: Optional[Sequence[Any]], window: Optional[Window], w: int, h: int, ms: float) -> None:
+        """Record a processed frame and derive the next window from its face (``lm`` None = no face)."""
+        if window is not None:
+            self._roi.frames += 1
+            self._roi.total_ms += ms
+        elif lm is not None:
+            # Faceless full frames only run the detector; they would flatter the full-frame cost.
+            self._full.frames += 1
+            self._full.total_ms += ms
+        self._since_full = 0 if window is None else self._since_full + 1
+        if lm is None:
+            if window is not None:
+                self.lost += 1
+            self.window = None
+            return
+
+        oval = self.points(lm, window, w, h, FACE_OVAL)
+        (bx0, by0), (bx1, by1) = oval.min(axis=0).tolist(), oval.max(axis=0).tolist()
+        side = max(bx1 - bx0, by1 - by0) * (1.0 + 2.0 * self.config.margin)
+        if side >= _MAX_COVERAGE * min(w, h):
+            self.window = None
+            return
+        side = int(max(side, _MIN_SIDE))
+        # Keep the square inside the frame by shifting it rather than shrinking it.
+        x0 = int(min(max((bx0 + bx1 - side) / 2.0, 0.0), w - side))
+        y0 = int(min(max((by0 + by1 - side) / 2.0, 0.0), h - side))
+        self.window = (x0, y0, x0 + side, y0 + side)
+
+    def stats(self) -> dict[str, Any]:
+        full_ms, roi_ms = self._full.mean(), self._roi.mean()
+        return {
+            "enabled": True,
+            "fullFrames": self._full.frames,
+            "roiFrames": self._roi.frames,
+            "lost": self.lost,
+            "fullMs": full_ms,
+            "roiMs": roi_ms,
+            "savedMsPerFrame": full_ms - roi_ms if full_ms is not None and roi_ms is not None else None,
+            "window": list(self.window) if self.window is not None else None,
+        }
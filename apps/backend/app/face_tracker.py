@@ -1,21 +1,33 @@
 from __future__ import annotations
 
-import asyncio
+import contextlib
 import os
 import threading
 import time
 from dataclasses import dataclass
 from pathlib import Path
 from urllib.request import urlretrieve
-from typing import Any, Optional
-
-from .stress import StressSignals, compute_stress_index
+from typing import Any, AsyncIterator, Optional
+
+from .calibration import BaselineCalibrator
+from .event_window import WindowedEventCounter
+from .frame_ring import FrameRing
+from .fps_governor import FpsGovernor
+from .frame_source import FrameSource, env_flag, default_source_spec, frame_source_from_spec
+from .stress import StressSignals, active_profile, compute_stress_index
+from .telemetry_codec import TelemetryFrame
+from .telemetry_hub import TelemetryHub
+from .telemetry_log import TelemetryRecorder, record_dir, session_path
 
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover
     import numpy as np
 
+    from .face_roi import FaceRoi
+
+    from .telemetry_history import TelemetryHistory
+
 
 @dataclass
 class FaceTelemetry:
@@ -27,6 +39,7 @@ class FaceTelemetry:
     stressIndex: Optional[float]
     level: Optional[str]
     error: Optional[str] = None
+    profileVersion: Optional[str] = None
 
 
 def _try_import_deps() -> tuple[Any, Any, Any, Any, Any, Optional[str]]:
@@ -67,16 +80,52 @@ def _ensure_face_landmarker_model(model_path: Path) -> tuple[bool, str | None]:
     return False, last_err or "failed to download model"
 
 
+def _make_history() -> Optional["TelemetryHistory"]:
+    """Ring sized for TRACK_HISTORY_SECONDS at TRACK_FPS; None when numpy is unavailable."""
+    try:
+        from .telemetry_history import TelemetryHistory
+    except ImportError:  # pragma: no cover
+        return None
+    seconds = int(os.getenv("TRACK_HISTORY_SECONDS", "600"))
+    fps = max(1, int(os.getenv("TRACK_FPS", "10")))
+    return TelemetryHistory(capacity=seconds * fps)
+
+
 class FaceTracker:
-    def __init__(self) -> None:
+    # Whether sessions are written to TRACK_RECORD_DIR (replays are not re-recorded).
+    records_sessions = True
+    # Whether samples go into the in-memory history behind /api/face/history.
+    keeps_history = True
+
+    def __init__(
+        self,
+        source: Optional[str] = None,
+        throughput: Optional[bool] = None,
+        inference_slots: Optional[threading.Semaphore] = None,
+        roi: Optional[bool] = None,
+    ) -> None:
+        # Frame source spec (see frame_source.frame_source_from_spec); defaults to FRAME_SOURCE / CAMERA_INDEX.
+        self.source_spec = source or default_source_spec()
+        # Throughput mode ignores TRACK_FPS pacing to measure the real pipeline rate.
+        self.throughput = env_flag("TRACK_THROUGHPUT") if throughput is None else throughput
+        # ROI mode runs inference on a crop around the last face (see face_roi).
+        self.roi = env_flag("TRACK_ROI") if roi is None else roi
+        # Shared by a TrackerPool to cap how many trackers run inference at the same time.
+        self._inference_slots = inference_slots
         self._lock = threading.Lock()
         self._latest: Optional[FaceTelemetry] = None
+        self._hub: TelemetryHub[TelemetryFrame] = TelemetryHub()
+        self._history = _make_history() if self.keeps_history else None
+        self._recorder: Optional[TelemetryRecorder] = None
         self._stop_evt = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._stopping: Optional[threading.Thread] = None
         self._refcount = 0
 
-        self._blink_events: list[float] = []
+        self._blinks = WindowedEventCounter(windows=(10.0, 60.0))
         self._eye_closed = False
+        # Per-session EAR / brow baselines; thresholds fall back to fixed defaults until calibrated.
+        self._calibration = BaselineCalibrator.from_env()
         self._last_frame_ts: float | None = None
         
         # Smoothing for more stable readings (EMA)
@@ -84,52 +133,170 @@ class FaceTracker:
         self._smooth_brow: float | None = None
         self._smooth_alpha = 0.3  # Smoothing factor (lower = more smoothing)
 
+        self._frames = 0
+        self._faces = 0
+        self._started_at: float | None = None
+        # Set when a finite source runs out or the worker stops, so elapsed and fps stop there.
+        self._ended_at: float | None = None
+        self._ring: Optional[FrameRing] = None
+        self._roi: Optional["FaceRoi"] = None
+        self._governor: Optional[FpsGovernor] = None
+
     def acquire(self) -> None:
+        """Take a reference; starts the worker thread on the first one.
+
+        Blocks until a worker still shutting down from the previous release has exited,
+        so two workers never share the stop event. Call it off the event loop.
+        """
         with self._lock:
             self._refcount += 1
-            if self._thread is None:
+            if self._thread is not None:
+                return
+            prev = self._stopping
+        if prev is not None:
+            prev.join()
+        with self._lock:
+            if self._thread is None and self._refcount > 0:
+                self._stopping = None
                 self._stop_evt.clear()
-                self._thread = threading.Thread(target=self._run, daemon=True)
+                self._recorder = self._open_recorder()
+                self._thread = threading.Thread(target=self._worker, args=(self._recorder,), daemon=True)
                 self._thread.start()
 
     def release(self) -> None:
+        """Drop a reference; the last one signals the worker to stop without waiting for it.
+
+        The session log is detached here but flushed and closed by the exiting worker, so this
+        never blocks on disk and is safe to call from the event loop.
+        """
         with self._lock:
             self._refcount = max(0, self._refcount - 1)
-            if self._refcount == 0:
+            if self._refcount == 0 and self._thread is not None:
                 self._stop_evt.set()
+                self._stopping = self._thread
                 self._thread = None
+                self._recorder = None
+
+    def _worker(self, recorder: Optional[TelemetryRecorder]) -> None:
+        try:
+            self._run()
+        finally:
+            if recorder is not None:
+                recorder.close()
+
+    def _open_recorder(self) -> Optional[TelemetryRecorder]:
+        """One append-only log per session (acquire-to-release) when TRACK_RECORD_DIR is set."""
+        directory = record_dir()
+        if directory is None or not self.records_sessions:
+            return None
+        try:
+            return TelemetryRecorder(
+                session_path(directory, self.source_spec),
+                fsync_every=int(os.getenv("TRACK_RECORD_FSYNC_EVERY", "50")),
+                fsync_interval=float(os.getenv("TRACK_RECORD_FSYNC_SECONDS", "2")),
+            )
+        except OSError as e:  # pragma: no cover
+            print(f"[WARN] Session recording disabled: {e}")
+            return None
+
+    @property
+    def idle(self) -> bool:
+        """No client holds it and no worker is running or shutting down."""
+        with self._lock:
+            stopping = self._stopping is not None and self._stopping.is_alive()
+            return self._refcount == 0 and self._thread is None and not stopping
 
     def latest(self) -> Optional[FaceTelemetry]:
         with self._lock:
             return self._latest
 
-    async def aiter(self, fps: int = 10):
-        interval = 1.0 / max(1, fps)
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            end = self._ended_at if self._ended_at is not None else time.time()
+            elapsed = (end - self._started_at) if self._started_at else 0.0
+            ring = self._ring.counters() if self._ring is not None else {"captured": 0, "dropped": 0}
+            return {
+                "source": self.source_spec,
+                "throughput": self.throughput,
+                "running": self._thread is not None,
+                "captured": ring["captured"],
+                "dropped": ring["dropped"],
+                "frames": self._frames,
+                "faces": self._faces,
+                "elapsed": elapsed,
+                "fps": (self._frames / elapsed) if elapsed > 0 else 0.0,
+                "roi": self._roi.stats() if self._roi is not None else {"enabled": False},
+                "governor": self._governor.stats() if self._governor is not None else None,
+            }
+
+    def calibration(self) -> dict[str, Any]:
+        return self._calibration.snapshot()
+
+    def reset_calibration(self) -> None:
+        """Start learning the baselines again (e.g. a different person sat down)."""
+        self._calibration.reset()
+
+    def history(self, t_from: float, t_to: float, step: float) -> Optional[dict[str, Any]]:
+        """Bucketed min/mean/max of recent telemetry, or None if history is unavailable."""
+        if self._history is None:
+            return None
+        return self._history.query(t_from, t_to, step)
+
+    def _publish(self, tel: FaceTelemetry) -> None:
+        """Single exit point for new telemetry (overridden when the tracker runs in a worker process)."""
+        with self._lock:
+            self._latest = tel
+            recorder = self._recorder
+        if self._history is not None and tel.error is None:
+            self._history.append(tel)
+        if recorder is not None:
+            recorder.append(tel)
+        # Wrapped once here so every subscriber shares the same lazily-encoded payloads.
+        self._hub.publish(TelemetryFrame(tel))
+
+    def _publish_error_until_stopped(self, error: str) -> None:
         while not self._stop_evt.is_set():
-            yield self.latest()
-            await asyncio.sleep(interval)
+            self._publish(FaceTelemetry(time.time(), None, None, None, None, None, None, error=error))
+            time.sleep(1.0)
+
+    def _capture_loop(self, source: FrameSource, ring: FrameRing) -> None:
+        """Capture thread: decode frames into ring slots so inference never waits on the device."""
+        try:
+            while not self._stop_evt.is_set() and not ring.closed:
+                slot, buf = ring.begin_write()
+                if slot < 0:
+                    continue
+                ok, frame, ts_ms = source.read(buf)
+                if not ok or frame is None:
+                    ring.abort_write(slot)
+                    if not source.live:
+                        break
+                    time.sleep(0.1)
+                    continue
+                ring.commit(slot, frame, ts_ms)
+        finally:
+            ring.close()
+
+    async def aiter(self, max_fps: Optional[float] = None) -> AsyncIterator[FaceTelemetry]:
+        """Yield each freshly published telemetry once; slow consumers skip straight to the newest."""
+        async for frame in self.aiter_frames(max_fps):
+            yield frame.tel
+
+    async def aiter_frames(self, max_fps: Optional[float] = None) -> AsyncIterator[TelemetryFrame]:
+        """Like :meth:`aiter` but yields the shared, pre-serializable frames."""
+        interval = 1.0 / max_fps if max_fps else 0.0
+        async for frame in self._hub.subscribe(min_interval=interval):
+            yield frame
 
     def _run(self) -> None:
         cv2, mp, np, vision, base_options, dep_err = _try_import_deps()
         if dep_err or cv2 is None or mp is None or np is None or vision is None or base_options is None:
             # Dependencies missing (common on some Python versions). Keep backend alive; tracking becomes unavailable.
-            while not self._stop_evt.is_set():
-                with self._lock:
-                    self._latest = FaceTelemetry(
-                        time.time(),
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        error=dep_err or "missing face-tracking dependencies",
-                    )
-                time.sleep(1.0)
+            self._publish_error_until_stopped(dep_err or "missing face-tracking dependencies")
             return
 
-        def dist(a: 'np.ndarray', b: 'np.ndarray') -> float:
-            return float(np.linalg.norm(a - b))
+        from .face_roi import FaceRoi, RoiConfig
+        from .landmark_features import compute_features
 
         # MediaPipe Tasks needs a model file.
         backend_root = Path(__file__).resolve().parents[1]
@@ -137,41 +304,22 @@ class FaceTracker:
         model_path = Path(os.getenv("FACE_LANDMARKER_MODEL", str(default_model)))
         ok_model, model_err = _ensure_face_landmarker_model(model_path)
         if not ok_model:
-            while not self._stop_evt.is_set():
-                with self._lock:
-                    self._latest = FaceTelemetry(
-                        time.time(),
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        error=model_err or "model download failed",
-                    )
-                time.sleep(1.0)
+            self._publish_error_until_stopped(model_err or "model download failed")
             return
 
-        cam_index = int(os.getenv("CAMERA_INDEX", "0"))
-        track_fps = int(os.getenv("TRACK_FPS", "10"))
-        min_interval = 1.0 / max(1, track_fps)
+        # Paces the loop (TRACK_FPS, or adaptive with TRACK_ADAPTIVE_FPS); throughput mode runs unpaced.
+        governor = None if self.throughput else FpsGovernor.from_env()
 
-        cap = cv2.VideoCapture(cam_index)
-        if not cap.isOpened():
-            # Could not open camera; keep publishing None.
-            while not self._stop_evt.is_set():
-                with self._lock:
-                    self._latest = FaceTelemetry(
-                        time.time(),
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        None,
-                        error=f"camera not available (CAMERA_INDEX={cam_index})",
-                    )
-                time.sleep(1.0)
+        try:
+            source: FrameSource = frame_source_from_spec(self.source_spec, cv2, np)
+        except ValueError as e:
+            self._publish_error_until_stopped(str(e))
+            return
+        ok_source, source_err = source.open()
+        if not ok_source:
+            # Could not open the source; keep publishing None.
+            source.release()
+            self._publish_error_until_stopped(source_err or f"frame source not available ({source.describe()})")
             return
 
         options = vision.FaceLandmarkerOptions(
@@ -182,66 +330,100 @@ class FaceTracker:
             output_facial_transformation_matrixes=False,
         )
         landmarker = vision.FaceLandmarker.create_from_options(options)
+        # Crops get their own landmarker so each VIDEO-mode instance sees a consistent image stream.
+        roi = FaceRoi(RoiConfig.from_env()) if self.roi else None
+        roi_landmarker = vision.FaceLandmarker.create_from_options(options) if roi is not None else None
+
+        ring = FrameRing(np, slots=int(os.getenv("TRACK_RING_SLOTS", "3")), drop_oldest=source.live)
+        with self._lock:
+            self._frames = 0
+            self._faces = 0
+            self._started_at = time.time()
+            self._ended_at = None
+            self._ring = ring
+            self._roi = roi
+            self._governor = governor
+        self._calibration.reset()
+        calib = self._calibration
+
+        capture = threading.Thread(target=self._capture_loop, args=(source, ring), daemon=True)
+        capture.start()
+        rgb: Optional["np.ndarray"] = None
 
         try:
             while not self._stop_evt.is_set():
                 t0 = time.time()
-                ok, frame = cap.read()
-                if not ok:
-                    time.sleep(0.1)
+                item = ring.take_latest(timeout=0.5)
+                if item is None:
+                    if ring.closed and not source.live:
+                        # Recorded source exhausted; the final stats stay readable.
+                        with self._lock:
+                            self._ended_at = time.time()
+                        self._publish_error_until_stopped(f"frame source exhausted ({source.describe()})")
+                        break
                     continue
 
-                rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb)
-                results = landmarker.detect_for_video(mp_image, int(time.time() * 1000))
+                slot, frame, ts_ms = item
+                t_infer = time.perf_counter()
+                window = roi.plan() if roi is not None else None
+                try:
+                    h, w = frame.shape[:2]
+                    if window is not None:
+                        image = roi.to_rgb(cv2, frame, window)
+                    else:
+                        if rgb is None or rgb.shape != frame.shape:
+                            rgb = np.empty_like(frame)
+                        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=rgb)
+                        image = rgb
+                finally:
+                    # The RGB copy is ours; hand the slot back to the capture thread right away.
+                    ring.end_read(slot)
+
+                mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image)
+                with self._inference_slots or contextlib.nullcontext():
+                    if window is not None:
+                        results = roi_landmarker.detect_for_video(mp_image, ts_ms)
+                    else:
+                        results = landmarker.detect_for_video(mp_image, ts_ms)
+                if roi is not None:
+                    face = results.face_landmarks[0] if results.face_landmarks else None
+                    roi.update(face, window, w, h, (time.perf_counter() - t_infer) * 1000.0)
 
                 blink_per_min: Optional[float] = None
                 blink_per_10s: Optional[float] = None
                 jaw_openness: Optional[float] = None
                 brow_tension: Optional[float] = None
+                ear: Optional[float] = None
 
                 if results.face_landmarks:
-                    h, w = frame.shape[:2]
                     lm = results.face_landmarks[0]
 
-                    def pt(i: int) -> np.ndarray:
-                        return np.array([lm[i].x * w, lm[i].y * h], dtype=np.float32)
+                    feats = compute_features(FaceRoi.points(lm, window, w, h))
 
-                    # Eye Aspect Ratio-ish (left eye)
-                    # Landmarks: 33, 160, 158, 133, 153, 144 (common set)
-                    p1, p2, p3, p4, p5, p6 = pt(33), pt(160), pt(158), pt(133), pt(153), pt(144)
-                    ear = (dist(p2, p6) + dist(p3, p5)) / (2.0 * dist(p1, p4) + 1e-6)
+                    # Eye Aspect Ratio, averaged over both eyes
+                    ear = feats.ear
 
-                    # Blink detection with threshold + hysteresis
-                    now = time.time()
+                    # Blink detection with threshold + hysteresis.
+                    # Use the frame timestamp so recorded sources replay deterministically.
+                    now = ts_ms / 1000.0
                     if self._last_frame_ts is None:
                         self._last_frame_ts = now
 
-                    # Slightly more sensitive thresholds
-                    close_th = 0.20
-                    open_th = 0.225
-                    if not self._eye_closed and ear < close_th:
+                    # Thresholds follow the session's open-eye baseline once calibrated
+                    if not self._eye_closed and ear < calib.close_th:
                         self._eye_closed = True
-                    elif self._eye_closed and ear > open_th:
+                    elif self._eye_closed and ear > calib.open_th:
                         self._eye_closed = False
-                        self._blink_events.append(now)
+                        self._blinks.add(now)
 
-                    # Keep last 60s
-                    cutoff = now - 60.0
-                    self._blink_events = [t for t in self._blink_events if t >= cutoff]
-                    blink_per_min = float(len(self._blink_events))
-
-                    # Short-window count for more responsive UI
-                    cutoff10 = now - 10.0
-                    blink_per_10s = float(sum(1 for t in self._blink_events if t >= cutoff10))
+                    # Blinks in the last 60s, plus a short window for a more responsive UI
+                    self._blinks.advance(now)
+                    blink_per_min = float(self._blinks.count(60.0))
+                    blink_per_10s = float(self._blinks.count(10.0))
 
                     # Jaw openness: distance between upper/lower inner lip normalized by nose-chin distance
-                    upper = pt(13)  # upper lip
-                    lower = pt(14)  # lower lip
-                    nose = pt(1)
-                    chin = pt(152)
-                    mouth_open = dist(upper, lower)
-                    face_scale = dist(nose, chin) + 1e-6
+                    mouth_open = feats.mouth_open
+                    face_scale = feats.face_scale
                     # Scale for UI sensitivity
                     jaw_raw = float(np.clip(mouth_open / face_scale * 6.0, 0.0, 1.0))
                     # Apply exponential moving average smoothing
@@ -252,13 +434,12 @@ class FaceTracker:
                     jaw_openness = self._smooth_jaw
 
                     # Brow tension: eyebrow-eye distance (smaller distance => more tension) normalized
-                    brow = pt(105)
-                    eye_top = pt(159)
-                    brow_dist = dist(brow, eye_top)
+                    brow_dist = feats.brow_dist
                     # Normalize with face scale
                     norm = brow_dist / (face_scale + 1e-6)
-                    # Map: smaller norm -> higher tension
-                    brow_raw = float(np.clip((0.043 - norm) / 0.02, 0.0, 1.0))
+                    calib.observe(now, ear, norm, eye_open=not self._eye_closed)
+                    # Map: smaller norm (relative to the calibrated reference) -> higher tension
+                    brow_raw = float(np.clip((calib.brow_ref - norm) / calib.brow_span, 0.0, 1.0))
                     # Apply exponential moving average smoothing
                     if self._smooth_brow is None:
                         self._smooth_brow = brow_raw
@@ -266,8 +447,10 @@ class FaceTracker:
                         self._smooth_brow = self._smooth_alpha * brow_raw + (1 - self._smooth_alpha) * self._smooth_brow
                     brow_tension = self._smooth_brow
 
+                profile = active_profile()
                 stress_idx, level = compute_stress_index(
-                    StressSignals(blink_per_min=blink_per_min, jaw_openness=jaw_openness, brow_tension=brow_tension)
+                    StressSignals(blink_per_min=blink_per_min, jaw_openness=jaw_openness, brow_tension=brow_tension),
+                    profile,
                 )
 
                 tel = FaceTelemetry(
@@ -279,13 +462,27 @@ class FaceTracker:
                     stressIndex=stress_idx,
                     level=level,
                     error=None,
+                    profileVersion=profile.version,
                 )
                 with self._lock:
-                    self._latest = tel
-
-                dt = time.time() - t0
-                if dt < min_interval:
-                    time.sleep(min_interval - dt)
+                    self._frames += 1
+                    if results.face_landmarks:
+                        self._faces += 1
+                self._publish(tel)
+
+                if governor is not None:
+                    done = time.perf_counter()
+                    interval = governor.update(done, done - t_infer, ear, jaw_openness, self._eye_closed)
+                    dt = time.time() - t0
+                    if dt < interval:
+                        self._stop_evt.wait(interval - dt)
         finally:
+            with self._lock:
+                if self._ended_at is None:
+                    self._ended_at = time.time()
+            ring.close()
+            capture.join(timeout=2.0)
             landmarker.close()
-            cap.release()
+            if roi_landmarker is not None:
+                roi_landmarker.close()
+            source.release()
@@ -0,0 +1,117 @@
+"""Processing-rate governor for the tracker thread.
+
+With TRACK_ADAPTIVE_FPS the rate follows what is in front of the camera:
+- TRACK_FPS_MIN while no face is in view;
+- TRACK_FPS as soon as the eyes close or EAR / jaw openness move quickly, held for a moment;
+- easing down to BLINK_SAFE_FPS while the signals stay steady.
+The rate is also capped so that processing time per second stays within TRACK_CPU_BUDGET (the
+fraction of one core a tracker may use), leaving headroom on hosts running several trackers.
+Without a face TRACK_FPS_MIN is the floor; with a face the floor stays at BLINK_SAFE_FPS (or
+TRACK_FPS if lower), even if that exceeds the budget. Without TRACK_ADAPTIVE_FPS the rate is the
+fixed TRACK_FPS and the governor only measures.
+
+Blinks are what a low rate loses first: the eye stays below the close threshold for roughly
+100-250 ms, so at 10 fps every blink still gets a closed frame while at 5 fps about one in six
+is missed (see tests/test_fps_governor.py). With the default TRACK_FPS=10, adaptive mode
+therefore only saves work while no face is in view, or at higher TRACK_FPS settings.
+"""
+
+from __future__ import annotations
+
+import math
+import os
+from typing import Any, Optional
+
+from .frame_source import env_flag
+
+# Relative EAR change (or absolute jaw-openness change) between frames that counts as movement.
+ACTIVE_DELTA = 0.08
+# Seconds the full rate is kept after the last movement.
+HOLD_SECONDS = 1.5
+# Lowest rate with a face in view; below it short blinks fall between frames.
+BLINK_SAFE_FPS = 10.0
+# Per-frame factor easing the rate down towards that floor.
+DECAY = 0.9
+# Weight of the newest sample in the busy-time and frame-period averages.
+_EMA = 0.2
+
+
+class FpsGovernor:
+    def __init__(self, max_fps: float = 10.0, min_fps: float = 2.0, adaptive: bool = False, cpu_budget: float = 0.5) -> None:
+        self.max_fps = max(1.0, float(max_fps))
+        self.min_fps = min(max(0.1, min_fps), self.max_fps)
+        self.adaptive = adaptive
+        self.cpu_budget = cpu_budget
+        self.target_fps = self.max_fps
+        self.limited_by = "fixed"
+        self._busy: Optional[float] = None
+        self._period: Optional[float] = None
+        self._last_end: Optional[float] = None
+        self._last_active = -math.inf
+        self._ear: Optional[float] = None
+        self._jaw: Optional[float] = None
+
+    @property
+    def face_floor(self) -> float:
+        return max(self.min_fps, min(self.max_fps, BLINK_SAFE_FPS))
+
+    @classmethod
+    def from_env(cls) -> "FpsGovernor":
+        return cls(
+            max_fps=float(os.getenv("TRACK_FPS", "10")),
+            min_fps=float(os.getenv("TRACK_FPS_MIN", "2")),
+            adaptive=env_flag("TRACK_ADAPTIVE_FPS"),
+            cpu_budget=float(os.getenv("TRACK_CPU_BUDGET", "0.5")),
+        )
+
+    def update(self, now: float, busy: float, ear: Optional[float], jaw: Optional[float], eye_closed: bool) -> float:
+        """Record a processed frame (``ear`` None = no face) and return the interval until the next one.
+
+        ``now`` is a monotonic timestamp taken once per frame; ``busy`` the seconds spent processing it.
+        """
+        self._busy = busy if self._busy is None else _EMA * busy + (1 - _EMA) * self._busy
+        if self._last_end is not None:
+            period = now - self._last_end
+            self._period = period if self._period is None else _EMA * period + (1 - _EMA) * self._period
+        self._last_end = now
+
+        if self.adaptive:
+            target, limited_by = self._activity_rate(now, ear, jaw, eye_closed)
+            if self.cpu_budget > 0 and self._busy > 0:
+                cap = self.cpu_budget / self._busy
+                if cap < target:
+                    floor = self.min_fps if ear is None else self.face_floor
+                    target, limited_by = max(cap, floor), "budget"
+            self.target_fps, self.limited_by = target, limited_by
+        return 1.0 / self.target_fps
+
+    def _activity_rate(self, now: float, ear: Optional[float], jaw: Optional[float], eye_closed: bool) -> tuple[float, str]:
+        if ear is None:
+            self._ear = self._jaw = None
+            return self.min_fps, "noFace"
+        # A face that just appeared counts as movement, so the rate comes back up right away.
+        active = eye_closed or self._ear is None
+        if self._ear is not None and abs(ear - self._ear) > ACTIVE_DELTA * max(self._ear, 1e-3):
+            active = True
+        if jaw is not None and self._jaw is not None and abs(jaw - self._jaw) > ACTIVE_DELTA:
+            active = True
+        self._ear, self._jaw = ear, jaw
+        if active:
+            self._last_active = now
+        if now - self._last_active < HOLD_SECONDS:
+            return self.max_fps, "activity"
+        return max(self.face_floor, self.target_fps * DECAY), "stable"
+
+    def stats(self) -> dict[str, Any]:
+        effective = 1.0 / self._period if self._period else 0.0
+        busy = self._busy or 0.0
+        return {
+            "adaptive": self.adaptive,
+            "targetFps": self.target_fps,
+            "effectiveFps": effective,
+            "limitedBy": self.limited_by,
+            "busyMs": busy * 1000.0,
+            "cpuBudget": self.cpu_budget,
+            # Fraction of one core spent processing frames at the current rate.
+            "budgetUse": busy * effective,
+        }
@@ -0,0 +1,129 @@
+"""Bounded latest-frame ring shared by the capture thread and the inference worker."""
+
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+
+_FREE, _WRITING, _READY, _READING = 0, 1, 2, 3
+
+
+class FrameRing:
+    """Preallocated frame slots; the writer never allocates once the frame shape is known.
+
+    With ``drop_oldest`` (live sources) the writer recycles the oldest unread frame and the
+    reader always takes the newest one, so stale frames are skipped and counted as dropped.
+    Without it (recorded sources) the writer waits for a free slot and no frame is lost.
+    """
+
+    def __init__(self, np: Any, slots: int = 3, drop_oldest: bool = True) -> None:
+        self._np = np
+        self._cond = threading.Condition()
+        self._n = max(3, slots)
+        self._buffers: list[Optional["np.ndarray"]] = [None] * self._n
+        self._frames: list[Optional["np.ndarray"]] = [None] * self._n
+        self._state = [_FREE] * self._n
+        self._ts = [0] * self._n
+        self._seq = [0] * self._n
+        self._next_seq = 0
+        self._closed = False
+        self.drop_oldest = drop_oldest
+
+        self.captured = 0
+        self.dropped = 0
+        self.consumed = 0
+
+    @property
+    def closed(self) -> bool:
+        with self._cond:
+            return self._closed
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def counters(self) -> dict[str, int]:
+        with self._cond:
+            return {"captured": self.captured, "dropped": self.dropped, "consumed": self.consumed}
+
+    def _oldest_ready(self) -> int:
+        best = -1
+        for i, st in enumerate(self._state):
+            if st == _READY and (best < 0 or self._seq[i] < self._seq[best]):
+                best = i
+        return best
+
+    def begin_write(self, timeout: float = 0.5) -> tuple[int, Optional["np.ndarray"]]:
+        """Reserve a slot for the next frame; returns (-1, None) on timeout or close."""
+        with self._cond:
+            while not self._closed:
+                if _FREE in self._state:
+                    slot = self._state.index(_FREE)
+                elif self.drop_oldest and _READY in self._state:
+                    slot = self._oldest_ready()
+                    self.dropped += 1
+                else:
+                    if not self._cond.wait(timeout):
+                        return -1, None
+                    continue
+                self._state[slot] = _WRITING
+                return slot, self._buffers[slot]
+            return -1, None
+
+    def commit(self, slot: int, frame: "np.ndarray", ts_ms: int) -> None:
+        buf = self._buffers[slot]
+        if frame is not buf:
+            # Source produced its own array: copy into the slot buffer, (re)allocating only on shape change.
+            if buf is None or buf.shape != frame.shape or buf.dtype != frame.dtype:
+                buf = self._np.empty_like(frame)
+                self._buffers[slot] = buf
+            self._np.copyto(buf, frame)
+        with self._cond:
+            self._frames[slot] = buf
+            self._ts[slot] = ts_ms
+            self._next_seq += 1
+            self._seq[slot] = self._next_seq
+            self._state[slot] = _READY
+            self.captured += 1
+            self._cond.notify_all()
+
+    def abort_write(self, slot: int) -> None:
+        with self._cond:
+            self._state[slot] = _FREE
+            self._cond.notify_all()
+
+    def take_latest(self, timeout: float = 0.5) -> Optional[tuple[int, "np.ndarray", int]]:
+        """Return (slot, frame, ts_ms) for the freshest ready frame; older ready frames are dropped."""
+        with self._cond:
+            while True:
+                newest = -1
+                for i, st in enumerate(self._state):
+                    if st == _READY and (newest < 0 or self._seq[i] > self._seq[newest]):
+                        newest = i
+                if newest >= 0:
+                    break
+                if self._closed or not self._cond.wait(timeout):
+                    return None
+            if self.drop_oldest:
+                for i, st in enumerate(self._state):
+                    if st == _READY and i != newest:
+                        self._state[i] = _FREE
+                        self.dropped += 1
+            elif any(st == _READY and self._seq[i] < self._seq[newest] for i, st in enumerate(self._state)):
+                # Lossless mode consumes frames in order.
+                newest = self._oldest_ready()
+            self._state[newest] = _READING
+            frame = self._frames[newest]
+            assert frame is not None
+            return newest, frame, self._ts[newest]
+
+    def end_read(self, slot: int) -> None:
+        with self._cond:
+            self._state[slot] = _FREE
+            self.consumed += 1
+            self._cond.notify_all()
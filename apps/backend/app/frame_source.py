@@ -0,0 +1,217 @@
+"""Frame sources feeding the face tracker (camera, video file, image directory, synthetic)."""
+
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".webp")
+
+
+class FrameSource:
+    """Base class: yields BGR frames plus a monotonically increasing timestamp in ms.
+
+    Live sources stamp frames with wall-clock time. Recorded sources stamp them from
+    the frame index and the nominal fps, so replays are deterministic.
+    """
+
+    live = False
+    name = "source"
+
+    def open(self) -> tuple[bool, Optional[str]]:
+        return True, None
+
+    def read(self, out: Optional["np.ndarray"] = None) -> tuple[bool, Optional["np.ndarray"], int]:
+        """Read the next frame. Sources backed by cv2.VideoCapture decode straight into ``out``
+        when given a buffer of the right shape; others may ignore it."""
+        raise NotImplementedError
+
+    def release(self) -> None:
+        pass
+
+    def describe(self) -> str:
+        return self.name
+
+
+class CameraSource(FrameSource):
+    live = True
+
+    def __init__(self, cv2: Any, index: int) -> None:
+        self._cv2 = cv2
+        self.index = index
+        self.name = f"camera:{index}"
+        self._cap: Any = None
+
+    def open(self) -> tuple[bool, Optional[str]]:
+        self._cap = self._cv2.VideoCapture(self.index)
+        if not self._cap.isOpened():
+            return False, f"camera not available (CAMERA_INDEX={self.index})"
+        return True, None
+
+    def read(self, out: Optional["np.ndarray"] = None) -> tuple[bool, Optional["np.ndarray"], int]:
+        ok, frame = self._cap.read(out) if out is not None else self._cap.read()
+        return bool(ok), frame, int(time.time() * 1000)
+
+    def release(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class _IndexedSource(FrameSource):
+    """Recorded source: timestamps derive from the frame counter, never from the clock."""
+
+    def __init__(self, fps: float, loop: bool) -> None:
+        self.fps = fps if fps > 0 else 30.0
+        self.loop = loop
+        self._index = 0
+
+    def _next_ts(self) -> int:
+        ts = int(round(self._index * 1000.0 / self.fps))
+        self._index += 1
+        return ts
+
+
+class VideoFileSource(_IndexedSource):
+    def __init__(self, cv2: Any, path: Path, loop: bool = False, fps: float = 0.0) -> None:
+        super().__init__(fps, loop)
+        self._cv2 = cv2
+        self.path = path
+        self.name = f"video:{path}"
+        self._cap: Any = None
+
+    def open(self) -> tuple[bool, Optional[str]]:
+        if not self.path.is_file():
+            return False, f"video file not found: {self.path}"
+        self._cap = self._cv2.VideoCapture(str(self.path))
+        if not self._cap.isOpened():
+            return False, f"cannot open video file: {self.path}"
+        native_fps = float(self._cap.get(self._cv2.CAP_PROP_FPS) or 0.0)
+        if native_fps > 0:
+            self.fps = native_fps
+        return True, None
+
+    def read(self, out: Optional["np.ndarray"] = None) -> tuple[bool, Optional["np.ndarray"], int]:
+        ok, frame = self._cap.read(out) if out is not None else self._cap.read()
+        if not ok and self.loop:
+            self._cap.set(self._cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self._cap.read(out) if out is not None else self._cap.read()
+        if not ok:
+            return False, None, -1
+        return True, frame, self._next_ts()
+
+    def release(self) -> None:
+        if self._cap is not None:
+            self._cap.release()
+            self._cap = None
+
+
+class ImageDirSource(_IndexedSource):
+    def __init__(self, cv2: Any, path: Path, loop: bool = False, fps: float = 30.0) -> None:
+        super().__init__(fps, loop)
+        self._cv2 = cv2
+        self.path = path
+        self.name = f"images:{path}"
+        self._files: list[Path] = []
+        self._pos = 0
+
+    def open(self) -> tuple[bool, Optional[str]]:
+        if not self.path.is_dir():
+            return False, f"image directory not found: {self.path}"
+        self._files = sorted(p for p in self.path.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+        if not self._files:
+            return False, f"no images in {self.path}"
+        return True, None
+
+    def read(self, out: Optional["np.ndarray"] = None) -> tuple[bool, Optional["np.ndarray"], int]:
+        # Unreadable files are skipped; a full pass without one readable image ends the source.
+        for _ in range(len(self._files)):
+            if self._pos >= len(self._files):
+                if not self.loop:
+                    return False, None, -1
+                self._pos = 0
+            frame = self._cv2.imread(str(self._files[self._pos]))
+            self._pos += 1
+            if frame is not None:
+                return True, frame, self._next_ts()
+        return False, None, -1
+
+
+class ArraySource(_IndexedSource):
+    """In-memory frames, e.g. a numpy generator in benchmarks or tests."""
+
+    def __init__(self, frames: Callable[[], Iterable["np.ndarray"]], fps: float = 30.0, loop: bool = False, name: str = "array") -> None:
+        super().__init__(fps, loop)
+        self._factory = frames
+        self._it: Optional[Iterator["np.ndarray"]] = None
+        self.name = name
+
+    def open(self) -> tuple[bool, Optional[str]]:
+        self._it = iter(self._factory())
+        return True, None
+
+    def read(self, out: Optional["np.ndarray"] = None) -> tuple[bool, Optional["np.ndarray"], int]:
+        assert self._it is not None
+        frame = next(self._it, None)
+        if frame is None and self.loop:
+            self._it = iter(self._factory())
+            frame = next(self._it, None)
+        if frame is None:
+            return False, None, -1
+        return True, frame, self._next_ts()
+
+
+def synthetic_frames(np: Any, width: int, height: int, count: int = 300, seed: int = 0) -> Callable[[], Iterable["np.ndarray"]]:
+    """Deterministic noise frames (no face); exercises capture + inference cost only."""
+
+    def factory() -> Iterable["np.ndarray"]:
+        rng = np.random.default_rng(seed)
+        for _ in range(count):
+            yield rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+    return factory
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    raw = os.getenv(name)
+    if raw is None:
+        return default
+    return raw.strip().lower() in ("1", "true", "yes", "on")
+
+
+def frame_source_from_spec(spec: str, cv2: Any, np: Any) -> FrameSource:
+    """Build a source from ``kind:arg``.
+
+    Supported: ``camera:0``, ``video:/path/file.mp4``, ``images:/path/dir``,
+    ``synthetic:640x480``. A bare integer is treated as a camera index.
+    Looping and nominal fps for recorded sources come from FRAME_SOURCE_LOOP / FRAME_SOURCE_FPS.
+    """
+    spec = spec.strip()
+    kind, _, arg = spec.partition(":")
+    if not arg and kind.isdigit():
+        kind, arg = "camera", kind
+
+    loop = env_flag("FRAME_SOURCE_LOOP")
+    fps = float(os.getenv("FRAME_SOURCE_FPS", "30"))
+
+    if kind == "camera":
+        return CameraSource(cv2, int(arg or "0"))
+    if kind == "video":
+        return VideoFileSource(cv2, Path(arg), loop=loop, fps=0.0)
+    if kind == "images":
+        return ImageDirSource(cv2, Path(arg), loop=loop, fps=fps)
+    if kind == "synthetic":
+        w, _, h = (arg or "640x480").lower().partition("x")
+        count = int(os.getenv("FRAME_SOURCE_COUNT", "300"))
+        return ArraySource(synthetic_frames(np, int(w), int(h or w), count=count), fps=fps, loop=loop, name=f"synthetic:{arg or '640x480'}")
+    raise ValueError(f"unknown frame source: {spec!r}")
+
+
+def default_source_spec() -> str:
+    return os.getenv("FRAME_SOURCE") or f"camera:{int(os.getenv('CAMERA_INDEX', '0'))}"
@@ -0,0 +1,131 @@
+"""Incremental scanner for JSON objects embedded in streamed model output."""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Callable, Optional
+
+
+_STRUCTURAL = re.compile(r'[{}\[\]",]')
+_STRING_STOP = re.compile(r'["\\]')
+_WHITESPACE = " \t\r\n"
+
+
+class JsonObjectScanner:
+    """Finds top-level ``{...}`` objects in text fed piece by piece, in one linear pass.
+
+    The scanner tracks nesting depth and string/escape state only; it does not tokenize values.
+    Each top-level member is handed to ``json.loads`` once, as soon as the ``,`` or ``}`` that
+    ends it arrives, so callers can surface fields (e.g. ``topics``) before the object closes.
+    Text outside objects is skipped with ``str.find``, and a ``{`` that is not followed by a
+    key (prose such as ``{ hmm``) is dropped instead of swallowing the rest of the stream.
+    """
+
+    def __init__(self, accept: Optional[Callable[[dict[str, Any]], bool]] = None) -> None:
+        self._accept = accept
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._valid = True
+        self._member: list[str] = []
+        self._object: dict[str, Any] = {}
+        self.last_object: Optional[dict[str, Any]] = None
+
+    def feed(self, text: str) -> list[tuple[str, Any]]:
+        """Scan ``text``; returns the ``(key, value)`` members of the current object completed by it."""
+        done: list[tuple[str, Any]] = []
+        i, n = 0, len(text)
+        mark = 0  # start of the current member's text within ``text``
+        while i < n:
+            if self._depth == 0:
+                i = text.find("{", i)
+                if i < 0:
+                    break
+                self._open()
+                i += 1
+                mark = i
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                    i += 1
+                    continue
+                m = _STRING_STOP.search(text, i)
+                if m is None:
+                    i = n
+                    break
+                i = m.end()
+                if m.group() == "\\":
+                    self._escape = True
+                else:
+                    self._in_string = False
+                continue
+
+            if self._expect_key:
+                while i < n and text[i] in _WHITESPACE:
+                    i += 1
+                if i == n:
+                    break
+                if text[i] not in '"}':
+                    # Not an object after all; rescan from here.
+                    self._depth = 0
+                    self._member.clear()
+                    continue
+                self._expect_key = False
+
+            m = _STRUCTURAL.search(text, i)
+            if m is None:
+                i = n
+                break
+            c, j = m.group(), m.start()
+            i = j + 1
+            if c == '"':
+                self._in_string = True
+            elif c in "{[":
+                self._depth += 1
+            elif c in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._valid = self._valid and c == "}"
+                    self._end_member(text[mark:j], done)
+                    self._close()
+            elif self._depth == 1:  # ","
+                self._end_member(text[mark:j], done)
+                mark = i
+                self._expect_key = True
+
+        if self._depth > 0 and mark < n:
+            self._member.append(text[mark:n])
+        return done
+
+    def _open(self) -> None:
+        self._depth = 1
+        self._in_string = False
+        self._escape = False
+        self._expect_key = True
+        self._valid = True
+        self._member.clear()
+        self._object = {}
+
+    def _end_member(self, tail: str, done: list[tuple[str, Any]]) -> None:
+        self._member.append(tail)
+        raw = "".join(self._member).strip()
+        self._member.clear()
+        if not raw or not self._valid:
+            return
+        try:
+            parsed = json.loads("{" + raw + "}")
+        except ValueError:
+            self._valid = False
+            return
+        for key, value in parsed.items():
+            self._object[key] = value
+            done.append((key, value))
+
+    def _close(self) -> None:
+        obj = self._object
+        if self._valid and (self._accept is None or self._accept(obj)):
+            self.last_object = obj
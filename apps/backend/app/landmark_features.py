@@ -0,0 +1,78 @@
+"""Per-frame landmark geometry (EAR, mouth opening, face scale, brow distance) as batched numpy ops.
+
+Only the handful of MediaPipe landmarks the features need are converted, in one pass, into a
+compact ``(K, 2)`` float32 array; every distance is then computed by a single fancy-index gather.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Any, Sequence
+
+import numpy as np
+
+
+# Eye landmarks in EAR order p1..p6 (p1/p4 horizontal corners, p2-p6 and p3-p5 vertical pairs).
+LEFT_EYE = (33, 160, 158, 133, 153, 144)
+RIGHT_EYE = (362, 385, 387, 263, 373, 380)
+UPPER_LIP, LOWER_LIP = 13, 14
+NOSE, CHIN = 1, 152
+BROW, EYE_TOP = 105, 159
+
+# Landmark pairs whose euclidean distance is needed, in a fixed order.
+_PAIRS = (
+    (LEFT_EYE[1], LEFT_EYE[5]),
+    (LEFT_EYE[2], LEFT_EYE[4]),
+    (LEFT_EYE[0], LEFT_EYE[3]),
+    (RIGHT_EYE[1], RIGHT_EYE[5]),
+    (RIGHT_EYE[2], RIGHT_EYE[4]),
+    (RIGHT_EYE[0], RIGHT_EYE[3]),
+    (UPPER_LIP, LOWER_LIP),
+    (NOSE, CHIN),
+    (BROW, EYE_TOP),
+)
+
+# Unique landmark ids to extract, and the pairs re-expressed as rows of the compact array.
+FEATURE_INDICES: tuple[int, ...] = tuple(sorted({i for pair in _PAIRS for i in pair}))
+_PAIR_ROWS = np.searchsorted(np.array(FEATURE_INDICES), np.array(_PAIRS))
+
+
+@dataclass
+class LandmarkFeatures:
+    ear_left: float
+    ear_right: float
+    ear: float
+    mouth_open: float
+    face_scale: float
+    brow_dist: float
+
+
+def landmark_points(lm: Sequence[Any], w: int, h: int, indices: Sequence[int] = FEATURE_INDICES) -> np.ndarray:
+    """Convert selected MediaPipe landmarks to a ``(len(indices), 2)`` float32 array in pixels."""
+    n = len(indices)
+    coords = chain.from_iterable((p.x * w, p.y * h) for p in map(lm.__getitem__, indices))
+    return np.fromiter(coords, dtype=np.float32, count=2 * n).reshape(n, 2)
+
+
+def pair_distances(pts: np.ndarray) -> np.ndarray:
+    """Distances for all feature pairs at once; ``pts`` comes from :func:`landmark_points`."""
+    g = pts[_PAIR_ROWS]  # (P, 2, 2)
+    d = g[:, 0] - g[:, 1]
+    return np.hypot(d[:, 0], d[:, 1])
+
+
+def compute_features(pts: np.ndarray) -> LandmarkFeatures:
+    # One vector op for all distances, then a single conversion to Python floats:
+    # the remaining handful of scalar ops is cheaper than more tiny array temporaries.
+    lv1, lv2, lh, rv1, rv2, rh, mouth, scale, brow = pair_distances(pts).tolist()
+    ear_left = (lv1 + lv2) / (2.0 * lh + 1e-6)
+    ear_right = (rv1 + rv2) / (2.0 * rh + 1e-6)
+    return LandmarkFeatures(
+        ear_left=ear_left,
+        ear_right=ear_right,
+        ear=(ear_left + ear_right) / 2.0,
+        mouth_open=mouth,
+        face_scale=scale + 1e-6,
+        brow_dist=brow,
+    )
@@ -0,0 +1,46 @@
+"""Chat model providers behind :func:`openai_llm.stream_chat`, selected with LLM_PROVIDER."""
+
+from __future__ import annotations
+
+import os
+from typing import Any, AsyncIterator, Optional
+
+
+class ChatProvider:
+    """Streams reply text for an already-built OpenAI-style message list."""
+
+    name = "base"
+
+    def model(self) -> str:
+        raise NotImplementedError
+
+    def stream(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        raise NotImplementedError
+
+    def stats(self) -> dict[str, Any]:
+        return {"provider": self.name, "model": self.model()}
+
+
+_provider: Optional[ChatProvider] = None
+
+
+def provider_name() -> str:
+    return os.getenv("LLM_PROVIDER", "openai").strip().lower() or "openai"
+
+
+def get_provider() -> ChatProvider:
+    """The process-wide provider; rebuilt if LLM_PROVIDER changes (e.g. between test runs)."""
+    global _provider
+    name = provider_name()
+    if _provider is None or _provider.name != name:
+        if name == "mock":
+            from .mock_llm import MockProvider
+
+            _provider = MockProvider.from_env()
+        elif name == "openai":
+            from .openai_llm import OpenAIProvider
+
+            _provider = OpenAIProvider()
+        else:
+            raise RuntimeError(f"LLM_PROVIDER tidak dikenal: {name} (pilih 'openai' atau 'mock')")
+    return _provider
@@ -1,21 +1,46 @@
 from __future__ import annotations
 
-import json
+import asyncio
 import os
-from typing import Any
+import time
+from contextlib import aclosing, asynccontextmanager
+from typing import Any, AsyncIterator, Optional
 
 from dotenv import load_dotenv
-from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from .face_tracker import FaceTracker
-from .openai_llm import ANALYSIS_MARKER, stream_chat
-from .models import ChatStreamRequest
+from .telemetry_log import LOG_SUFFIX, TelemetryLogReader, describe_session, record_dir, resolve_session
+from .tracker_pool import TrackerPool
+from .tracker_replay import ReplayTracker
+from .openai_llm import ANALYSIS_MARKER, chat_model, close_client, init_client, stream_chat
+from .admission import AdmissionController, Saturated
+from .chat_cache import ChatResponseCache, cache_key
+from .chat_history import compact_history
+from .llm_provider import get_provider, provider_name
+from .stream_splitter import AnalysisSplitter
+from .json_scanner import JsonObjectScanner
+from .models import ChatStreamRequest, StressBatchRequest
+from .stress import LEVELS, active_profile, compute_stress_index_batch, profiles
+from .sse import coalesce, flush_policy
 
 load_dotenv()
 
-app = FastAPI(title="CStress Backend", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    # One pooled OpenAI client for the whole process (created lazily if the key is set later).
+    init_client()
+    try:
+        yield
+    finally:
+        await close_client()
+
+
+app = FastAPI(title="CStress Backend", version="0.1.0", lifespan=lifespan)
 
 # CORS: Allow all localhost origins for development
 app.add_middleware(
@@ -26,150 +51,280 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-tracker = FaceTracker()
+pool = TrackerPool()
+chat_cache = ChatResponseCache.from_env()
+admission = AdmissionController.from_env()
+chat_streams = {"completed": 0, "failed": 0, "cancelled": 0}
+
+
+def _tracker_or_404(source: Optional[str]) -> FaceTracker:
+    try:
+        return pool.get(source)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"unknown face source: {source}")
 
 
 @app.get("/api/health")
 def health() -> dict[str, Any]:
-    return {"ok": True, "openaiConfigured": bool(os.getenv("OPENAI_API_KEY"))}
+    return {"ok": True, "openaiConfigured": bool(os.getenv("OPENAI_API_KEY")), "llmProvider": provider_name()}
+
+
+@app.get("/api/face/sources")
+def face_sources() -> dict[str, Any]:
+    return {"sources": pool.sources(), "execution": pool.execution, "maxWorkers": pool.max_workers}
+
+
+@app.get("/api/face/pool")
+def face_pool() -> dict[str, Any]:
+    return pool.stats()
+
+
+@app.get("/api/face/stats")
+def face_stats(source: Optional[str] = None) -> dict[str, Any]:
+    return _tracker_or_404(source).stats()
+
+
+@app.get("/api/face/calibration")
+def face_calibration(source: Optional[str] = None) -> dict[str, Any]:
+    return _tracker_or_404(source).calibration()
+
+
+@app.post("/api/face/calibration/reset")
+def face_calibration_reset(source: Optional[str] = None) -> dict[str, Any]:
+    tracker = _tracker_or_404(source)
+    tracker.reset_calibration()
+    return tracker.calibration()
+
+
+@app.get("/api/face/history")
+def face_history(
+    source: Optional[str] = None,
+    from_: Optional[float] = Query(default=None, alias="from"),
+    to: Optional[float] = None,
+    step: float = Query(default=1.0, gt=0),
+) -> dict[str, Any]:
+    tracker = _tracker_or_404(source)
+    if isinstance(tracker, ReplayTracker):
+        raise HTTPException(
+            status_code=400,
+            detail=f"replayed sources have no live history; use /api/face/sessions/{tracker.path.stem}",
+        )
+    t_to = to if to is not None else time.time()
+    t_from = from_ if from_ is not None else t_to - 300.0
+    if t_from > t_to:
+        raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+    if (t_to - t_from) / step > 10_000:
+        raise HTTPException(status_code=400, detail="too many buckets; increase 'step'")
+    result = tracker.history(t_from, t_to, step)
+    if result is None:
+        raise HTTPException(status_code=503, detail="telemetry history unavailable (numpy missing)")
+    return result
+
+
+@app.get("/api/face/sessions")
+def face_sessions() -> dict[str, Any]:
+    directory = record_dir()
+    if directory is None or not directory.is_dir():
+        return {"sessions": []}
+    sessions = []
+    for path in sorted(directory.glob(f"*{LOG_SUFFIX}")):
+        try:
+            sessions.append(describe_session(path))
+        except (OSError, ValueError):
+            continue
+    return {"sessions": sessions}
+
+
+@app.get("/api/face/sessions/{name}")
+def face_session(
+    name: str,
+    from_: Optional[float] = Query(default=None, alias="from"),
+    to: Optional[float] = None,
+    step: float = Query(default=1.0, gt=0),
+) -> dict[str, Any]:
+    path = resolve_session(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"unknown session: {name}")
+    with TelemetryLogReader(path) as reader:
+        start, end = reader.span()
+        if start is None or end is None:
+            return {"name": name, "records": 0, "from": from_, "to": to, "step": step, "t": [], "count": [], "fields": {}}
+        t_from = from_ if from_ is not None else start
+        t_to = to if to is not None else end
+        if t_from > t_to:
+            raise HTTPException(status_code=400, detail="'from' must not be after 'to'")
+        if (t_to - t_from) / step > 10_000:
+            raise HTTPException(status_code=400, detail="too many buckets; increase 'step'")
+        return {"name": name, "records": len(reader), **reader.aggregate(t_from, t_to, step)}
 
 
 @app.websocket("/ws/face")
-async def ws_face(ws: WebSocket):
+async def ws_face(
+    ws: WebSocket,
+    source: Optional[str] = None,
+    maxFps: Optional[float] = None,
+    encoding: str = "json",
+):
     await ws.accept()
-    tracker.acquire()
     try:
-        fps = int(os.getenv("TRACK_FPS", "10"))
-        async for tel in tracker.aiter(fps=fps):
-            if tel is None:
-                await ws.send_json({"enabled": True, "ok": False})
-            else:
-                await ws.send_json(
-                    {
-                        "enabled": True,
-                        "ok": (getattr(tel, "error", None) is None)
-                        and (tel.stressIndex is not None or tel.blinkPerMin is not None or tel.jawOpenness is not None),
-                        "ts": tel.ts,
-                        "blinkPerMin": tel.blinkPerMin,
-                        "blinkPer10s": getattr(tel, "blinkPer10s", None),
-                        "jawOpenness": tel.jawOpenness,
-                        "browTension": tel.browTension,
-                        "stressIndex": tel.stressIndex,
-                        "level": tel.level,
-                        "error": getattr(tel, "error", None),
-                    }
-                )
-    except WebSocketDisconnect:
-        pass
+        sid = pool.resolve(source)
+    except KeyError:
+        await ws.send_json({"enabled": True, "ok": False, "error": f"unknown face source: {source}"})
+        await ws.close(code=1008)
+        return
+    # acquire() may wait for a previous worker of this source to exit; keep the event loop free.
+    tracker = await asyncio.to_thread(pool.acquire, sid)
+
+    async def send_frames() -> None:
+        # Frames are serialized once per sample and shared by every client of this source.
+        if encoding == "binary":
+            async for frame in tracker.aiter_frames(max_fps=maxFps):
+                await ws.send_bytes(frame.binary)
+        else:
+            async for frame in tracker.aiter_frames(max_fps=maxFps):
+                await ws.send_text(frame.json)
+
+    async def until_disconnect() -> None:
+        # Sends only happen on new telemetry; a stalled source would otherwise never notice
+        # a client that went away, and the tracker would stay held.
+        while (await ws.receive())["type"] != "websocket.disconnect":
+            pass
+
+    tasks = [asyncio.create_task(send_frames()), asyncio.create_task(until_disconnect())]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            exc = task.exception()
+            if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                raise exc
     finally:
-        tracker.release()
+        # No awaits here: a cancelled handler (server shutdown) must still release the tracker.
+        for task in tasks:
+            task.cancel()
+        pool.release(sid)
+
+
+@app.post("/api/stress/batch")
+def stress_batch(body: StressBatchRequest) -> dict[str, Any]:
+    columns = [body.blinkPerMin, body.jawOpenness, body.browTension]
+    lengths = {len(c) for c in columns if c is not None}
+    if len(lengths) > 1:
+        raise HTTPException(status_code=422, detail="signal arrays must have the same length")
+    n = lengths.pop() if lengths else 0
+    try:
+        import numpy as np
+    except ImportError:
+        raise HTTPException(status_code=503, detail="batch scoring unavailable (numpy missing)")
+
+    def column(values: Optional[list[Optional[float]]]) -> Any:
+        if values is None:
+            return np.full(n, np.nan)
+        return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+    profile = active_profile()
+    index, codes = compute_stress_index_batch(*(column(c) for c in columns), profile=profile)
+    names = (None,) + LEVELS
+    return {
+        "count": n,
+        "profileVersion": profile.version,
+        "stressIndex": [None if x != x else x for x in index.tolist()],
+        "level": [names[c] for c in codes.tolist()],
+    }
+
+
+@app.get("/api/stress/profile")
+def stress_profile() -> dict[str, Any]:
+    profiles.current()
+    return profiles.describe()
+
+
+@app.post("/api/stress/profile/reload")
+def stress_profile_reload() -> dict[str, Any]:
+    # Trackers pick up file edits on their own (mtime check); this forces it now and reports errors.
+    profiles.reload()
+    if profiles.last_error:
+        raise HTTPException(status_code=400, detail=f"profile not loaded: {profiles.last_error}")
+    return profiles.describe()
+
+
+@app.get("/api/chat/metrics")
+def chat_metrics() -> dict[str, Any]:
+    return {
+        "streams": dict(chat_streams),
+        "admission": admission.stats(),
+        "cache": chat_cache.stats(),
+        "provider": get_provider().stats(),
+    }
 
 
 @app.post("/api/chat/stream")
-async def chat_stream(body: ChatStreamRequest):
+async def chat_stream(body: ChatStreamRequest, request: Request):
+    # Wait for (or fail fast without) an upstream slot before any response bytes are committed.
+    client = request.client.host if request.client else "unknown"
+    try:
+        ticket = await admission.acquire(client)
+    except Saturated as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
     async def event_stream():
         # Initial ping
-        yield "event: ping\n"
-        yield f"data: {json.dumps({'t': __import__('time').time()})}\n\n"
+        yield "ping", {"t": time.time()}
 
         try:
-            carry = ""
-            analysis_started = False
-            analysis_buffer = ""
-            full_response = ""  # Store entire response for fallback
-
-            async for token in stream_chat(body.messages, body.faceSignals):
-                full_response += token  # Collect full response
-                
-                if analysis_started:
-                    analysis_buffer += token
-                    continue
-
-                carry += token
-                idx = carry.find(ANALYSIS_MARKER)
-                if idx >= 0:
-                    # Emit everything before marker, then switch to analysis buffering.
-                    visible = carry[:idx]
+            splitter = AnalysisSplitter(ANALYSIS_MARKER)
+            # Members of the analysis object are forwarded as soon as each one is complete; the
+            # visible text is scanned too, in case the model wrote the JSON without the marker.
+            analysis_scanner = JsonObjectScanner()
+            fallback_scanner = JsonObjectScanner(accept=lambda obj: "topics" in obj and "summary" in obj)
+
+            # Identical requests (client retries, resubmits) replay a cached reply or share one
+            # upstream stream instead of each paying a full model round trip.
+            history = compact_history(body.messages, body.summary)
+            key = cache_key(chat_model(), history, body.faceSignals)
+            upstream = chat_cache.stream(key, lambda: stream_chat(history, body.faceSignals))
+
+            async with aclosing(upstream) as tokens:
+                async for token in tokens:
+                    visible, analysis_text = splitter.feed(token)
                     if visible:
-                        yield "event: token\n"
-                        yield f"data: {json.dumps({'token': visible})}\n\n"
-                    analysis_started = True
-                    analysis_buffer = carry[idx + len(ANALYSIS_MARKER) :]
-                    carry = ""
-                    continue
-
-                # Emit safe portion, keep a tail to catch marker across chunk boundaries.
-                safe_len = max(0, len(carry) - (len(ANALYSIS_MARKER) + 8))
-                if safe_len > 0:
-                    visible = carry[:safe_len]
-                    carry = carry[safe_len:]
-                    yield "event: token\n"
-                    yield f"data: {json.dumps({'token': visible})}\n\n"
-
-            # Flush any remaining visible carry (only if marker never appeared)
-            # If analysis_started is True, carry should be empty anyway
-            if carry and not analysis_started:
-                # Double check: don't send if marker is in carry
-                if ANALYSIS_MARKER not in carry:
-                    yield "event: token\n"
-                    yield f"data: {json.dumps({'token': carry})}\n\n"
-
-            # Try parse analysis JSON
-            analysis_sent = False
-            if analysis_started and analysis_buffer:
-                raw = analysis_buffer.strip()
-                print(f"[DEBUG] Analysis buffer received: {raw[:200]}...")  # Debug log
-                # Some models might add whitespace; ensure we parse the outermost object.
-                start = raw.find("{")
-                end = raw.rfind("}")
-                if start >= 0 and end > start:
-                    raw_obj = raw[start : end + 1]
-                    try:
-                        analysis = json.loads(raw_obj)
-                        print(f"[DEBUG] Successfully parsed analysis: {analysis}")  # Debug log
-                        yield "event: analysis\n"
-                        yield f"data: {json.dumps({'analysis': analysis})}\n\n"
-                        analysis_sent = True
-                    except Exception as parse_err:
-                        print(f"[ERROR] Failed to parse analysis JSON: {parse_err}")  # Debug log
-            
-            # FALLBACK: If no analysis was sent, try to extract from full response
-            if not analysis_sent:
-                print("[DEBUG] No analysis marker found, trying fallback extraction...")
-                # Try to find JSON in the last 1500 characters
-                tail = full_response[-1500:] if len(full_response) > 1500 else full_response
-                start = tail.rfind("{")
-                if start >= 0:
-                    json_candidate = tail[start:]
-                    # Try to find the closing brace
-                    brace_count = 0
-                    end_pos = -1
-                    for i, char in enumerate(json_candidate):
-                        if char == "{":
-                            brace_count += 1
-                        elif char == "}":
-                            brace_count -= 1
-                            if brace_count == 0:
-                                end_pos = i + 1
-                                break
-                    
-                    if end_pos > 0:
-                        json_str = json_candidate[:end_pos]
-                        try:
-                            analysis = json.loads(json_str)
-                            # Validate it has required fields
-                            if "topics" in analysis and "summary" in analysis:
-                                print(f"[DEBUG] Fallback extraction succeeded: {analysis}")
-                                yield "event: analysis\n"
-                                yield f"data: {json.dumps({'analysis': analysis})}\n\n"
-                                analysis_sent = True
-                        except Exception as fallback_err:
-                            print(f"[DEBUG] Fallback extraction failed: {fallback_err}")
-
-            yield "event: done\n"
-            yield f"data: {json.dumps({'ok': True})}\n\n"
+                        fallback_scanner.feed(visible)
+                        yield "token", {"token": visible}
+                    if analysis_text:
+                        for field, value in analysis_scanner.feed(analysis_text):
+                            yield "analysis_partial", {"key": field, "value": value}
+
+            # Stream ended without a marker: release any held-back partial match as text.
+            rest = splitter.finish()
+            if rest:
+                fallback_scanner.feed(rest)
+                yield "token", {"token": rest}
+
+            analysis = analysis_scanner.last_object
+            if analysis is None:
+                if splitter.found:
+                    print(f"[ERROR] Failed to parse analysis JSON: {splitter.analysis[:200]}...")  # Debug log
+                analysis = fallback_scanner.last_object
+            if analysis is not None:
+                yield "analysis", {"analysis": analysis}
+
+            yield "done", {"ok": True}
+            chat_streams["completed"] += 1
+        except (asyncio.CancelledError, GeneratorExit):
+            # Client went away (Starlette cancels the response on disconnect); leaving the
+            # aclosing block above has already closed the upstream stream.
+            chat_streams["cancelled"] += 1
+            raise
         except Exception as e:
-            yield "event: error\n"
-            yield f"data: {json.dumps({'message': str(e)})}\n\n"
+            chat_streams["failed"] += 1
+            yield "error", {"message": str(e)}
+        finally:
+            ticket.release()
 
-    return StreamingResponse(event_stream(), media_type="text/event-stream")
+    # Token deltas are coalesced into one pre-encoded write per flush (see SSE_FLUSH_MS/BYTES).
+    max_delay, max_bytes = flush_policy()
+    # The background task covers a response that is dropped before its body is ever iterated.
+    return StreamingResponse(
+        coalesce(event_stream(), max_delay, max_bytes),
+        media_type="text/event-stream",
+        background=BackgroundTask(ticket.release),
+    )
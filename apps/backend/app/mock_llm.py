@@ -0,0 +1,159 @@
+"""Deterministic local chat provider for offline development, benchmarks and load tests.
+
+The reply is a function of the conversation and MOCK_LLM_SEED only, so identical requests get
+identical streams (chunk boundaries included) and a benchmark run can be repeated exactly.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import random
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from .llm_provider import ChatProvider
+from .openai_llm import ANALYSIS_MARKER
+
+_SENTENCES = (
+    "Aku memahami perasaanmu, dan wajar sekali kalau kamu merasa seperti ini.",
+    "Terima kasih sudah mau bercerita, itu langkah yang tidak mudah.",
+    "Sudah berapa lama kamu merasa seperti ini?",
+    "Apa yang paling membuatmu lelah dari situasi ini?",
+    "Coba tarik napas pelan-pelan selama beberapa detik, lalu hembuskan perlahan.",
+    "Kamu tidak sendirian, dan perasaanmu itu valid.",
+    "Kalau boleh tahu, apa yang biasanya membantumu merasa sedikit lebih tenang?",
+    "Istirahat yang cukup dan jeda singkat di sela pekerjaan bisa sangat membantu.",
+)
+
+_TOPICS = ("stres", "pekerjaan", "kelelahan", "tidur", "hubungan", "kecemasan")
+
+
+class MockUpstreamError(RuntimeError):
+    pass
+
+
+def _env_range(name: str, default: str) -> tuple[int, int]:
+    lo, _, hi = os.getenv(name, default).partition("-")
+    a = max(1, int(lo))
+    return a, max(a, int(hi or lo))
+
+
+@dataclass(frozen=True)
+class MockConfig:
+    tokens_per_sec: float = 60.0  # chunks per second; 0 = no pacing
+    first_token_ms: float = 300.0
+    chunk_chars: tuple[int, int] = (2, 8)
+    reply_sentences: tuple[int, int] = (3, 6)
+    with_analysis: bool = True
+    fail_rate: float = 0.0  # fraction of requests that fail mid-stream
+    fail_after: int = 5  # chunks sent before an injected failure
+    seed: int = 0
+
+    @classmethod
+    def from_env(cls) -> "MockConfig":
+        return cls(
+            tokens_per_sec=float(os.getenv("MOCK_LLM_TOKENS_PER_SEC", "60")),
+            first_token_ms=float(os.getenv("MOCK_LLM_FIRST_TOKEN_MS", "300")),
+            chunk_chars=_env_range("MOCK_LLM_CHUNK_CHARS", "2-8"),
+            reply_sentences=_env_range("MOCK_LLM_SENTENCES", "3-6"),
+            with_analysis=os.getenv("MOCK_LLM_ANALYSIS", "1").strip().lower() not in ("0", "false", "no"),
+            fail_rate=float(os.getenv("MOCK_LLM_FAIL_RATE", "0")),
+            fail_after=int(os.getenv("MOCK_LLM_FAIL_AFTER", "5")),
+            seed=int(os.getenv("MOCK_LLM_SEED", "0")),
+        )
+
+
+class MockProvider(ChatProvider):
+    name = "mock"
+
+    def __init__(self, config: MockConfig) -> None:
+        self.config = config
+        self.started = 0
+        self.completed = 0
+        self.failed = 0
+        self.closed_early = 0
+        self.open_streams = 0
+
+    @classmethod
+    def from_env(cls) -> "MockProvider":
+        return cls(MockConfig.from_env())
+
+    def model(self) -> str:
+        return f"mock-{self.config.seed}"
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            **super().stats(),
+            "started": self.started,
+            "completed": self.completed,
+            "failed": self.failed,
+            "closedEarly": self.closed_early,
+            "openStreams": self.open_streams,
+        }
+
+    def _rng(self, messages: list[dict[str, str]]) -> random.Random:
+        raw = json.dumps(messages, ensure_ascii=False, sort_keys=True).encode("utf-8")
+        digest = hashlib.sha256(raw + str(self.config.seed).encode("ascii")).digest()
+        return random.Random(int.from_bytes(digest[:8], "little"))
+
+    def reply_text(self, rng: random.Random) -> str:
+        cfg = self.config
+        n = rng.randint(*cfg.reply_sentences)
+        text = " ".join(rng.choice(_SENTENCES) for _ in range(n))
+        if not cfg.with_analysis:
+            return text
+        analysis = {
+            "topics": rng.sample(_TOPICS, 2),
+            "summary": "User sedang merasa tertekan dan butuh didengarkan.",
+            "stress_level": rng.choice(("rendah", "sedang", "tinggi")),
+            "chat_sentiment": rng.choice(("positif", "netral", "negatif")),
+            "early_actions": ["Tarik napas dalam", "Istirahat sejenak"],
+            "when_to_seek_help": ["Jika keluhan berlanjut lebih dari 2 minggu"],
+            "disclaimer": "Ini bukan diagnosis medis.",
+        }
+        return text + ANALYSIS_MARKER + json.dumps(analysis, ensure_ascii=False)
+
+    def chunks(self, rng: random.Random, text: str) -> list[str]:
+        lo, hi = self.config.chunk_chars
+        out: list[str] = []
+        i = 0
+        while i < len(text):
+            j = i + rng.randint(lo, hi)
+            out.append(text[i:j])
+            i = j
+        return out
+
+    async def stream(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        cfg = self.config
+        rng = self._rng(messages)
+        chunks = self.chunks(rng, self.reply_text(rng))
+        fail = cfg.fail_rate > 0 and rng.random() < cfg.fail_rate
+        interval = 1.0 / cfg.tokens_per_sec if cfg.tokens_per_sec > 0 else 0.0
+
+        self.started += 1
+        self.open_streams += 1
+        finished = False
+        try:
+            if cfg.first_token_ms > 0:
+                await asyncio.sleep(cfg.first_token_ms / 1000.0)
+            loop = asyncio.get_running_loop()
+            start = loop.time()
+            for i, chunk in enumerate(chunks):
+                if fail and i >= cfg.fail_after:
+                    self.failed += 1
+                    finished = True
+                    raise MockUpstreamError("mock upstream failure (MOCK_LLM_FAIL_RATE)")
+                if interval:
+                    # Pace against the stream start so scheduling jitter does not accumulate.
+                    delay = start + i * interval - loop.time()
+                    await asyncio.sleep(delay if delay > 0 else 0)
+                yield chunk
+            self.completed += 1
+            finished = True
+        finally:
+            self.open_streams -= 1
+            if not finished:
+                self.closed_early += 1
@@ -25,3 +25,12 @@ class FaceSignals(BaseModel):
 class ChatStreamRequest(BaseModel):
     messages: list[ChatMessage] = Field(min_length=1)
     faceSignals: Optional[FaceSignals] = None
+    # Latest analysis.summary from the client; stands in for turns dropped by history compaction.
+    summary: Optional[str] = Field(default=None, max_length=4000)
+
+
+class StressBatchRequest(BaseModel):
+    # Parallel arrays, one entry per sample; null (or an omitted array) means the signal is missing.
+    blinkPerMin: Optional[list[Optional[float]]] = Field(default=None, max_length=1_000_000)
+    jawOpenness: Optional[list[Optional[float]]] = Field(default=None, max_length=1_000_000)
+    browTension: Optional[list[Optional[float]]] = Field(default=None, max_length=1_000_000)
@@ -1,156 +1,230 @@
 from __future__ import annotations
 
 import os
+from contextlib import aclosing
 from typing import Any, AsyncIterator, Optional
 
+from .llm_provider import ChatProvider, get_provider
 from .models import ChatMessage, FaceSignals
 
 
 ANALYSIS_MARKER = "\n\n[[ANALYSIS_JSON]]\n"
 
 
-def _build_system_prompt(face: Optional[FaceSignals], chat_history: Optional[list[ChatMessage]] = None) -> str:
-    face_context = ""
-    if face and face.enabled:
-        face_context = (
-            "\n\nKONTEKS FACE TRACKING (indikatif, bukan diagnosis):\n"
-            f"- stressIndex: {face.stressIndex if face.stressIndex is not None else 'n/a'} (0-100)\n"
-            f"- level: {face.level or 'n/a'}\n"
-            f"- blinkPerMin: {face.blinkPerMin if face.blinkPerMin is not None else 'n/a'}\n"
-            f"- jawOpenness: {face.jawOpenness if face.jawOpenness is not None else 'n/a'}\n"
-            f"- browTension: {face.browTension if face.browTension is not None else 'n/a'}\n"
-            "Gunakan konteks ini hanya sebagai sinyal tambahan, jangan menyimpulkan kondisi medis."
-        )
-    
-    chat_sentiment_context = ""
-    if chat_history and len(chat_history) > 0:
-        chat_sentiment_context = (
-            "\n\nANALISIS DARI CHAT:"
-            "\nSelain face tracking, analisis juga konten chat untuk mendeteksi:"
-            "\n- Pola bahasa yang menunjukkan stres (kata-kata negatif berulang, kalimat pendek/putus-putus)"
-            "\n- Emosi tersembunyi (frustasi, kekhawatiran, ketakutan, kelelahan)"
-            "\n- Tingkat urgensi berdasarkan isi pesan"
-            "\n- Konsistensi antara kata-kata dan sinyal face tracking (jika ada)"
-            "\nGunakan analisis teks ini bersama dengan face tracking untuk penilaian yang lebih akurat."
-        )
+# Everything that does not depend on the request, built once at import. Keeping it byte-identical
+# across requests makes it a stable prefix for upstream prompt caching.
+_STATIC_SYSTEM_PROMPT = "\n".join(
+    [
+        "Kamu adalah konselor emosional yang SANGAT HANGAT, PENUH EMPATI, dan SABAR dalam mendengarkan curhatan.",
+        "",
+        "KEPRIBADIAN DAN PENDEKATAN:",
+        "- Gunakan nada bicara yang lembut, menenangkan, dan penuh kasih sayang seperti teman dekat atau kakak yang peduli",
+        "- Validasi perasaan user dengan tulus: 'Aku memahami perasaanmu...', 'Wajar sekali jika kamu merasa...'",
+        "- Dengarkan dengan hati, jangan terburu-buru memberi solusi - tunjukkan bahwa kamu benar-benar peduli",
+        "- Gunakan bahasa yang personal dan hangat: 'kamu', 'aku', bukan formal",
+        "- PRIORITASKAN menggali dan bertanya lebih dalam SEBELUM memberi saran panjang",
+        "- JANGAN gunakan emoji - gunakan kata-kata saja untuk menyampaikan kehangatan",
+        "",
+        "ATURAN PENTING:",
+        "- BUKAN diagnosis medis dan tidak menggantikan psikolog/psikiater/dokter",
+        "- Jika ada tanda BAHAYA SERIUS (pikiran menyakiti diri/bunuh diri, kekerasan, nyeri dada, sesak parah, panik ekstrem):",
+        "  → Segera sarankan hubungi 119 (darurat), hotline 119 ext 8 (kesehatan jiwa), atau psikolog/psikiater",
+        "  → Tetap tenangkan dengan empati sambil dorong cari bantuan profesional SEGERA",
+        "- Untuk kondisi sedang-berat (depresi berkepanjangan, cemas kronis, trauma): sarankan konseling profesional",
+        "- Untuk kondisi ringan: gali dulu, baru berikan saran praktis secara bertahap",
+        "",
+        "ANALISIS YANG AKURAT:",
+        "- Perhatikan detail dari kata-kata user: intensitas emosi, frekuensi masalah, dampak ke kehidupan sehari-hari",
+        "- Gabungkan informasi dari chat + face tracking (jika ada) untuk penilaian lebih akurat",
+        "- Jangan meremehkan atau melebih-lebihkan - berikan penilaian yang balance dan realistis",
+        "- Kenali pola: jika user menyebut 'sering', 'setiap hari', 'sudah lama', 'tidak bisa tidur', 'tidak nafsu makan' → tanda kondisi lebih serius",
+        "",
+        "STRUKTUR RESPONS - BERTAHAP & RINGKAS:",
+        "FASE AWAL (1-3 pesan pertama):",
+        "  1) VALIDASI singkat (1-2 kalimat yang menyentuh hati): Akui perasaan dengan dalam tapi ringkas",
+        "  2) EKSPLORASI (1-2 pertanyaan terbuka): Gali lebih dalam untuk memahami konteks, perasaan, atau situasi",
+        "  - Contoh: 'Sudah berapa lama kamu merasa seperti ini?'",
+        "  - Contoh: 'Apa yang paling membuatmu lelah dari situasi ini?'",
+        "  - JANGAN langsung kasih banyak saran - DENGARKAN dulu",
+        "",
+        "FASE TENGAH (setelah dapat gambaran lebih lengkap):",
+        "  1) VALIDASI lebih dalam (2-3 kalimat): Tunjukkan pemahaman berdasarkan yang sudah diceritakan",
+        "  2) PEMAHAMAN singkat (2-3 kalimat): Jelaskan apa yang mungkin terjadi",
+        "  3) EKSPLORASI lanjutan ATAU saran awal (1-2 poin saja): Jangan membanjiri dengan banyak saran sekaligus",
+        "",
+        "FASE AKHIR (setelah sudah menggali cukup):",
+        "  1) SARAN PRAKTIS (2-3 poin yang paling relevan): Fokus pada yang paling bisa membantu hari ini",
+        "  2) DUKUNGAN (1-2 kalimat): Tutup dengan harapan dan pengingat bahwa tidak sendirian",
+        "",
+        "PRINSIP KUNCI:",
+        "✅ PENDEK & MENYENTUH lebih baik dari panjang tapi membosankan",
+        "✅ GALI DULU dengan bertanya sebelum kasih saran",
+        "✅ BERTAHAP - jangan langsung kasih semua solusi sekaligus",
+        "✅ Format MUDAH DIBACA - paragraf pendek (2-3 baris), spasi yang cukup",
+        "✅ FOKUS pada 1-2 aspek per respons, tidak semua sekaligus",
+        "",
+        "ANALISIS REALTIME:",
+        "- SANGAT PENTING: WAJIB kirim analisis JSON di SETIAP respons tanpa kecuali!",
+        "- Analisis harus mencerminkan SELURUH percakapan dari awal sampai pesan terakhir",
+        "- Update topics: tambahkan topik baru yang muncul, gabungkan dengan topik sebelumnya",
+        "- Update summary: rangkum perkembangan dari awal percakapan sampai sekarang",
+        "- Update stress_level & sentiment: sesuaikan jika ada perubahan kondisi user",
+        "- Jika kondisi user membaik/memburuk, refleksikan dalam analisis",
+        "",
+        "CONTOH RESPONS BERTAHAP:",
+        "",
+        "Pesan User #1: 'Aku merasa lelah dan tidak bisa fokus bekerja.'",
+        "❌ SALAH (terlalu panjang langsung):",
+        "'Aku memahami perasaanmu. Kelelahan itu bisa disebabkan banyak hal. Coba lakukan teknik pernapasan, olahraga ringan, atur jadwal tidur, makan bergizi, break setiap jam, dll...' [TERLALU BANYAK INFO SEKALIGUS]",
+        "",
+        "✅ BENAR (pendek, gali dulu):",
+        "'Aku turut merasakan kelelahanmu. Pasti tidak nyaman sekali saat ingin produktif tapi tubuh dan pikiran tidak mendukung.",
+        "",
+        "Sudah berapa lama kamu merasa seperti ini? Dan apa yang paling mengganggumu saat mencoba fokus?'",
+        "",
+        "Pesan User #2: 'Sudah 2 minggu. Aku banyak overthinking tentang pekerjaan.'",
+        "✅ BENAR (validasi + sedikit pemahaman + 1 saran sederhana):",
+        "'Dua minggu itu cukup lama untuk merasa tertekan terus-menerus. Overthinking memang bisa sangat menguras energi mental dan membuat tubuh juga kelelahan.",
+        "",
+        "Sebelum kita cari cara mengatasinya, aku ingin tahu dulu: Apakah overthinking ini lebih parah di waktu tertentu, misalnya malam sebelum tidur atau pagi saat bangun?'",
+        "",
+        "FORMAT OUTPUT WAJIB - IKUTI PERSIS:",
+        "PENTING: Respons kamu HARUS mengikuti format ini:",
+        "",
+        "1) Tulis jawaban empati & hangat untuk user dalam Bahasa Indonesia",
+        f"2) Setelah jawaban, WAJIB tulis marker ini PERSIS: {ANALYSIS_MARKER.strip()}",
+        "3) Setelah marker, WAJIB tulis JSON analysis (tanpa markdown, tanpa backticks):",
+        "",
+        "Contoh format yang BENAR:",
+        "```",
+        "Aku memahami perasaanmu. Sudah berapa lama kamu merasa seperti ini?",
+        "",
+        "[[ANALYSIS_JSON]]",
+        '{"topics": ["stres", "perasaan"], "summary": "User merasa stres", "stress_level": "sedang", "chat_sentiment": "negatif", "early_actions": ["Validasi perasaan", "Eksplorasi lebih dalam"], "when_to_seek_help": ["Jika berlanjut > 2 minggu"], "disclaimer": "Konsultasi non-medis"}',
+        "```",
+        "",
+        "JSON Schema:",
+        '{"topics": ["string"], "summary": "string", "stress_level": "rendah/sedang/tinggi", "chat_sentiment": "positif/netral/negatif", "early_actions": ["string"], "when_to_seek_help": ["string"], "disclaimer": "string"}',
+        "",
+        "JANGAN lupa marker [[ANALYSIS_JSON]] dan JSON di setiap respons!",
+    ]
+)
 
-    return "\n".join(
-        [
-            "Kamu adalah konselor emosional yang SANGAT HANGAT, PENUH EMPATI, dan SABAR dalam mendengarkan curhatan.",
-            "",
-            "KEPRIBADIAN DAN PENDEKATAN:",
-            "- Gunakan nada bicara yang lembut, menenangkan, dan penuh kasih sayang seperti teman dekat atau kakak yang peduli",
-            "- Validasi perasaan user dengan tulus: 'Aku memahami perasaanmu...', 'Wajar sekali jika kamu merasa...'",
-            "- Dengarkan dengan hati, jangan terburu-buru memberi solusi - tunjukkan bahwa kamu benar-benar peduli",
-            "- Gunakan bahasa yang personal dan hangat: 'kamu', 'aku', bukan formal",
-            "- PRIORITASKAN menggali dan bertanya lebih dalam SEBELUM memberi saran panjang",
-            "- JANGAN gunakan emoji - gunakan kata-kata saja untuk menyampaikan kehangatan",
-            "",
-            "ATURAN PENTING:",
-            "- BUKAN diagnosis medis dan tidak menggantikan psikolog/psikiater/dokter",
-            "- Jika ada tanda BAHAYA SERIUS (pikiran menyakiti diri/bunuh diri, kekerasan, nyeri dada, sesak parah, panik ekstrem):",
-            "  → Segera sarankan hubungi 119 (darurat), hotline 119 ext 8 (kesehatan jiwa), atau psikolog/psikiater",
-            "  → Tetap tenangkan dengan empati sambil dorong cari bantuan profesional SEGERA",
-            "- Untuk kondisi sedang-berat (depresi berkepanjangan, cemas kronis, trauma): sarankan konseling profesional",
-            "- Untuk kondisi ringan: gali dulu, baru berikan saran praktis secara bertahap",
-            "",
-            "ANALISIS YANG AKURAT:",
-            "- Perhatikan detail dari kata-kata user: intensitas emosi, frekuensi masalah, dampak ke kehidupan sehari-hari",
-            "- Gabungkan informasi dari chat + face tracking (jika ada) untuk penilaian lebih akurat",
-            "- Jangan meremehkan atau melebih-lebihkan - berikan penilaian yang balance dan realistis",
-            "- Kenali pola: jika user menyebut 'sering', 'setiap hari', 'sudah lama', 'tidak bisa tidur', 'tidak nafsu makan' → tanda kondisi lebih serius",
-            "",
-            "STRUKTUR RESPONS - BERTAHAP & RINGKAS:",
-            "FASE AWAL (1-3 pesan pertama):",
-            "  1) VALIDASI singkat (1-2 kalimat yang menyentuh hati): Akui perasaan dengan dalam tapi ringkas",
-            "  2) EKSPLORASI (1-2 pertanyaan terbuka): Gali lebih dalam untuk memahami konteks, perasaan, atau situasi",
-            "  - Contoh: 'Sudah berapa lama kamu merasa seperti ini?'",
-            "  - Contoh: 'Apa yang paling membuatmu lelah dari situasi ini?'",
-            "  - JANGAN langsung kasih banyak saran - DENGARKAN dulu",
-            "",
-            "FASE TENGAH (setelah dapat gambaran lebih lengkap):",
-            "  1) VALIDASI lebih dalam (2-3 kalimat): Tunjukkan pemahaman berdasarkan yang sudah diceritakan",
-            "  2) PEMAHAMAN singkat (2-3 kalimat): Jelaskan apa yang mungkin terjadi",
-            "  3) EKSPLORASI lanjutan ATAU saran awal (1-2 poin saja): Jangan membanjiri dengan banyak saran sekaligus",
-            "",
-            "FASE AKHIR (setelah sudah menggali cukup):",
-            "  1) SARAN PRAKTIS (2-3 poin yang paling relevan): Fokus pada yang paling bisa membantu hari ini",
-            "  2) DUKUNGAN (1-2 kalimat): Tutup dengan harapan dan pengingat bahwa tidak sendirian",
-            "",
-            "PRINSIP KUNCI:",
-            "✅ PENDEK & MENYENTUH lebih baik dari panjang tapi membosankan",
-            "✅ GALI DULU dengan bertanya sebelum kasih saran",
-            "✅ BERTAHAP - jangan langsung kasih semua solusi sekaligus",
-            "✅ Format MUDAH DIBACA - paragraf pendek (2-3 baris), spasi yang cukup",
-            "✅ FOKUS pada 1-2 aspek per respons, tidak semua sekaligus",
-            "",
-            "ANALISIS REALTIME:",
-            "- SANGAT PENTING: WAJIB kirim analisis JSON di SETIAP respons tanpa kecuali!",
-            "- Analisis harus mencerminkan SELURUH percakapan dari awal sampai pesan terakhir",
-            "- Update topics: tambahkan topik baru yang muncul, gabungkan dengan topik sebelumnya",
-            "- Update summary: rangkum perkembangan dari awal percakapan sampai sekarang",
-            "- Update stress_level & sentiment: sesuaikan jika ada perubahan kondisi user",
-            "- Jika kondisi user membaik/memburuk, refleksikan dalam analisis",
-            "",
-            "CONTOH RESPONS BERTAHAP:",
-            "",
-            "Pesan User #1: 'Aku merasa lelah dan tidak bisa fokus bekerja.'",
-            "❌ SALAH (terlalu panjang langsung):",
-            "'Aku memahami perasaanmu. Kelelahan itu bisa disebabkan banyak hal. Coba lakukan teknik pernapasan, olahraga ringan, atur jadwal tidur, makan bergizi, break setiap jam, dll...' [TERLALU BANYAK INFO SEKALIGUS]",
-            "",
-            "✅ BENAR (pendek, gali dulu):",
-            "'Aku turut merasakan kelelahanmu. Pasti tidak nyaman sekali saat ingin produktif tapi tubuh dan pikiran tidak mendukung.",
-            "",
-            "Sudah berapa lama kamu merasa seperti ini? Dan apa yang paling mengganggumu saat mencoba fokus?'",
-            "",
-            "Pesan User #2: 'Sudah 2 minggu. Aku banyak overthinking tentang pekerjaan.'",
-            "✅ BENAR (validasi + sedikit pemahaman + 1 saran sederhana):",
-            "'Dua minggu itu cukup lama untuk merasa tertekan terus-menerus. Overthinking memang bisa sangat menguras energi mental dan membuat tubuh juga kelelahan.",
-            "",
-            "Sebelum kita cari cara mengatasinya, aku ingin tahu dulu: Apakah overthinking ini lebih parah di waktu tertentu, misalnya malam sebelum tidur atau pagi saat bangun?'",
-            "",
-            "FORMAT OUTPUT WAJIB - IKUTI PERSIS:",
-            "PENTING: Respons kamu HARUS mengikuti format ini:",
-            "",
-            "1) Tulis jawaban empati & hangat untuk user dalam Bahasa Indonesia",
-            f"2) Setelah jawaban, WAJIB tulis marker ini PERSIS: {ANALYSIS_MARKER.strip()}",
-            "3) Setelah marker, WAJIB tulis JSON analysis (tanpa markdown, tanpa backticks):",
-            "",
-            "Contoh format yang BENAR:",
-            "```",
-            "Aku memahami perasaanmu. Sudah berapa lama kamu merasa seperti ini?",
-            "",
-            "[[ANALYSIS_JSON]]",
-            '{"topics": ["stres", "perasaan"], "summary": "User merasa stres", "stress_level": "sedang", "chat_sentiment": "negatif", "early_actions": ["Validasi perasaan", "Eksplorasi lebih dalam"], "when_to_seek_help": ["Jika berlanjut > 2 minggu"], "disclaimer": "Konsultasi non-medis"}',
-            "```",
-            "",
-            "JSON Schema:",
-            '{"topics": ["string"], "summary": "string", "stress_level": "rendah/sedang/tinggi", "chat_sentiment": "positif/netral/negatif", "early_actions": ["string"], "when_to_seek_help": ["string"], "disclaimer": "string"}',
-            "",
-            "JANGAN lupa marker [[ANALYSIS_JSON]] dan JSON di setiap respons!",
-            face_context,
-            chat_sentiment_context,
-        ]
-    ).strip()
+_CHAT_SENTIMENT_CONTEXT = (
+    "ANALISIS DARI CHAT:"
+    "\nSelain face tracking, analisis juga konten chat untuk mendeteksi:"
+    "\n- Pola bahasa yang menunjukkan stres (kata-kata negatif berulang, kalimat pendek/putus-putus)"
+    "\n- Emosi tersembunyi (frustasi, kekhawatiran, ketakutan, kelelahan)"
+    "\n- Tingkat urgensi berdasarkan isi pesan"
+    "\n- Konsistensi antara kata-kata dan sinyal face tracking (jika ada)"
+    "\nGunakan analisis teks ini bersama dengan face tracking untuk penilaian yang lebih akurat."
+)
 
+_SYSTEM_PROMPT_WITH_CHAT = f"{_STATIC_SYSTEM_PROMPT}\n\n{_CHAT_SENTIMENT_CONTEXT}"
 
-def _client() -> Any:
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise RuntimeError("Missing OPENAI_API_KEY")
+_FACE_CONTEXT_TEMPLATE = (
+    "KONTEKS FACE TRACKING (indikatif, bukan diagnosis):\n"
+    "- stressIndex: {stressIndex} (0-100)\n"
+    "- level: {level}\n"
+    "- blinkPerMin: {blinkPerMin}\n"
+    "- jawOpenness: {jawOpenness}\n"
+    "- browTension: {browTension}\n"
+    "Gunakan konteks ini hanya sebagai sinyal tambahan, jangan menyimpulkan kondisi medis."
+)
+
+_REMINDER = (
+    f"REMINDER: Your response MUST end with:\n"
+    f"{ANALYSIS_MARKER.strip()}\n"
+    '{"topics": [...], "summary": "...", "stress_level": "rendah/sedang/tinggi", '
+    '"chat_sentiment": "positif/netral/negatif", "early_actions": [...], '
+    '"when_to_seek_help": [...], "disclaimer": "..."}\n'
+    "DO NOT forget the marker and JSON!"
+)
+
+
+def _na(x: object) -> object:
+    return "n/a" if x is None else x
+
+
+def _render_face_context(face: Optional[FaceSignals]) -> str:
+    if not face or not face.enabled:
+        return ""
+    return _FACE_CONTEXT_TEMPLATE.format(
+        stressIndex=_na(face.stressIndex),
+        level=face.level or "n/a",
+        blinkPerMin=_na(face.blinkPerMin),
+        jawOpenness=_na(face.jawOpenness),
+        browTension=_na(face.browTension),
+    )
+
+
+def _system_prefix(has_history: bool) -> str:
+    return _SYSTEM_PROMPT_WITH_CHAT if has_history else _STATIC_SYSTEM_PROMPT
+
+
+# Process-wide client (and thus one HTTP connection pool) shared by all chat requests.
+_shared_client: Any = None
+
+
+def _env_float(name: str, default: float) -> float:
+    raw = os.getenv(name)
+    return float(raw) if raw else default
+
+
+def _new_client(api_key: str) -> Any:
     try:
+        import httpx  # type: ignore
         from openai import AsyncOpenAI  # type: ignore
     except Exception as e:  # pragma: no cover
         raise RuntimeError(
             "Python package 'openai' belum terpasang di environment ini. Jalankan: pip install -r requirements.txt"
         ) from e
 
-    return AsyncOpenAI(api_key=api_key)
+    http_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=int(os.getenv("OPENAI_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.getenv("OPENAI_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=_env_float("OPENAI_KEEPALIVE_EXPIRY", 60.0),
+        ),
+        timeout=httpx.Timeout(_env_float("OPENAI_TIMEOUT", 120.0), connect=_env_float("OPENAI_CONNECT_TIMEOUT", 10.0)),
+    )
+    # base_url falls back to OPENAI_BASE_URL inside the SDK (e.g. a local OpenAI-compatible server).
+    return AsyncOpenAI(
+        api_key=api_key,
+        http_client=http_client,
+        max_retries=int(os.getenv("OPENAI_MAX_RETRIES", "2")),
+    )
+
+
+def init_client() -> Any:
+    """Create the shared client if needed; returns None when OPENAI_API_KEY is not configured."""
+    global _shared_client
+    if _shared_client is None:
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            return None
+        _shared_client = _new_client(api_key)
+    return _shared_client
+
+
+async def close_client() -> None:
+    global _shared_client
+    client, _shared_client = _shared_client, None
+    if client is not None:
+        await client.close()
+
+
+def _client() -> Any:
+    client = init_client()
+    if client is None:
+        raise RuntimeError("Missing OPENAI_API_KEY")
+    return client
 
 
 def _to_openai_messages(messages: list[ChatMessage], face: Optional[FaceSignals]):
-    sys = _build_system_prompt(face, messages)
-    out = [{"role": "system", "content": sys}]
+    # Static system prompt first and the per-request face block last, so the system prompt and
+    # the whole chat history form a prefix that stays identical from one turn to the next.
+    out = [{"role": "system", "content": _system_prefix(bool(messages))}]
 
     for m in messages:
         if m.role == "assistant":
@@ -162,34 +236,46 @@ def _to_openai_messages(messages: list[ChatMessage], face: Optional[FaceSignals]
             out.append({"role": "user", "content": m.content})
 
     # Add reinforcement message to ensure JSON output
-    out.append({
-        "role": "system",
-        "content": (
-            f"REMINDER: Your response MUST end with:\n"
-            f"{ANALYSIS_MARKER.strip()}\n"
-            '{"topics": [...], "summary": "...", "stress_level": "rendah/sedang/tinggi", '
-            '"chat_sentiment": "positif/netral/negatif", "early_actions": [...], '
-            '"when_to_seek_help": [...], "disclaimer": "..."}\n'
-            "DO NOT forget the marker and JSON!"
-        )
-    })
+    face_context = _render_face_context(face)
+    out.append({"role": "system", "content": f"{face_context}\n\n{_REMINDER}" if face_context else _REMINDER})
 
     return out
 
 
-async def stream_chat(messages: list[ChatMessage], face: Optional[FaceSignals]) -> AsyncIterator[str]:
-    model = os.getenv("OPENAI_MODEL", "gpt-4o-mini")
-
-    client = _client()
-    stream = await client.chat.completions.create(
-        model=model,
-        messages=_to_openai_messages(messages, face),
-        temperature=0.7,  # Increased for better instruction following
-        stream=True,
-    )
+class OpenAIProvider(ChatProvider):
+    name = "openai"
+
+    def model(self) -> str:
+        return os.getenv("OPENAI_MODEL", "gpt-4o-mini")
+
+    async def stream(self, messages: list[dict[str, str]]) -> AsyncIterator[str]:
+        client = _client()
+        stream = await client.chat.completions.create(
+            model=self.model(),
+            messages=messages,
+            temperature=0.7,  # Increased for better instruction following
+            stream=True,
+        )
+
+        try:
+            async for event in stream:
+                delta = event.choices[0].delta
+                token = getattr(delta, "content", None)
+                if token:
+                    yield token
+        finally:
+            # Also runs when the consumer stops early; closes the HTTP response so the model stops
+            # generating (and billing) and the pooled connection is not left half-read.
+            await stream.close()
 
-    async for event in stream:
-        delta = event.choices[0].delta
-        token = getattr(delta, "content", None)
-        if token:
+
+def chat_model() -> str:
+    """Provider-qualified model name (part of the response cache key)."""
+    provider = get_provider()
+    return f"{provider.name}:{provider.model()}"
+
+
+async def stream_chat(messages: list[ChatMessage], face: Optional[FaceSignals]) -> AsyncIterator[str]:
+    async with aclosing(get_provider().stream(_to_openai_messages(messages, face))) as tokens:
+        async for token in tokens:
             yield token
@@ -0,0 +1,123 @@
+"""Server-sent event framing and write coalescing for the chat stream."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+from typing import Any, AsyncIterator, Optional
+
+# Events that may wait for the next flush; anything else (ping, analysis, done, error) is
+# written out immediately together with whatever is pending before it.
+BATCHED_EVENTS = frozenset({"token", "analysis_partial"})
+
+
+def sse_event(event: str, data: Any) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8")
+
+
+def flush_policy() -> tuple[float, int]:
+    """``(max_delay_seconds, max_bytes)`` from SSE_FLUSH_MS / SSE_FLUSH_BYTES; 0 ms disables batching."""
+    return max(0.0, float(os.getenv("SSE_FLUSH_MS", "25"))) / 1000.0, max(1, int(os.getenv("SSE_FLUSH_BYTES", "4096")))
+
+
+class _Batch:
+    """Pending output: consecutive token deltas are merged into one ``token`` event."""
+
+    def __init__(self) -> None:
+        self.frames: list[bytes] = []
+        self.tokens: list[str] = []
+        self.size = 0
+
+    def __bool__(self) -> bool:
+        return bool(self.frames or self.tokens)
+
+    def add(self, event: str, data: Any) -> None:
+        if event == "token":
+            text = data["token"]
+            self.tokens.append(text)
+            self.size += len(text)
+            return
+        self._close_tokens()
+        frame = sse_event(event, data)
+        self.frames.append(frame)
+        self.size += len(frame)
+
+    def _close_tokens(self) -> None:
+        if self.tokens:
+            self.frames.append(sse_event("token", {"token": "".join(self.tokens)}))
+            self.tokens.clear()
+
+    def take(self) -> bytes:
+        self._close_tokens()
+        out = b"".join(self.frames)
+        self.frames.clear()
+        self.size = 0
+        return out
+
+
+async def coalesce(
+    events: AsyncIterator[tuple[str, Any]], max_delay: float, max_bytes: int
+) -> AsyncIterator[bytes]:
+    """Turn ``(event, data)`` pairs into SSE bytes, one write per flush.
+
+    Nagle-style: a batched event is written at once if the previous write is at least
+    ``max_delay`` seconds old (so the first token and sparse tokens are not delayed); otherwise it
+    waits until ``max_delay`` after that write or until ``max_bytes`` are pending. The deadline is
+    enforced with a timeout on the pending upstream read, so a stalled model does not hold back
+    text already received.
+    """
+    if max_delay <= 0:
+        async for event, data in events:
+            yield sse_event(event, data)
+        return
+
+    loop = asyncio.get_running_loop()
+    batch = _Batch()
+    deadline: Optional[float] = None
+    last_flush = float("-inf")
+    pending: Optional[asyncio.Future[tuple[str, Any]]] = None
+    it = events.__aiter__()
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(it.__anext__())
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            done, _ = await asyncio.wait((pending,), timeout=timeout)
+            if not done:
+                deadline = None
+                last_flush = loop.time()
+                yield batch.take()
+                continue
+
+            fut, pending = pending, None
+            try:
+                event, data = fut.result()
+            except StopAsyncIteration:
+                break
+            batch.add(event, data)
+            if event not in BATCHED_EVENTS:
+                # Control events (ping, analysis, done) go out at once and do not start a hold.
+                deadline = None
+                yield batch.take()
+                continue
+            now = loop.time()
+            if batch.size >= max_bytes or now - last_flush >= max_delay:
+                deadline = None
+                last_flush = now
+                yield batch.take()
+            elif deadline is None:
+                deadline = last_flush + max_delay
+
+        if batch:
+            yield batch.take()
+    finally:
+        if pending is not None and not pending.done():
+            # The read is still running inside ``events`` (e.g. the client disconnected while we
+            # waited on the model). Cancelling it unwinds the generator and its upstream in that
+            # task; closing the generator from here would fail because it is still executing.
+            pending.cancel()
+        else:
+            aclose = getattr(it, "aclose", None)
+            if aclose is not None:
+                await aclose()
@@ -0,0 +1,104 @@
+"""Incremental split of a streamed chat reply into visible text and the trailing analysis payload."""
+
+from __future__ import annotations
+
+from .openai_llm import ANALYSIS_MARKER
+
+
+def _failure(pattern: str) -> list[int]:
+    """KMP failure table: ``f[i]`` is the longest proper border of ``pattern[: i + 1]``."""
+    f = [0] * len(pattern)
+    k = 0
+    for i in range(1, len(pattern)):
+        while k and pattern[i] != pattern[k]:
+            k = f[k - 1]
+        if pattern[i] == pattern[k]:
+            k += 1
+        f[i] = k
+    return f
+
+
+class AnalysisSplitter:
+    """Feeds tokens through a KMP matcher for ``marker`` and splits the stream at its first match.
+
+    Only the partially matched marker prefix is held back between tokens, and since that suffix
+    of the stream is by definition ``marker[:matched]`` it is never buffered separately. Every
+    character is examined once (tokens without a marker start character skip the scan via
+    ``str.find``), so a whole reply costs O(total length); parts are kept as chunk lists and
+    joined only on demand.
+    """
+
+    def __init__(self, marker: str = ANALYSIS_MARKER) -> None:
+        if not marker:
+            raise ValueError("marker must not be empty")
+        self.marker = marker
+        self._fail = _failure(marker)
+        self._matched = 0
+        self.found = False
+        self._visible: list[str] = []
+        self._analysis: list[str] = []
+
+    def feed(self, token: str) -> tuple[str, str]:
+        """Consume one token; returns ``(visible, analysis)`` text that is now safe to emit."""
+        if self.found:
+            if token:
+                self._analysis.append(token)
+            return "", token
+
+        m, fail = self.marker, self._fail
+        first = m[0]
+        pending = self._matched
+        q = pending
+        i, n = 0, len(token)
+        while i < n:
+            if q == 0:
+                i = token.find(first, i)
+                if i < 0:
+                    break
+            c = token[i]
+            while q and m[q] != c:
+                q = fail[q - 1]
+            if m[q] == c:
+                q += 1
+            i += 1
+            if q == len(m):
+                head = m[:pending] + token[:i]
+                visible = head[: len(head) - len(m)]
+                analysis = token[i:]
+                self.found = True
+                self._matched = 0
+                if visible:
+                    self._visible.append(visible)
+                if analysis:
+                    self._analysis.append(analysis)
+                return visible, analysis
+
+        self._matched = q
+        text = m[:pending] + token if pending else token
+        visible = text[: len(text) - q] if q else text
+        if visible:
+            self._visible.append(visible)
+        return visible, ""
+
+    def finish(self) -> str:
+        """End of stream: release a held-back partial marker as visible text."""
+        rest = self.marker[: self._matched]
+        self._matched = 0
+        if rest:
+            self._visible.append(rest)
+        return rest
+
+    @property
+    def visible(self) -> str:
+        return "".join(self._visible)
+
+    @property
+    def analysis(self) -> str:
+        return "".join(self._analysis)
+
+    @property
+    def text(self) -> str:
+        """The full reply as received (visible text, marker and analysis)."""
+        if not self.found:
+            return self.visible + self.marker[: self._matched]
+        return self.visible + self.marker + self.analysis
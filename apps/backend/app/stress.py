@@ -1,6 +1,20 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from typing import Any, Optional
+
+from .stress_profile import StressProfile, store_from_env
+
+
+# Stress levels in ascending order; compact encodings use index + 1 and reserve 0 for "no level".
+LEVELS = ("rendah", "sedang", "tinggi")
+
+# Thresholds, bands and weights come from the active profile (STRESS_PROFILE, else the built-in one).
+profiles = store_from_env(len(LEVELS))
+
+
+def active_profile() -> StressProfile:
+    return profiles.current()
 
 
 @dataclass
@@ -10,73 +24,25 @@ class StressSignals:
     brow_tension: float | None = None
 
 
-def _clamp(x: float, lo: float, hi: float) -> float:
-    return max(lo, min(hi, x))
-
-
-def compute_stress_index(signals: StressSignals) -> tuple[float | None, str | None]:
+def compute_stress_index(
+    signals: StressSignals, profile: Optional[StressProfile] = None
+) -> tuple[float | None, str | None]:
     """Improved heuristic (non-medical). Returns (stressIndex 0-100, level)."""
-    parts: list[float] = []
-    weights: list[float] = []
-
-    if signals.blink_per_min is not None:
-        # Improved blink analysis: research shows relaxed = 12-20 bpm, stress = <8 or >30
-        bpm = signals.blink_per_min
-        if bpm < 6:
-            # Very low (fatigue/disengagement)
-            blink_score = _clamp((6 - bpm) / 6, 0, 1) * 0.9
-        elif bpm < 10:
-            # Low-normal
-            blink_score = _clamp((10 - bpm) / 4, 0, 1) * 0.4
-        elif bpm <= 22:
-            # Optimal range
-            blink_score = 0.0
-        elif bpm <= 30:
-            # Elevated (mild stress)
-            blink_score = _clamp((bpm - 22) / 8, 0, 1) * 0.5
-        else:
-            # High (significant stress)
-            blink_score = _clamp(0.5 + (bpm - 30) / 25, 0, 1)
-        parts.append(blink_score)
-        weights.append(1.2)  # Higher weight for blink rate
-
-    if signals.jaw_openness is not None:
-        # Jaw tension: moderate openness can indicate stress/talking; extreme = yawning/fatigue
-        jaw = signals.jaw_openness
-        if jaw < 0.15:
-            # Clenched/tense
-            jaw_score = 0.3
-        elif jaw < 0.35:
-            # Relaxed range
-            jaw_score = 0.0
-        elif jaw < 0.6:
-            # Moderate tension/talking
-            jaw_score = _clamp((jaw - 0.35) / 0.25, 0, 1) * 0.5
-        else:
-            # Wide open (yawning/fatigue)
-            jaw_score = _clamp((jaw - 0.6) / 0.4, 0, 1) * 0.4
-        parts.append(jaw_score)
-        weights.append(0.8)
-
-    if signals.brow_tension is not None:
-        # Brow tension is a strong stress indicator
-        brow = _clamp(signals.brow_tension, 0, 1)
-        parts.append(brow)
-        weights.append(1.5)  # Highest weight - most reliable
+    profile = profile or active_profile()
+    stress_index, code = profile.score((signals.blink_per_min, signals.jaw_openness, signals.brow_tension))
+    return stress_index, LEVELS[code - 1] if code else None
 
-    if not parts:
-        return None, None
 
-    # Weighted average for better accuracy
-    score01 = sum(p * w for p, w in zip(parts, weights)) / sum(weights)
-    stress_index = _clamp(score01 * 100.0, 0, 100)
+def compute_stress_index_batch(
+    blink_per_min: Any, jaw_openness: Any, brow_tension: Any, profile: Optional[StressProfile] = None
+) -> tuple[Any, Any]:
+    """Vectorized :func:`compute_stress_index` over equal-length arrays (NaN = missing signal).
 
-    # Adjusted thresholds based on weighted scoring
-    if stress_index < 30:
-        level = "rendah"
-    elif stress_index < 60:
-        level = "sedang"
-    else:
-        level = "tinggi"
+    Returns ``(stress_index, level_code)``: float64 with NaN where no signal is present, and
+    uint8 codes (0 = none, else ``LEVELS`` index + 1). Every float operation is done in the same
+    order as the scalar path, so results are bit-identical to it.
+    """
+    import numpy as np
 
-    return stress_index, level
+    columns = tuple(np.asarray(c, dtype=np.float64) for c in (blink_per_min, jaw_openness, brow_tension))
+    return (profile or active_profile()).score_batch(np, np.broadcast_arrays(*columns))
@@ -0,0 +1,307 @@
+"""Stress scoring profiles: JSON band definitions compiled into lookup tables, hot-reloaded by mtime.
+
+A profile maps each signal through piecewise bands and combines the band scores with weights::
+
+    {
+      "version": "kantor-2",
+      "signals": {
+        "blinkPerMin": {"weight": 1.2, "bands": [
+          {"below": 6, "x0": 6, "sign": -1, "span": 6, "scale": 0.9},
+          {"upTo": 22, "value": 0.0},
+          {"offset": 0.5, "x0": 30, "span": 25}
+        ]},
+        ...
+      },
+      "levels": [30, 60]
+    }
+
+Bands are tried in order: ``below`` is an exclusive upper bound, ``upTo`` an inclusive one, and
+the last band takes everything else. A band scores ``value`` if given, otherwise
+``clamp(offset + sign * (x - x0) / span, 0, 1) * scale``. ``levels`` are the stress-index
+cutoffs between consecutive LEVELS. Signals left out of a profile do not contribute.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from pathlib import Path
+from typing import Any, Optional
+
+# Scoring order; the weighted sum accumulates in this order.
+SIGNALS = ("blinkPerMin", "jawOpenness", "browTension")
+
+# The original built-in heuristic, expressed as a profile.
+DEFAULT_PROFILE: dict[str, Any] = {
+    "version": "builtin-1",
+    "signals": {
+        "blinkPerMin": {
+            # Relaxed = 12-20 bpm; very low = fatigue, high = stress.
+            "weight": 1.2,
+            "bands": [
+                {"below": 6, "x0": 6, "sign": -1, "span": 6, "scale": 0.9},
+                {"below": 10, "x0": 10, "sign": -1, "span": 4, "scale": 0.4},
+                {"upTo": 22, "value": 0.0},
+                {"upTo": 30, "x0": 22, "span": 8, "scale": 0.5},
+                {"offset": 0.5, "x0": 30, "span": 25},
+            ],
+        },
+        "jawOpenness": {
+            # Clenched / relaxed / talking / yawning.
+            "weight": 0.8,
+            "bands": [
+                {"below": 0.15, "value": 0.3},
+                {"below": 0.35, "value": 0.0},
+                {"below": 0.6, "x0": 0.35, "span": 0.25, "scale": 0.5},
+                {"x0": 0.6, "span": 0.4, "scale": 0.4},
+            ],
+        },
+        "browTension": {
+            "weight": 1.5,
+            "bands": [{"x0": 0, "span": 1}],
+        },
+    },
+    "levels": [30, 60],
+}
+
+
+class ProfileError(ValueError):
+    pass
+
+
+# Profile tag (crc32 of the version string, as stored in binary records) -> version.
+_KNOWN_TAGS: dict[int, str] = {}
+
+
+def profile_tag(version: str) -> int:
+    return zlib.crc32(version.encode("utf-8")) or 1  # 0 is reserved for "untagged"
+
+
+def version_for_tag(tag: int) -> Optional[str]:
+    if not tag:
+        return None
+    return _KNOWN_TAGS.get(tag, f"#{tag:08x}")
+
+
+def _num(band: dict[str, Any], key: str, default: float) -> float:
+    value = band.get(key, default)
+    if not isinstance(value, (int, float)) or isinstance(value, bool) or not math.isfinite(value):
+        raise ProfileError(f"band field '{key}' must be a finite number")
+    return float(value)
+
+
+class SignalTable:
+    """One signal's bands as parallel tuples; band ``i`` covers ``edges[i-1] <= x < edges[i]``.
+
+    Inclusive ``upTo`` bounds are stored as the next float up, so a single ``bisect_right`` (or
+    ``searchsorted``) finds the band for both bound kinds.
+    """
+
+    def __init__(self, name: str, spec: dict[str, Any]) -> None:
+        bands = spec.get("bands")
+        if not isinstance(bands, list) or not bands:
+            raise ProfileError(f"{name}: 'bands' must be a non-empty list")
+        self.name = name
+        self.weight = _num(spec, "weight", 1.0)
+        if self.weight <= 0:
+            raise ProfileError(f"{name}: weight must be positive")
+
+        edges: list[float] = []
+        constant: list[bool] = []
+        offset: list[float] = []
+        sign: list[float] = []
+        x0: list[float] = []
+        span: list[float] = []
+        scale: list[float] = []
+        for i, band in enumerate(bands):
+            if not isinstance(band, dict):
+                raise ProfileError(f"{name}: band {i} must be an object")
+            last = i == len(bands) - 1
+            if "below" in band and "upTo" in band:
+                raise ProfileError(f"{name}: band {i} has both 'below' and 'upTo'")
+            if last:
+                if "below" in band or "upTo" in band:
+                    raise ProfileError(f"{name}: the last band must be open-ended")
+            elif "below" in band:
+                edges.append(_num(band, "below", 0.0))
+            elif "upTo" in band:
+                edges.append(math.nextafter(_num(band, "upTo", 0.0), math.inf))
+            else:
+                raise ProfileError(f"{name}: band {i} needs 'below' or 'upTo'")
+            if len(edges) > 1 and edges[-1] <= edges[-2]:
+                raise ProfileError(f"{name}: band bounds must increase")
+
+            is_const = "value" in band
+            constant.append(is_const)
+            offset.append(_num(band, "value", 0.0) if is_const else _num(band, "offset", 0.0))
+            s = _num(band, "sign", 1.0)
+            if s not in (1.0, -1.0):
+                raise ProfileError(f"{name}: band {i} sign must be 1 or -1")
+            sign.append(s)
+            x0.append(_num(band, "x0", 0.0))
+            sp = _num(band, "span", 1.0)
+            if sp == 0:
+                raise ProfileError(f"{name}: band {i} span must not be 0")
+            span.append(sp)
+            scale.append(_num(band, "scale", 1.0))
+
+        self.edges = tuple(edges)
+        self.constant = tuple(constant)
+        self.offset = tuple(offset)
+        self.sign = tuple(sign)
+        self.x0 = tuple(x0)
+        self.span = tuple(span)
+        self.scale = tuple(scale)
+        self._arrays: Optional[tuple[Any, ...]] = None
+
+    def score(self, x: float) -> float:
+        i = bisect_right(self.edges, x)
+        if self.constant[i]:
+            return self.offset[i]
+        v = self.offset[i] + self.sign[i] * (x - self.x0[i]) / self.span[i]
+        return max(0.0, min(1.0, v)) * self.scale[i]
+
+    def score_batch(self, np: Any, x: Any) -> Any:
+        if self._arrays is None:
+            self._arrays = tuple(
+                np.asarray(a, dtype=dt)
+                for a, dt in (
+                    (self.edges, np.float64),
+                    (self.constant, bool),
+                    (self.offset, np.float64),
+                    (self.sign, np.float64),
+                    (self.x0, np.float64),
+                    (self.span, np.float64),
+                    (self.scale, np.float64),
+                )
+            )
+        edges, constant, offset, sign, x0, span, scale = self._arrays
+        i = np.searchsorted(edges, x, side="right")
+        linear = np.maximum(0.0, np.minimum(1.0, offset[i] + sign[i] * (x - x0[i]) / span[i])) * scale[i]
+        return np.where(constant[i], offset[i], linear)
+
+
+class StressProfile:
+    def __init__(self, spec: dict[str, Any], level_count: int, source: str = "builtin") -> None:
+        if not isinstance(spec, dict):
+            raise ProfileError("profile must be a JSON object")
+        version = spec.get("version")
+        if not isinstance(version, str) or not version:
+            raise ProfileError("profile needs a non-empty 'version' string")
+        signals = spec.get("signals")
+        if not isinstance(signals, dict) or not signals:
+            raise ProfileError("profile needs a 'signals' object")
+        unknown = set(signals) - set(SIGNALS)
+        if unknown:
+            raise ProfileError(f"unknown signals: {', '.join(sorted(unknown))}")
+        cutoffs = spec.get("levels")
+        if not isinstance(cutoffs, list) or len(cutoffs) != level_count - 1:
+            raise ProfileError(f"'levels' must list {level_count - 1} cutoffs")
+        self.cutoffs = tuple(_num({"c": c}, "c", 0.0) for c in cutoffs)
+        if any(b <= a for a, b in zip(self.cutoffs, self.cutoffs[1:])):
+            raise ProfileError("'levels' cutoffs must increase")
+
+        self.version = version
+        self.tag = profile_tag(version)
+        self.source = source
+        self.spec = spec
+        self.tables = tuple(SignalTable(name, signals[name]) if name in signals else None for name in SIGNALS)
+        _KNOWN_TAGS[self.tag] = version
+
+    def score(self, values: tuple[Optional[float], ...]) -> tuple[Optional[float], int]:
+        """``values`` in SIGNALS order (None = missing) -> (stress index 0-100, level code 0..n)."""
+        num = 0.0
+        den = 0.0
+        for table, x in zip(self.tables, values):
+            if table is None or x is None:
+                continue
+            num += table.score(x) * table.weight
+            den += table.weight
+        if den == 0.0:
+            return None, 0
+        stress_index = max(0.0, min(100.0, num / den * 100.0))
+        return stress_index, bisect_right(self.cutoffs, stress_index) + 1
+
+    def score_batch(self, np: Any, columns: tuple[Any, ...]) -> tuple[Any, Any]:
+        """Vectorized :meth:`score` over float64 columns (NaN = missing); same float ops, same order."""
+        shape = np.broadcast(*columns).shape
+        num = np.zeros(shape, dtype=np.float64)
+        den = np.zeros(shape, dtype=np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            for table, x in zip(self.tables, columns):
+                if table is None:
+                    continue
+                present = ~np.isnan(x)
+                num = num + np.where(present, table.score_batch(np, x) * table.weight, 0.0)
+                den = den + np.where(present, table.weight, 0.0)
+            stress_index = np.where(den > 0, np.maximum(0.0, np.minimum(100.0, num / den * 100.0)), np.nan)
+        codes = np.searchsorted(np.asarray(self.cutoffs, dtype=np.float64), stress_index, side="right") + 1
+        codes = np.where(np.isnan(stress_index), 0, codes).astype(np.uint8)
+        return stress_index, codes
+
+    def describe(self) -> dict[str, Any]:
+        return {"version": self.version, "tag": self.tag, "source": self.source, "profile": self.spec}
+
+
+class ProfileStore:
+    """Holds the active profile; a file profile is re-read when its mtime changes.
+
+    The mtime is checked at most every ``check_interval`` seconds from the scoring path, so an
+    edited file takes effect in running trackers (worker processes included) without a restart.
+    A file that fails to load leaves the previous profile active and is reported in ``describe``.
+    """
+
+    def __init__(self, path: Optional[Path], level_count: int, check_interval: float = 1.0) -> None:
+        self.path = path
+        self.level_count = level_count
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._profile = StressProfile(DEFAULT_PROFILE, level_count)
+        self._mtime: Optional[float] = None
+        self._next_check = 0.0
+        self.loaded_at = time.time()
+        self.last_error: Optional[str] = None
+        if path is not None:
+            self.reload()
+
+    def current(self) -> StressProfile:
+        if self.path is not None and time.monotonic() >= self._next_check:
+            self.reload(force=False)
+        return self._profile
+
+    def reload(self, force: bool = True) -> StressProfile:
+        with self._lock:
+            self._next_check = time.monotonic() + self.check_interval
+            if self.path is None:
+                return self._profile
+            try:
+                mtime = self.path.stat().st_mtime
+                if not force and mtime == self._mtime:
+                    return self._profile
+                self._mtime = mtime
+                with open(self.path, "r", encoding="utf-8") as f:
+                    spec = json.load(f)
+                self._profile = StressProfile(spec, self.level_count, source=str(self.path))
+                self.loaded_at = time.time()
+                self.last_error = None
+            except (OSError, ValueError) as e:
+                self.last_error = f"{type(e).__name__}: {e}"
+                print(f"[WARN] stress profile not loaded ({self.path}): {self.last_error}")
+            return self._profile
+
+    def describe(self) -> dict[str, Any]:
+        return {**self._profile.describe(), "loadedAt": self.loaded_at, "lastError": self.last_error}
+
+
+def store_from_env(level_count: int) -> ProfileStore:
+    raw = os.getenv("STRESS_PROFILE")
+    return ProfileStore(
+        Path(raw) if raw else None,
+        level_count,
+        check_interval=float(os.getenv("STRESS_PROFILE_CHECK_SECONDS", "1")),
+    )
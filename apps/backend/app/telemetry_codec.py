@@ -0,0 +1,109 @@
+"""Wire encodings for FaceTelemetry, computed once per sample and shared by every subscriber."""
+
+from __future__ import annotations
+
+import json
+import math
+import struct
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Optional
+
+from .stress import LEVELS
+from .stress_profile import profile_tag, version_for_tag
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .face_tracker import FaceTelemetry
+
+
+# Binary layout (little-endian, 36 bytes, then optional UTF-8 error text):
+#   u8 version, u8 flags, u8 level (0 = none, 1.. = LEVELS index + 1), pad,
+#   f64 ts, f32 blinkPerMin, f32 blinkPer10s, f32 jawOpenness, f32 browTension, f32 stressIndex,
+#   u32 profile (crc32 of the stress profile version, 0 = untagged)
+# Missing values are NaN.
+BINARY_VERSION = 2
+BINARY_HEADER = struct.Struct("<BBBxd5fI")
+FLAG_OK = 0x01
+FLAG_ERROR = 0x02
+
+_NAN = float("nan")
+
+
+def telemetry_ok(tel: FaceTelemetry) -> bool:
+    return tel.error is None and (tel.stressIndex is not None or tel.blinkPerMin is not None or tel.jawOpenness is not None)
+
+
+def telemetry_payload(tel: FaceTelemetry) -> dict[str, Any]:
+    return {
+        "enabled": True,
+        "ok": telemetry_ok(tel),
+        "ts": tel.ts,
+        "blinkPerMin": tel.blinkPerMin,
+        "blinkPer10s": tel.blinkPer10s,
+        "jawOpenness": tel.jawOpenness,
+        "browTension": tel.browTension,
+        "stressIndex": tel.stressIndex,
+        "level": tel.level,
+        "profileVersion": tel.profileVersion,
+        "error": tel.error,
+    }
+
+
+def _f(x: Optional[float]) -> float:
+    return _NAN if x is None else x
+
+
+def _opt(x: float) -> Optional[float]:
+    return None if math.isnan(x) else x
+
+
+def encode_binary(tel: FaceTelemetry) -> bytes:
+    flags = (FLAG_OK if telemetry_ok(tel) else 0) | (FLAG_ERROR if tel.error else 0)
+    level = LEVELS.index(tel.level) + 1 if tel.level in LEVELS else 0
+    head = BINARY_HEADER.pack(
+        BINARY_VERSION,
+        flags,
+        level,
+        tel.ts,
+        _f(tel.blinkPerMin),
+        _f(tel.blinkPer10s),
+        _f(tel.jawOpenness),
+        _f(tel.browTension),
+        _f(tel.stressIndex),
+        profile_tag(tel.profileVersion) if tel.profileVersion else 0,
+    )
+    return head + tel.error.encode("utf-8") if tel.error else head
+
+
+def decode_binary(data: bytes) -> FaceTelemetry:
+    from .face_tracker import FaceTelemetry
+
+    version, flags, level, ts, bpm, b10, jaw, brow, stress, profile = BINARY_HEADER.unpack_from(data)
+    if version != BINARY_VERSION:
+        raise ValueError(f"unsupported telemetry encoding version {version}")
+    error = data[BINARY_HEADER.size :].decode("utf-8") if flags & FLAG_ERROR else None
+    return FaceTelemetry(
+        ts=ts,
+        blinkPerMin=_opt(bpm),
+        blinkPer10s=_opt(b10),
+        jawOpenness=_opt(jaw),
+        browTension=_opt(brow),
+        stressIndex=_opt(stress),
+        level=LEVELS[level - 1] if level else None,
+        error=error,
+        profileVersion=version_for_tag(profile),
+    )
+
+
+class TelemetryFrame:
+    """One published sample; each encoding is built on first use and then reused by all clients."""
+
+    def __init__(self, tel: FaceTelemetry) -> None:
+        self.tel = tel
+
+    @cached_property
+    def json(self) -> str:
+        return json.dumps(telemetry_payload(self.tel), separators=(",", ":"))
+
+    @cached_property
+    def binary(self) -> bytes:
+        return encode_binary(self.tel)
@@ -0,0 +1,97 @@
+"""In-memory columnar ring buffer of recent telemetry with vectorized range aggregation."""
+
+from __future__ import annotations
+
+import math
+import threading
+from typing import TYPE_CHECKING, Any, Optional
+
+import numpy as np
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .face_tracker import FaceTelemetry
+
+
+FIELDS = ("blinkPerMin", "blinkPer10s", "jawOpenness", "browTension", "stressIndex")
+
+
+def _column(values: np.ndarray) -> list[Optional[float]]:
+    return [None if math.isnan(x) else x for x in values.tolist()]
+
+
+class TelemetryHistory:
+    """Fixed-capacity ring: one float64 timestamp column plus one float32 column per signal.
+
+    Missing signals are stored as NaN. Queries slice by time with ``searchsorted`` and reduce
+    each bucket with ``reduceat``; no per-sample Python objects are created or scanned.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(1, capacity)
+        self._lock = threading.Lock()
+        self._ts = np.zeros(self.capacity, dtype=np.float64)
+        self._vals = np.full((len(FIELDS), self.capacity), np.nan, dtype=np.float32)
+        self._head = 0  # next write position
+        self._size = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._size
+
+    def append(self, tel: FaceTelemetry) -> None:
+        row = [getattr(tel, f) for f in FIELDS]
+        with self._lock:
+            if self._size and tel.ts < self._ts[self._head - 1]:
+                # Clock went backwards (e.g. a recorded source restarted); queries need sorted
+                # timestamps, so start over.
+                self._head = 0
+                self._size = 0
+            i = self._head
+            self._ts[i] = tel.ts
+            self._vals[:, i] = [np.nan if v is None else v for v in row]
+            self._head = (i + 1) % self.capacity
+            self._size = min(self._size + 1, self.capacity)
+
+    def _ordered(self) -> tuple[np.ndarray, np.ndarray]:
+        """Copy out the samples oldest-first (caller holds the lock)."""
+        if self._size < self.capacity:
+            return self._ts[: self._size].copy(), self._vals[:, : self._size].copy()
+        h = self._head
+        return np.concatenate((self._ts[h:], self._ts[:h])), np.concatenate((self._vals[:, h:], self._vals[:, :h]), axis=1)
+
+    def query(self, t_from: float, t_to: float, step: float) -> dict[str, Any]:
+        """Min/mean/max per ``step``-second bucket over ``[t_from, t_to]``; empty buckets are omitted."""
+        with self._lock:
+            ts, vals = self._ordered()
+        return aggregate(ts, vals, t_from, t_to, step)
+
+
+def aggregate(ts: np.ndarray, vals: np.ndarray, t_from: float, t_to: float, step: float) -> dict[str, Any]:
+    """Bucket time-sorted columns (``vals`` is ``(len(FIELDS), n)``, NaN = missing) into min/mean/max."""
+    lo = int(np.searchsorted(ts, t_from, side="left"))
+    hi = int(np.searchsorted(ts, t_to, side="right"))
+    ts, vals = ts[lo:hi], vals[:, lo:hi]
+
+    out: dict[str, Any] = {"from": t_from, "to": t_to, "step": step, "t": [], "count": [], "fields": {}}
+    if ts.size == 0:
+        out["fields"] = {f: {"min": [], "mean": [], "max": []} for f in FIELDS}
+        return out
+
+    bucket = np.floor((ts - t_from) / step).astype(np.int64)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    counts = np.diff(np.r_[starts, ts.size])
+
+    valid = ~np.isnan(vals)
+    sums = np.add.reduceat(np.where(valid, vals, 0.0).astype(np.float64), starts, axis=1)
+    n_valid = np.add.reduceat(valid, starts, axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        means = np.where(n_valid > 0, sums / n_valid, np.nan)
+    mins = np.fmin.reduceat(vals, starts, axis=1)
+    maxs = np.fmax.reduceat(vals, starts, axis=1)
+
+    out["t"] = (t_from + bucket[starts] * step).tolist()
+    out["count"] = counts.tolist()
+    out["fields"] = {
+        f: {"min": _column(mins[k]), "mean": _column(means[k]), "max": _column(maxs[k])} for k, f in enumerate(FIELDS)
+    }
+    return out
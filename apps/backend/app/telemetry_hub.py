@@ -0,0 +1,73 @@
+"""Thread-to-asyncio broadcast of the latest telemetry value."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(eq=False)
+class _Subscriber:
+    loop: asyncio.AbstractEventLoop
+    event: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class TelemetryHub(Generic[T]):
+    """Latest-value broadcast: producers publish from any thread, subscribers await fresh values.
+
+    Each subscriber is woken via ``loop.call_soon_threadsafe`` and only ever sees the newest
+    value; samples published while it was busy sending are coalesced instead of queued.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._seq = 0
+        self._latest: Optional[T] = None
+        self._subs: set[_Subscriber] = set()
+
+    def publish(self, item: T) -> None:
+        with self._lock:
+            self._seq += 1
+            self._latest = item
+            subs = list(self._subs)
+        for sub in subs:
+            try:
+                sub.loop.call_soon_threadsafe(sub.event.set)
+            except RuntimeError:
+                # Subscriber's loop already closed; it is dropped when its generator finalizes.
+                pass
+
+    def latest(self) -> Optional[T]:
+        with self._lock:
+            return self._latest
+
+    @property
+    def subscribers(self) -> int:
+        with self._lock:
+            return len(self._subs)
+
+    async def subscribe(self, min_interval: float = 0.0) -> AsyncIterator[T]:
+        """Yield each new value once; ``min_interval`` optionally caps the per-subscriber rate."""
+        sub = _Subscriber(asyncio.get_running_loop())
+        with self._lock:
+            self._subs.add(sub)
+        seen = 0
+        try:
+            while True:
+                sub.event.clear()
+                with self._lock:
+                    seq, item = self._seq, self._latest
+                if seq == seen or item is None:
+                    await sub.event.wait()
+                    continue
+                seen = seq
+                yield item
+                if min_interval > 0:
+                    await asyncio.sleep(min_interval)
+        finally:
+            with self._lock:
+                self._subs.discard(sub)
@@ -0,0 +1,202 @@
+"""Append-only per-session telemetry log and its memory-mapped reader.
+
+File layout: a 16-byte header (magic, format version, record size) followed by fixed-width
+records in the binary wire layout of :mod:`telemetry_codec` (36 bytes each, no error text).
+A torn trailing record from a crash is ignored by the reader.
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional
+
+from .stress import LEVELS
+from .stress_profile import version_for_tag
+from .telemetry_codec import BINARY_HEADER, encode_binary
+
+if TYPE_CHECKING:  # pragma: no cover
+    import numpy as np
+
+    from .face_tracker import FaceTelemetry
+
+
+LOG_MAGIC = b"CSTL"
+LOG_VERSION = 2
+LOG_SUFFIX = ".ctlog"
+FILE_HEADER = struct.Struct("<4sHH8x")
+RECORD_SIZE = BINARY_HEADER.size
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9_.-]+")
+
+
+def record_dir() -> Optional[Path]:
+    raw = os.getenv("TRACK_RECORD_DIR")
+    return Path(raw) if raw else None
+
+
+def session_path(directory: Path, source: str) -> Path:
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return directory / f"{_SAFE_NAME.sub('_', source)}-{stamp}{LOG_SUFFIX}"
+
+
+def resolve_session(name: str) -> Optional[Path]:
+    """Map a client-supplied session name to a log file inside TRACK_RECORD_DIR (no path traversal)."""
+    directory = record_dir()
+    if directory is None or not name or _SAFE_NAME.search(name) or name.startswith("."):
+        return None
+    path = directory / (name if name.endswith(LOG_SUFFIX) else name + LOG_SUFFIX)
+    return path if path.is_file() else None
+
+
+class TelemetryRecorder:
+    """Appends records through a buffered file and fsyncs in batches (every N records or T seconds)."""
+
+    def __init__(self, path: Path, fsync_every: int = 50, fsync_interval: float = 2.0) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._f: Any = open(path, "ab")
+        if self._f.tell() == 0:
+            self._f.write(FILE_HEADER.pack(LOG_MAGIC, LOG_VERSION, RECORD_SIZE))
+        self._fsync_every = max(1, fsync_every)
+        self._fsync_interval = fsync_interval
+        self._pending = 0
+        self._last_sync = time.monotonic()
+        self.records = 0
+
+    def append(self, tel: FaceTelemetry) -> None:
+        if tel.error is not None:
+            return
+        rec = encode_binary(tel)
+        with self._lock:
+            if self._f is None:
+                return
+            self._f.write(rec)
+            self.records += 1
+            self._pending += 1
+            now = time.monotonic()
+            if self._pending >= self._fsync_every or now - self._last_sync >= self._fsync_interval:
+                self._sync(now)
+
+    def _sync(self, now: float) -> None:
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._pending = 0
+        self._last_sync = now
+
+    def close(self) -> None:
+        with self._lock:
+            if self._f is None:
+                return
+            self._sync(time.monotonic())
+            self._f.close()
+            self._f = None
+
+
+def record_dtype(np: Any) -> "np.dtype":
+    return np.dtype(
+        [
+            ("version", "u1"),
+            ("flags", "u1"),
+            ("level", "u1"),
+            ("pad", "u1"),
+            ("ts", "<f8"),
+            ("blinkPerMin", "<f4"),
+            ("blinkPer10s", "<f4"),
+            ("jawOpenness", "<f4"),
+            ("browTension", "<f4"),
+            ("stressIndex", "<f4"),
+            ("profile", "<u4"),
+        ]
+    )
+
+
+class TelemetryLogReader:
+    """Memory-maps a log; records are exposed as a numpy structured array without loading the file."""
+
+    def __init__(self, path: Path) -> None:
+        import numpy as np
+
+        self._np = np
+        self.path = path
+        self._f = open(path, "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        if size < FILE_HEADER.size:
+            self._f.close()
+            raise ValueError(f"not a telemetry log: {path.name}")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, rec_size = FILE_HEADER.unpack_from(self._mm)
+        if magic != LOG_MAGIC or version != LOG_VERSION or rec_size != RECORD_SIZE:
+            self.close()
+            raise ValueError(f"unsupported telemetry log: {path.name}")
+        count = (size - FILE_HEADER.size) // RECORD_SIZE
+        self.records = np.frombuffer(self._mm, dtype=record_dtype(np), count=count, offset=FILE_HEADER.size)
+
+    def __enter__(self) -> "TelemetryLogReader":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def close(self) -> None:
+        # Drop the array view first; the mmap refuses to close while buffers are exported.
+        self.records = None  # type: ignore[assignment]
+        try:
+            self._mm.close()
+        except BufferError:
+            # A caller still holds a view into the map; it is released when that view is collected.
+            pass
+        self._f.close()
+
+    def span(self) -> tuple[Optional[float], Optional[float]]:
+        if len(self.records) == 0:
+            return None, None
+        ts = self.records["ts"]
+        return float(ts[0]), float(ts[-1])
+
+    def slice(self, t_from: Optional[float] = None, t_to: Optional[float] = None) -> "np.ndarray":
+        ts = self.records["ts"]
+        lo = 0 if t_from is None else int(self._np.searchsorted(ts, t_from, side="left"))
+        hi = len(ts) if t_to is None else int(self._np.searchsorted(ts, t_to, side="right"))
+        return self.records[lo:hi]
+
+    def aggregate(self, t_from: float, t_to: float, step: float) -> dict[str, Any]:
+        from .telemetry_history import FIELDS, aggregate
+
+        recs = self.slice(t_from, t_to)
+        vals = self._np.stack([recs[f] for f in FIELDS]) if len(recs) else self._np.empty((len(FIELDS), 0), self._np.float32)
+        return aggregate(recs["ts"], vals, t_from, t_to, step)
+
+    def telemetry(self, rec: Any) -> FaceTelemetry:
+        from .face_tracker import FaceTelemetry
+
+        def opt(x: Any) -> Optional[float]:
+            x = float(x)
+            return None if x != x else x
+
+        level = int(rec["level"])
+        return FaceTelemetry(
+            ts=float(rec["ts"]),
+            blinkPerMin=opt(rec["blinkPerMin"]),
+            blinkPer10s=opt(rec["blinkPer10s"]),
+            jawOpenness=opt(rec["jawOpenness"]),
+            browTension=opt(rec["browTension"]),
+            stressIndex=opt(rec["stressIndex"]),
+            level=LEVELS[level - 1] if level else None,
+            profileVersion=version_for_tag(int(rec["profile"])),
+        )
+
+
+def describe_session(path: Path) -> dict[str, Any]:
+    with TelemetryLogReader(path) as reader:
+        start, end = reader.span()
+        return {"name": path.stem, "bytes": path.stat().st_size, "records": len(reader), "start": start, "end": end}
@@ -0,0 +1,164 @@
+"""Face trackers keyed by source id, so one host can serve several cameras."""
+
+from __future__ import annotations
+
+import math
+import os
+import threading
+from pathlib import Path
+from typing import Any, Optional
+
+from .face_tracker import FaceTracker
+from .frame_source import default_source_spec, env_flag
+from .telemetry_log import resolve_session
+from .tracker_process import ProcessFaceTracker
+from .tracker_replay import ReplayTracker
+
+
+DEFAULT_SOURCE = "default"
+
+
+def _parse_replay(spec: str) -> tuple[str, float]:
+    """``replay:<session>[@speed]`` -> (session, speed); speed 0 replays as fast as possible."""
+    target, _, speed = spec[len("replay:") :].partition("@")
+    value = float(speed) if speed else 1.0
+    if not math.isfinite(value) or value < 0:
+        raise ValueError(f"invalid replay speed: {speed}")
+    return target, value
+
+
+def sources_from_env() -> dict[str, str]:
+    """Parse FACE_SOURCES (``name=spec,name=spec``); ``default`` always maps to FRAME_SOURCE/CAMERA_INDEX."""
+    sources = {DEFAULT_SOURCE: default_source_spec()}
+    for item in os.getenv("FACE_SOURCES", "").split(","):
+        name, sep, spec = item.partition("=")
+        if sep and name.strip() and spec.strip():
+            sources[name.strip()] = spec.strip()
+    return sources
+
+
+class TrackerPool:
+    """Lazily creates one FaceTracker per source and shares a cap on concurrent inference.
+
+    Refcounting stays on each tracker's acquire/release: the capture/inference threads for a
+    source only run while at least one client holds it.
+    """
+
+    def __init__(
+        self,
+        sources: Optional[dict[str, str]] = None,
+        max_workers: Optional[int] = None,
+        execution: Optional[str] = None,
+    ) -> None:
+        self._sources = sources if sources is not None else sources_from_env()
+        # "thread" (default) runs trackers inside this process; "process" gives each its own worker process.
+        self.execution = (execution or os.getenv("TRACK_EXECUTION", "thread")).strip().lower()
+        if self.execution not in ("thread", "process"):
+            raise ValueError(f"TRACK_EXECUTION must be 'thread' or 'process', got {self.execution!r}")
+        workers = max_workers or int(os.getenv("TRACK_MAX_WORKERS", "0")) or (os.cpu_count() or 1)
+        self.max_workers = max(1, workers)
+        # MediaPipe releases the GIL during inference, so up to max_workers trackers run it in parallel.
+        self._inference_slots = threading.BoundedSemaphore(self.max_workers)
+        self._trackers: dict[str, FaceTracker] = {}
+        # Clients holding each source through acquire(); held trackers are never pruned.
+        self._held: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, source_id: Optional[str]) -> str:
+        """Map a client-supplied id to its canonical source id; KeyError if it names nothing.
+
+        Bare digits select the configured source reading that camera index, and
+        ``replay:<session>[@speed]`` replays a recorded session from TRACK_RECORD_DIR. Aliases
+        ("0001", "@1.0") resolve to the same id, so they share one tracker.
+        """
+        sid = (source_id or DEFAULT_SOURCE).strip()
+        if sid in self._sources:
+            return sid
+        if sid.isascii() and sid.isdigit():
+            spec = f"camera:{int(sid)}"
+            for name, configured in self._sources.items():
+                if configured == spec:
+                    return name
+        elif sid.startswith("replay:"):
+            try:
+                name, speed = _parse_replay(sid)
+            except ValueError:
+                raise KeyError(sid)
+            path = resolve_session(name)
+            if path is not None:
+                return f"replay:{path.stem}@{speed:g}"
+        raise KeyError(sid)
+
+    def spec_for(self, source_id: str) -> str:
+        return self._sources.get(source_id, source_id)
+
+    def get(self, source_id: Optional[str] = None) -> FaceTracker:
+        sid = self.resolve(source_id)
+        with self._lock:
+            return self._get_locked(sid)
+
+    def _get_locked(self, sid: str) -> FaceTracker:
+        tracker = self._trackers.get(sid)
+        if tracker is None:
+            spec = self.spec_for(sid)
+            if spec.startswith("replay:"):
+                # Configured sources may name a log path; client ids only name sessions.
+                target, speed = _parse_replay(spec)
+                path = resolve_session(target) or Path(target)
+                tracker = ReplayTracker(path, speed=speed, loop=env_flag("FRAME_SOURCE_LOOP"))
+            elif self.execution == "process":
+                tracker = ProcessFaceTracker(source=spec)
+            else:
+                tracker = FaceTracker(source=spec, inference_slots=self._inference_slots)
+            self._prune_idle()
+            self._trackers[sid] = tracker
+        return tracker
+
+    def _prune_idle(self) -> None:
+        """Drop idle replay trackers so ad-hoc ids cannot grow the cache without bound."""
+        idle = [
+            sid
+            for sid, t in self._trackers.items()
+            if sid not in self._sources and not self._held.get(sid) and t.idle
+        ]
+        for sid in idle:
+            del self._trackers[sid]
+
+    def acquire(self, source_id: Optional[str] = None) -> FaceTracker:
+        sid = self.resolve(source_id)
+        with self._lock:
+            tracker = self._get_locked(sid)
+            self._held[sid] = self._held.get(sid, 0) + 1
+        tracker.acquire()
+        return tracker
+
+    def release(self, source_id: Optional[str] = None) -> None:
+        # Callers pass back the id acquire() resolved; it stays valid even if a replayed log is gone.
+        sid = source_id if source_id in self._held else self.resolve(source_id)
+        with self._lock:
+            tracker = self._trackers.get(sid)
+            held = self._held.get(sid, 0)
+            if tracker is None or held == 0:
+                return
+            if held == 1:
+                del self._held[sid]
+            else:
+                self._held[sid] = held - 1
+        tracker.release()
+
+    def sources(self) -> list[dict[str, Any]]:
+        with self._lock:
+            active = dict(self._trackers)
+        return [
+            {"id": sid, "source": spec, "active": sid in active and active[sid].stats()["running"]}
+            for sid, spec in self._sources.items()
+        ]
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            trackers = dict(self._trackers)
+        return {
+            "execution": self.execution,
+            "maxWorkers": self.max_workers,
+            "trackers": {sid: t.stats() for sid, t in trackers.items()},
+        }
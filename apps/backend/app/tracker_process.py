@@ -0,0 +1,140 @@
+"""Process execution mode: capture + inference run in a worker process, off the web process's GIL."""
+
+from __future__ import annotations
+
+import multiprocessing
+import threading
+import time
+from dataclasses import astuple
+from typing import Any, Optional
+
+from .face_tracker import FaceTelemetry, FaceTracker
+
+
+# Stats are sent at most this often; telemetry is sent for every frame.
+_STATS_INTERVAL = 1.0
+
+
+class _PipeFaceTracker(FaceTracker):
+    """Child-side tracker that forwards each telemetry record to the parent as a plain tuple."""
+
+    # The parent-side ProcessFaceTracker records the session.
+    records_sessions = False
+
+    def __init__(self, conn: Any, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self._conn = conn
+        self._stats_sent = 0.0
+
+    def _publish(self, tel: FaceTelemetry) -> None:
+        super()._publish(tel)
+        try:
+            self._conn.send(("tel", astuple(tel)))
+            now = time.time()
+            if now - self._stats_sent >= _STATS_INTERVAL:
+                self._stats_sent = now
+                self._conn.send(("stats", self.stats()))
+                self._conn.send(("calibration", self.calibration()))
+        except (BrokenPipeError, EOFError, OSError):
+            # Parent went away; the command loop in _process_main will notice and stop us.
+            self._stop_evt.set()
+
+
+def _process_main(conn: Any, source: str, throughput: bool) -> None:
+    tracker = _PipeFaceTracker(conn, source=source, throughput=throughput)
+    tracker.acquire()
+    try:
+        while True:
+            cmd = conn.recv()
+            if cmd[0] == "stop":
+                break
+            if cmd[0] == "reset_calibration":
+                tracker.reset_calibration()
+    except (EOFError, OSError):
+        pass
+    finally:
+        tracker.release()
+        thread = tracker._stopping
+        if thread is not None:
+            thread.join(timeout=2.0)
+
+
+class ProcessFaceTracker(FaceTracker):
+    """Same interface as FaceTracker; ``_run`` supervises a worker process and relays its telemetry.
+
+    The pool-wide inference cap does not apply here: each worker process runs its own interpreter
+    and scales with cores by itself.
+    """
+
+    def __init__(self, source: Optional[str] = None, throughput: Optional[bool] = None, **kwargs: Any) -> None:
+        super().__init__(source=source, throughput=throughput)
+        self._child_stats: dict[str, Any] = {}
+        self._child_calibration: Optional[dict[str, Any]] = None
+        self._reset_calibration = threading.Event()
+
+    def stats(self) -> dict[str, Any]:
+        base = super().stats()
+        with self._lock:
+            child = dict(self._child_stats)
+        # Frame counters live in the worker; keep local identity fields.
+        child.update({"source": base["source"], "running": base["running"], "execution": "process"})
+        return {**base, **child}
+
+    def calibration(self) -> dict[str, Any]:
+        # The worker reports its state with the stats; until then show a fresh (reset) state.
+        with self._lock:
+            child = self._child_calibration
+        return child if child is not None else super().calibration()
+
+    def reset_calibration(self) -> None:
+        with self._lock:
+            self._child_calibration = None
+        super().reset_calibration()
+        # Relayed by _run, which owns the pipe.
+        self._reset_calibration.set()
+
+    def _run(self) -> None:
+        ctx = multiprocessing.get_context("spawn")
+        conn, child_conn = ctx.Pipe()
+        proc = ctx.Process(target=_process_main, args=(child_conn, self.source_spec, self.throughput), daemon=True)
+        proc.start()
+        child_conn.close()
+
+        try:
+            while not self._stop_evt.is_set():
+                if self._reset_calibration.is_set():
+                    self._reset_calibration.clear()
+                    try:
+                        conn.send(("reset_calibration",))
+                    except (BrokenPipeError, EOFError, OSError):
+                        break
+                if not conn.poll(0.5):
+                    if not proc.is_alive():
+                        break
+                    continue
+                try:
+                    kind, payload = conn.recv()
+                except (EOFError, OSError):
+                    break
+                if kind == "tel":
+                    self._publish(FaceTelemetry(*payload))
+                elif kind == "stats":
+                    with self._lock:
+                        self._child_stats = payload
+                elif kind == "calibration":
+                    with self._lock:
+                        if not self._reset_calibration.is_set():
+                            self._child_calibration = payload
+        finally:
+            try:
+                conn.send(("stop",))
+            except (BrokenPipeError, EOFError, OSError):
+                pass
+            proc.join(timeout=3.0)
+            if proc.is_alive():
+                proc.terminate()
+                proc.join(timeout=1.0)
+            conn.close()
+
+        if not self._stop_evt.is_set():
+            self._publish_error_until_stopped(f"tracker worker process exited (code={proc.exitcode})")
@@ -0,0 +1,67 @@
+"""Replay a recorded telemetry log through the normal tracker pipeline (/ws/face, stats)."""
+
+from __future__ import annotations
+
+import time
+from pathlib import Path
+from typing import Any
+
+from .face_tracker import FaceTracker
+from .telemetry_log import TelemetryLogReader
+
+
+class ReplayTracker(FaceTracker):
+    """Publishes records from a session log at their original pacing divided by ``speed``."""
+
+    records_sessions = False
+    # Replayed samples keep their recorded timestamps, which would sit outside any live window
+    # (and repeat on every loop); the log itself is queried through /api/face/sessions/{name}.
+    keeps_history = False
+
+    def __init__(self, path: Path, speed: float = 1.0, loop: bool = False) -> None:
+        super().__init__(source=f"replay:{path.stem}@{speed:g}", throughput=speed <= 0)
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+
+    def stats(self) -> dict[str, Any]:
+        return {**super().stats(), "execution": "replay", "speed": self.speed}
+
+    def _run(self) -> None:
+        try:
+            reader = TelemetryLogReader(self.path)
+        except (OSError, ValueError) as e:
+            self._publish_error_until_stopped(str(e))
+            return
+
+        with self._lock:
+            self._frames = 0
+            self._started_at = time.time()
+            self._ended_at = None
+        with reader:
+            while self._replay_once(reader) and self.loop:
+                pass
+        with self._lock:
+            self._ended_at = time.time()
+        if not self._stop_evt.is_set():
+            self._publish_error_until_stopped(f"replay finished ({self.path.stem})")
+
+    def _replay_once(self, reader: TelemetryLogReader) -> bool:
+        """Returns False if stopped early. Views into the mmap stay local so the reader can close."""
+        records = reader.records
+        if len(records) == 0:
+            return False
+        ts = records["ts"]
+        base_ts = float(ts[0])
+        start = time.monotonic()
+        for i in range(len(records)):
+            if self._stop_evt.is_set():
+                return False
+            if not self.throughput:
+                wait = start + (float(ts[i]) - base_ts) / self.speed - time.monotonic()
+                if wait > 0 and self._stop_evt.wait(wait):
+                    return False
+            self._publish(reader.telemetry(records[i]))
+            with self._lock:
+                self._frames += 1
+        return True
@@ -0,0 +1,52 @@
+"""
+Micro-benchmark geometri landmark per frame: pt()/dist() lama vs landmark_features (vectorized)
+Jalankan dengan: python bench_landmarks.py [jumlah_iterasi]
+"""
+import sys
+import timeit
+from types import SimpleNamespace
+
+import numpy as np
+
+from app.landmark_features import compute_features, landmark_points
+
+iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+w, h = 1280, 720
+
+rng = np.random.default_rng(0)
+lm = [SimpleNamespace(x=float(x), y=float(y)) for x, y in rng.uniform(0.3, 0.7, size=(478, 2))]
+
+
+def legacy() -> tuple[float, float, float, float]:
+    """Copy of the previous per-point code path in FaceTracker._run."""
+
+    def dist(a: np.ndarray, b: np.ndarray) -> float:
+        return float(np.linalg.norm(a - b))
+
+    def pt(i: int) -> np.ndarray:
+        return np.array([lm[i].x * w, lm[i].y * h], dtype=np.float32)
+
+    p1, p2, p3, p4, p5, p6 = pt(33), pt(160), pt(158), pt(133), pt(153), pt(144)
+    ear = (dist(p2, p6) + dist(p3, p5)) / (2.0 * dist(p1, p4) + 1e-6)
+    mouth_open = dist(pt(13), pt(14))
+    face_scale = dist(pt(1), pt(152)) + 1e-6
+    brow_dist = dist(pt(105), pt(159))
+    return ear, mouth_open, face_scale, brow_dist
+
+
+def vectorized() -> tuple[float, float, float, float]:
+    f = compute_features(landmark_points(lm, w, h))
+    return f.ear_left, f.mouth_open, f.face_scale, f.brow_dist
+
+
+print("=== Landmark Geometry Micro-benchmark ===\n")
+
+a, b = legacy(), vectorized()
+print("Check (legacy vs vectorized, left-eye EAR / mouth / scale / brow):")
+for name, x, y in zip(("ear", "mouth", "scale", "brow"), a, b):
+    print(f"   {name:6s} {x:12.6f} {y:12.6f}")
+
+t_old = min(timeit.repeat(legacy, number=iterations, repeat=3)) / iterations * 1e6
+t_new = min(timeit.repeat(vectorized, number=iterations, repeat=3)) / iterations * 1e6
+print(f"\nlegacy pt()/dist(): {t_old:7.2f} us/frame")
+print(f"vectorized:         {t_new:7.2f} us/frame  (both eyes, {t_old / t_new:.1f}x faster)")
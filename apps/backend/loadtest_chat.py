@@ -0,0 +1,102 @@
+"""
+Load test endpoint /api/chat/stream: buka N stream SSE bersamaan, ukur TTFT & latency
+Jalankan backend dulu (untuk offline pakai LLM_PROVIDER=mock), lalu:
+    python loadtest_chat.py --concurrency 50 --requests 500
+    python loadtest_chat.py --url http://127.0.0.1:8001 --same   (semua request identik -> uji cache)
+Semua request datang dari satu IP, jadi naikkan CHAT_MAX_QUEUED_PER_CLIENT (atau CHAT_MAX_CONCURRENCY)
+di backend kalau tidak ingin mengukur respons 429.
+"""
+import argparse
+import asyncio
+import json
+import math
+import time
+from collections import Counter
+
+import httpx
+
+
+def percentile(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    k = min(len(values) - 1, max(0, math.ceil(p * len(values)) - 1))
+    return values[k]
+
+
+async def one_stream(client, url, i, args, result):
+    text = args.message if args.same else f"{args.message} (#{i})"
+    body = {"messages": [{"role": "user", "content": text}]}
+    t0 = time.perf_counter()
+    ttft = None
+    chars = 0
+    event = None
+    try:
+        async with client.stream("POST", url, json=body) as r:
+            if r.status_code != 200:
+                await r.aread()
+                result["status"][r.status_code] += 1
+                return
+            async for line in r.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[7:]
+                elif line.startswith("data: ") and event == "token":
+                    if ttft is None:
+                        ttft = time.perf_counter() - t0
+                    chars += len(json.loads(line[6:])["token"])
+                elif line.startswith("data: ") and event in ("done", "error"):
+                    result["status"][event] += 1
+    except httpx.HTTPError as e:
+        result["status"][type(e).__name__] += 1
+        return
+    result["total"].append(time.perf_counter() - t0)
+    result["chars"] += chars
+    if ttft is not None:
+        result["ttft"].append(ttft)
+
+
+async def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", default="http://127.0.0.1:8001")
+    ap.add_argument("--concurrency", "-c", type=int, default=20)
+    ap.add_argument("--requests", "-n", type=int, default=100)
+    ap.add_argument("--message", default="Aku merasa lelah dan tidak bisa fokus bekerja.")
+    ap.add_argument("--same", action="store_true", help="kirim pesan identik di semua request")
+    ap.add_argument("--timeout", type=float, default=120.0)
+    args = ap.parse_args()
+
+    url = args.url.rstrip("/") + "/api/chat/stream"
+    result = {"ttft": [], "total": [], "chars": 0, "status": Counter()}
+    queue = asyncio.Queue()
+    for i in range(args.requests):
+        queue.put_nowait(i)
+
+    async def worker(client):
+        while True:
+            try:
+                i = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await one_stream(client, url, i, args, result)
+
+    print(f"=== Chat Load Test ({args.requests} request, {args.concurrency} concurrent) -> {url} ===\n")
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(args.concurrency)))
+        wall = time.perf_counter() - t0
+
+    ok = len(result["total"])
+    print(f"Selesai dalam {wall:.2f}s: {ok} stream selesai, {ok / wall:.1f} stream/s, {result['chars'] / wall:,.0f} char/s")
+    print(f"Status: {dict(result['status'])}")
+    for name in ("ttft", "total"):
+        vals = [v * 1000.0 for v in result[name]]
+        label = "TTFT " if name == "ttft" else "Total"
+        print(
+            f"{label} ms  p50={percentile(vals, 0.50):8.1f}  p95={percentile(vals, 0.95):8.1f}"
+            f"  p99={percentile(vals, 0.99):8.1f}  max={max(vals, default=float('nan')):8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Run from anywhere: make the backend root (which holds the `app` package) importable.
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,51 @@
+import random
+
+import pytest
+
+from app.calibration import BaselineCalibrator
+
+FPS = 30.0
+
+
+def _session(calib: BaselineCalibrator, rng: random.Random, baseline: float, seconds: float, start: float = 0.0) -> float:
+    """Feed frames the way FaceTracker does (hysteresis on the current thresholds); returns the end time."""
+    eye_closed = False
+    blink_left = 0
+    t = start
+    for i in range(int(seconds * FPS)):
+        t = start + i / FPS
+        if blink_left == 0 and rng.random() < 0.01:
+            blink_left = rng.randint(3, 6)  # ~15 blinks/min of 100-200 ms
+        if blink_left:
+            blink_left -= 1
+            ear = baseline * rng.uniform(0.2, 0.5)
+        else:
+            ear = rng.gauss(baseline, 0.012)
+        if not eye_closed and ear < calib.close_th:
+            eye_closed = True
+        elif eye_closed and ear > calib.open_th:
+            eye_closed = False
+        calib.observe(t, ear, 0.043, eye_open=not eye_closed)
+    return t
+
+
+@pytest.mark.parametrize("baseline", [0.20, 0.23, 0.30])
+def test_baseline_is_unbiased_for_narrow_and_wide_eyes(baseline):
+    calib = BaselineCalibrator(seconds=20.0)
+    _session(calib, random.Random(1), baseline, 25.0)
+    snap = calib.snapshot()
+    assert snap["state"] == "calibrated"
+    # The old gate (ear > default open threshold 0.225) either truncated these or never calibrated.
+    assert snap["ear"]["mean"] == pytest.approx(baseline, abs=0.003)
+    assert snap["ear"]["std"] == pytest.approx(0.012, abs=0.004)
+    assert calib.close_th < baseline * 0.8 < calib.open_th + 0.01
+
+
+def test_drift_follows_a_lower_open_eye_level():
+    calib = BaselineCalibrator(seconds=10.0, adapt_rate=0.01)
+    rng = random.Random(2)
+    end = _session(calib, rng, 0.28, 12.0)
+    assert calib.calibrated
+    # The subject moves back from the camera; EAR settles below the old open threshold.
+    _session(calib, rng, 0.21, 60.0, start=end + 1.0 / FPS)
+    assert calib.ear.mean == pytest.approx(0.21, abs=0.004)
@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import pytest
+
+from app import llm_provider, main
+from app.chat_cache import ChatResponseCache
+from app.mock_llm import MockConfig, MockProvider
+
+# How long the upstream stream may stay open once the client has gone away.
+CLOSE_TIMEOUT = 1.0
+
+
+@pytest.fixture
+def provider(monkeypatch):
+    monkeypatch.setenv("LLM_PROVIDER", "mock")
+    # Slow enough that the reply is still streaming when the client disconnects.
+    mock = MockProvider(MockConfig(tokens_per_sec=20, first_token_ms=0, reply_sentences=(6, 6)))
+    monkeypatch.setattr(llm_provider, "_provider", mock)
+    return mock
+
+
+async def _disconnect_after_first_token(path: str, payload: dict) -> None:
+    body = json.dumps(payload).encode()
+    got_token = asyncio.Event()
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        await got_token.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.body" and b"event: token" in message.get("body", b""):
+            got_token.set()
+
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0", "spec_version": "2.3"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": ("testserver", 80),
+    }
+    await main.app(scope, receive, send)
+
+
+@pytest.mark.parametrize("cache_ttl", [0.0, 300.0], ids=["uncached", "single-flight"])
+def test_upstream_closes_after_client_disconnect(provider, monkeypatch, cache_ttl):
+    monkeypatch.setattr(main, "chat_cache", ChatResponseCache(ttl=cache_ttl))
+    payload = {"messages": [{"role": "user", "content": f"halo, cache {cache_ttl}"}]}
+
+    async def scenario():
+        await asyncio.wait_for(_disconnect_after_first_token("/api/chat/stream", payload), CLOSE_TIMEOUT)
+
+        async def upstream_closed():
+            while provider.open_streams:
+                await asyncio.sleep(0.01)
+
+        # The single-flight pump is cancelled rather than awaited by the response; give it a moment.
+        await asyncio.wait_for(upstream_closed(), CLOSE_TIMEOUT)
+
+    asyncio.run(scenario())
+    assert provider.started == 1
+    assert provider.closed_early == 1
+    assert provider.completed == 0
+    assert main.chat_cache.stats()["inFlight"] == 0
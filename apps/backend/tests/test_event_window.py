@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from app.event_window import WindowedEventCounter
+
+
+class ListCounter:
+    """The list-based blink counting FaceTracker used before: filter, then count per window."""
+
+    def __init__(self, keep: float) -> None:
+        self.keep = keep
+        self.events: list[float] = []
+
+    def add(self, ts: float) -> None:
+        self.events.append(ts)
+
+    def advance(self, now: float) -> None:
+        cutoff = now - self.keep
+        self.events = [t for t in self.events if t >= cutoff]
+
+    def count(self, now: float, window: float) -> int:
+        cutoff = now - window
+        return sum(1 for t in self.events if t >= cutoff)
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_matches_list_semantics(seed):
+    rng = random.Random(seed)
+    windows = (10.0, 60.0, 300.0)
+    counter = WindowedEventCounter(windows)
+    reference = ListCounter(max(windows))
+    # Quarter-second ticks keep every ``now - window`` exact, so events land on the window edges.
+    now = 0.0
+    for _ in range(20000):
+        now += rng.choice([0.0, 0.25, 0.25, 0.5, 1.0, 9.75, 10.0])
+        for _ in range(rng.choice([0, 0, 0, 1, 1, 2])):
+            counter.add(now)
+            reference.add(now)
+        counter.advance(now)
+        reference.advance(now)
+        for w in windows:
+            assert counter.count(w) == reference.count(now, w), (now, w)
+
+
+def test_window_edges_are_inclusive():
+    counter = WindowedEventCounter((10.0, 60.0))
+    for ts in (0.0, 50.0, 55.0):
+        counter.add(ts)
+    counter.advance(60.0)
+    # An event exactly ``window`` seconds old still counts; rates are events per window.
+    assert (counter.count(60.0), counter.count(10.0)) == (3, 2)
+    counter.advance(60.25)
+    assert (counter.count(60.0), counter.count(10.0)) == (2, 1)
+    counter.advance(65.0)
+    assert (counter.count(60.0), counter.count(10.0)) == (2, 1)
+    counter.advance(65.25)
+    assert (counter.count(60.0), counter.count(10.0)) == (2, 0)
+    counter.advance(200.0)
+    assert (counter.count(60.0), counter.count(10.0)) == (0, 0)
+
+
+def test_expired_events_are_dropped():
+    counter = WindowedEventCounter((10.0,))
+    for i in range(10000):
+        counter.add(float(i))
+        counter.advance(float(i))
+        assert counter.count(10.0) == min(i + 1, 11)
+    assert len(counter._events) <= 2 * 11 + 64
+
+
+def test_clock_going_backwards_starts_over():
+    counter = WindowedEventCounter((10.0,))
+    for ts in (100.0, 101.0, 102.0):
+        counter.add(ts)
+    counter.advance(102.0)
+    counter.advance(1.0)
+    assert counter.count(10.0) == 0
+    counter.add(1.5)
+    counter.advance(2.0)
+    assert counter.count(10.0) == 1
+
+
+
+@pytest.mark.parametrize("blinks_before", [0, 100])
+def test_blink_on_the_first_frame_after_a_restart_is_kept(blinks_before):
+    counter = WindowedEventCounter((10.0, 60.0))
+    for i in range(blinks_before):
+        counter.add(float(i))
+        counter.advance(float(i))
+    # Long enough that every event has expired (and been compacted away).
+    counter.advance(500.0)
+    assert counter.count(60.0) == 0
+    # The recorded source restarts and its first frame is a blink: add, then advance, as FaceTracker does.
+    counter.add(0.5)
+    counter.advance(0.5)
+    assert (counter.count(10.0), counter.count(60.0)) == (1, 1)
@@ -0,0 +1,72 @@
+import random
+
+import pytest
+
+from app.fps_governor import BLINK_SAFE_FPS, FpsGovernor
+
+OPEN_EAR, CLOSED_EAR = 0.30, 0.10
+CLOSE_TH, OPEN_TH = 0.20, 0.225
+
+
+def _blinks(rng: random.Random, seconds: float) -> list[tuple[float, float]]:
+    """(start, end) of the closed phase of each blink: 100-250 ms, one every 2-6 s."""
+    out, t = [], 1.0
+    while t < seconds:
+        d = rng.uniform(0.10, 0.25)
+        out.append((t, t + d))
+        t += d + rng.uniform(2.0, 6.0)
+    return out
+
+
+def _recall(next_interval, blinks: list[tuple[float, float]], seconds: float, rng: random.Random) -> float:
+    """Sample the eye at the rate the caller picks; a blink counts once a frame sees it closed."""
+    t = rng.uniform(0.0, 0.1)
+    seen: set[int] = set()
+    i = 0
+    eye_closed = False
+    while t < seconds:
+        while i < len(blinks) and blinks[i][1] < t:
+            i += 1
+        closed_now = i < len(blinks) and blinks[i][0] <= t <= blinks[i][1]
+        ear = CLOSED_EAR if closed_now else OPEN_EAR * rng.uniform(0.99, 1.01)
+        if not eye_closed and ear < CLOSE_TH:
+            eye_closed = True
+            seen.add(i)
+        elif eye_closed and ear > OPEN_TH:
+            eye_closed = False
+        t += next_interval(t, ear, eye_closed)
+    return len(seen) / len(blinks)
+
+
+@pytest.mark.parametrize("max_fps", [10.0, 15.0, 30.0])
+def test_adaptive_rate_keeps_every_blink(max_fps):
+    rng = random.Random(int(max_fps))
+    blinks = _blinks(rng, 600.0)
+    governor = FpsGovernor(max_fps=max_fps, min_fps=2.0, adaptive=True, cpu_budget=0.0)
+    rates = []
+
+    def interval(t, ear, eye_closed):
+        dt = governor.update(t, 0.005, ear, 0.1, eye_closed)
+        rates.append(governor.target_fps)
+        return dt
+
+    assert _recall(interval, blinks, 600.0, rng) == 1.0
+    assert min(rates) == pytest.approx(min(max_fps, BLINK_SAFE_FPS))
+
+
+def test_half_rate_would_miss_blinks():
+    # Why the floor is not a fraction of TRACK_FPS: at 5 fps roughly one blink in six is lost.
+    rng = random.Random(5)
+    recall = _recall(lambda t, ear, closed: 0.2, _blinks(rng, 3000.0), 3000.0, rng)
+    assert 0.75 < recall < 0.9
+
+
+def test_budget_cap_keeps_blink_floor_with_a_face():
+    governor = FpsGovernor(max_fps=30.0, min_fps=2.0, adaptive=True, cpu_budget=0.5)
+    # 100 ms per frame would cap the rate at 5 fps.
+    for i in range(50):
+        governor.update(i * 0.1, 0.1, OPEN_EAR, 0.1, False)
+    assert (governor.target_fps, governor.limited_by) == (BLINK_SAFE_FPS, "budget")
+    for i in range(50, 100):
+        governor.update(i * 0.1, 0.1, None, None, False)
+    assert (governor.target_fps, governor.limited_by) == (2.0, "noFace")
@@ -0,0 +1,73 @@
+import time
+
+import pytest
+
+from app.face_tracker import FaceTelemetry
+from app.frame_source import ImageDirSource
+from app.telemetry_log import TelemetryRecorder
+from app.tracker_replay import ReplayTracker
+
+
+class FakeCv2:
+    """imread stand-in: files listed in ``readable`` load as their name, everything else fails."""
+
+    def __init__(self, readable: set[str]) -> None:
+        self.readable = readable
+        self.calls = 0
+
+    def imread(self, path: str):
+        self.calls += 1
+        name = path.rsplit("/", 1)[-1]
+        return name if name in self.readable else None
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    for name in ("a.png", "b.jpg", "c.png"):
+        (tmp_path / name).write_bytes(b"not really an image")
+    return tmp_path
+
+
+def test_looping_dir_with_no_readable_image_ends(image_dir):
+    cv2 = FakeCv2(readable=set())
+    source = ImageDirSource(cv2, image_dir, loop=True)
+    assert source.open() == (True, None)
+    assert source.read() == (False, None, -1)
+    assert cv2.calls == 3
+
+
+def test_looping_dir_skips_unreadable_images(image_dir):
+    source = ImageDirSource(FakeCv2(readable={"b.jpg"}), image_dir, loop=True)
+    source.open()
+    frames = [source.read()[1] for _ in range(4)]
+    assert frames == ["b.jpg"] * 4
+
+
+def test_non_looping_dir_ends_after_one_pass(image_dir):
+    source = ImageDirSource(FakeCv2(readable={"a.png", "c.png"}), image_dir)
+    source.open()
+    assert [source.read()[1] for _ in range(3)] == ["a.png", "c.png", None]
+
+
+def test_elapsed_stops_when_the_replay_finishes(tmp_path):
+    path = tmp_path / "cam.ctlog"
+    recorder = TelemetryRecorder(path)
+    for i in range(5):
+        recorder.append(FaceTelemetry(1000.0 + i * 0.01, 12.0, 2.0, 0.1, 0.2, 30.0, "rendah"))
+    recorder.close()
+
+    tracker = ReplayTracker(path, speed=1.0)
+    tracker.acquire()
+    try:
+        deadline = time.time() + 5.0
+        while (tracker.latest() is None or tracker.latest().error is None) and time.time() < deadline:
+            time.sleep(0.01)
+        assert "replay finished" in tracker.latest().error
+        first = tracker.stats()
+        time.sleep(0.2)
+        second = tracker.stats()
+    finally:
+        tracker.release()
+    assert first["frames"] == 5
+    assert second["elapsed"] == first["elapsed"] < 0.2
+    assert second["fps"] == first["fps"] > 0
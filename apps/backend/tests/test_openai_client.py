@@ -0,0 +1,145 @@
+import asyncio
+import json
+import statistics
+import time
+
+import pytest
+
+from app import llm_provider, openai_llm
+from app.models import ChatMessage
+
+TOKENS = ["Aku ", "memahami ", "perasaanmu."]
+# The stand-in model sends the first token at once and takes this long for the rest.
+GENERATION_DELAY = 0.2
+# Stand-in for TCP + TLS setup to a remote API, paid once per new connection.
+HANDSHAKE_DELAY = 0.05
+REQUESTS = 5
+
+
+class FakeOpenAI:
+    """Minimal OpenAI-compatible chat completions server (streaming only, HTTP/1.1 keep-alive)."""
+
+    def __init__(self) -> None:
+        self.connections = 0
+        self.requests = 0
+        self.server: asyncio.AbstractServer | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}/v1"
+
+    async def start(self) -> None:
+        self.server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+
+    async def stop(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            await asyncio.sleep(HANDSHAKE_DELAY)
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = dict(
+                    line.split(":", 1) for line in head.decode("latin-1").split("\r\n")[1:] if ":" in line
+                )
+                length = int({k.lower(): v for k, v in headers.items()}.get("content-length", "0"))
+                json.loads(await reader.readexactly(length))
+                self.requests += 1
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\ncontent-type: text/event-stream\r\n"
+                    b"transfer-encoding: chunked\r\nconnection: keep-alive\r\n\r\n"
+                )
+                for i, token in enumerate(TOKENS):
+                    if i == 1:
+                        await asyncio.sleep(GENERATION_DELAY)
+                    self._chunk(writer, {"content": token})
+                    await writer.drain()
+                self._event(writer, "[DONE]")
+                writer.write(b"0\r\n\r\n")
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    def _chunk(self, writer: asyncio.StreamWriter, delta: dict) -> None:
+        event = {
+            "id": "chatcmpl-test",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": "fake",
+            "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+        }
+        self._event(writer, json.dumps(event))
+
+    @staticmethod
+    def _event(writer: asyncio.StreamWriter, data: str) -> None:
+        payload = f"data: {data}\n\n".encode()
+        writer.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+
+
+@pytest.fixture
+def openai_env(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setenv("OPENAI_MAX_RETRIES", "0")
+    monkeypatch.setattr(llm_provider, "_provider", openai_llm.OpenAIProvider())
+    monkeypatch.setattr(openai_llm, "_shared_client", None)
+
+
+def _replies(monkeypatch, pooled: bool) -> tuple[FakeOpenAI, list[tuple[float, float, str]]]:
+    """Run REQUESTS sequential replies; ``pooled=False`` builds (and closes) a client per request."""
+    server = FakeOpenAI()
+    messages = [ChatMessage(role="user", content="halo")]
+
+    async def one_reply() -> tuple[float, float, str]:
+        start = time.perf_counter()
+        first = None
+        text = []
+        async for token in openai_llm.stream_chat(messages, None):
+            if first is None:
+                first = time.perf_counter() - start
+            text.append(token)
+        return first, time.perf_counter() - start, "".join(text)
+
+    async def scenario():
+        await server.start()
+        monkeypatch.setenv("OPENAI_BASE_URL", server.base_url)
+        try:
+            openai_llm.init_client()
+            out = []
+            for _ in range(REQUESTS):
+                out.append(await one_reply())
+                if not pooled:
+                    await openai_llm.close_client()
+            return out
+        finally:
+            await openai_llm.close_client()
+            await server.stop()
+
+    return server, asyncio.run(scenario())
+
+
+def test_shared_client_reuses_connection_and_streams_first_token(openai_env, monkeypatch):
+    server, replies = _replies(monkeypatch, pooled=True)
+    assert server.requests == REQUESTS
+    # One pooled keep-alive connection serves every request; no per-request client or handshake.
+    assert server.connections == 1
+    for ttft, total, text in replies[1:]:
+        assert text == "".join(TOKENS)
+        # The first token reaches the caller before the rest of the reply is generated.
+        assert ttft < GENERATION_DELAY / 2 < GENERATION_DELAY <= total
+
+
+def test_shared_client_beats_a_client_per_request(openai_env, monkeypatch):
+    pooled_server, pooled = _replies(monkeypatch, pooled=True)
+    fresh_server, fresh = _replies(monkeypatch, pooled=False)
+    assert (pooled_server.connections, fresh_server.connections) == (1, REQUESTS)
+
+    # The first request pays the handshake either way; after that only fresh clients do.
+    pooled_ttft = statistics.median(r[0] for r in pooled[1:])
+    fresh_ttft = statistics.median(r[0] for r in fresh[1:])
+    assert pooled_ttft <= fresh_ttft
+    assert fresh_ttft >= HANDSHAKE_DELAY > pooled_ttft
@@ -0,0 +1,40 @@
+import time
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.face_tracker import FaceTelemetry
+from app.telemetry_log import LOG_SUFFIX, TelemetryRecorder
+
+
+def _record(path, n: int = 10) -> None:
+    recorder = TelemetryRecorder(path)
+    for i in range(n):
+        recorder.append(FaceTelemetry(1000.0 + i, 12.0, 2.0, 0.1, 0.2, float(i), "rendah"))
+    recorder.close()
+
+
+def test_history_of_a_looping_replay_points_to_the_session_log(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRACK_RECORD_DIR", str(tmp_path))
+    monkeypatch.setenv("FRAME_SOURCE_LOOP", "1")
+    _record(tmp_path / f"cam{LOG_SUFFIX}")
+    client = TestClient(main.app)
+
+    sid = main.pool.resolve("replay:cam@0")
+    tracker = main.pool.acquire(sid)
+    try:
+        deadline = time.time() + 5.0
+        while tracker.stats()["frames"] < 30 and time.time() < deadline:
+            time.sleep(0.01)
+        assert tracker.stats()["frames"] >= 30, "replay did not loop"
+
+        resp = client.get("/api/face/history", params={"source": "replay:cam@0", "from": 1000, "to": 1010})
+        assert resp.status_code == 400
+        assert "/api/face/sessions/cam" in resp.json()["detail"]
+        assert tracker.history(1000.0, 1010.0, 1.0) is None
+    finally:
+        main.pool.release(sid)
+
+    session = client.get("/api/face/sessions/cam", params={"from": 1000, "to": 1010, "step": 1}).json()
+    assert session["t"] == [1000.0 + i for i in range(10)]
+    assert session["fields"]["stressIndex"]["mean"] == [float(i) for i in range(10)]
@@ -0,0 +1,112 @@
+import json
+import random
+
+import pytest
+
+from app.json_scanner import JsonObjectScanner
+from app.openai_llm import ANALYSIS_MARKER
+from app.stream_splitter import AnalysisSplitter
+
+ANALYSIS = {
+    "topics": ["stres", "pekerjaan"],
+    "summary": "User merasa {tertekan}, \"lelah\" dan butuh jeda.",
+    "stress_level": "sedang",
+    "early_actions": ["Tarik napas [4-7-8]", "Istirahat"],
+    "disclaimer": "Ini bukan diagnosis medis.",
+}
+REPLY = "Aku paham.\n\nCoba tarik napas pelan-pelan.\n\n[[ANALYSIS tidak ada di sini]]\n"
+TEXT = REPLY + ANALYSIS_MARKER + json.dumps(ANALYSIS, ensure_ascii=False)
+
+
+def _reference(text: str) -> tuple[str, str, bool]:
+    """The old behaviour: split the whole buffer at the first marker."""
+    visible, marker, analysis = text.partition(ANALYSIS_MARKER)
+    return visible, analysis, bool(marker)
+
+
+def _run(tokens: list[str]) -> tuple[str, str, bool, AnalysisSplitter]:
+    splitter = AnalysisSplitter(ANALYSIS_MARKER)
+    visible, analysis = [], []
+    for token in tokens:
+        v, a = splitter.feed(token)
+        visible.append(v)
+        analysis.append(a)
+        # Released text is final: it must already agree with the whole-buffer split.
+        assert _reference("".join(tokens))[0].startswith("".join(visible))
+    visible.append(splitter.finish())
+    return "".join(visible), "".join(analysis), splitter.found, splitter
+
+
+@pytest.mark.parametrize("cut", range(len(TEXT) + 1))
+def test_two_tokens_split_at_every_position(cut):
+    visible, analysis, found, splitter = _run([TEXT[:cut], TEXT[cut:]])
+    assert (visible, analysis, found) == _reference(TEXT)
+    assert splitter.text == TEXT
+
+
+def test_marker_split_at_every_pair_of_positions():
+    # Three tokens whose boundaries fall anywhere inside (or around) the marker.
+    start = len(REPLY) - 2
+    end = len(REPLY) + len(ANALYSIS_MARKER) + 2
+    for i in range(start, end + 1):
+        for j in range(i, end + 1):
+            assert _run([TEXT[:i], TEXT[i:j], TEXT[j:]])[:3] == _reference(TEXT), (i, j)
+
+
+def test_single_character_tokens():
+    assert _run(list(TEXT))[:3] == _reference(TEXT)
+
+
+def test_no_marker_releases_partial_match_at_finish():
+    text = "Halo." + ANALYSIS_MARKER[:-1]
+    visible, analysis, found, splitter = _run([text])
+    assert (visible, analysis, found) == (text, "", False)
+    assert splitter.text == text
+
+
+@pytest.mark.parametrize("cut", range(len(TEXT) + 1))
+def test_analysis_json_parsed_across_every_boundary(cut):
+    splitter = AnalysisSplitter(ANALYSIS_MARKER)
+    scanner = JsonObjectScanner()
+    partial = {}
+    for token in (TEXT[:cut], TEXT[cut:]):
+        _, analysis = splitter.feed(token)
+        if analysis:
+            partial.update(scanner.feed(analysis))
+    assert scanner.last_object == ANALYSIS
+    assert partial == ANALYSIS
+
+
+def _noisy_text(rng: random.Random) -> str:
+    """Replies sprinkled with marker prefixes and overlapping near-misses, with or without the marker."""
+    pieces = []
+    for _ in range(rng.randint(0, 12)):
+        r = rng.random()
+        if r < 0.4:
+            pieces.append(ANALYSIS_MARKER[: rng.randint(1, len(ANALYSIS_MARKER) - 1)])
+        elif r < 0.5:
+            pieces.append("\n" * rng.randint(1, 4) + "[[" * rng.randint(1, 3))
+        else:
+            pieces.append("".join(rng.choice("ab \n[]{}\"") for _ in range(rng.randint(1, 10))))
+    if rng.random() < 0.7:
+        pieces.insert(rng.randint(0, len(pieces)), ANALYSIS_MARKER)
+    return "".join(pieces)
+
+
+def _random_chunks(rng: random.Random, text: str) -> list[str]:
+    chunks, i = [], 0
+    while i < len(text):
+        j = i + rng.choice([0, 1, 1, 2, 3, 5, 8, 20])
+        chunks.append(text[i:j])
+        i = j
+    return chunks
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_random_chunking_matches_whole_buffer_split(seed):
+    rng = random.Random(seed)
+    for _ in range(300):
+        text = _noisy_text(rng)
+        visible, analysis, found, splitter = _run(_random_chunks(rng, text))
+        assert (visible, analysis, found) == _reference(text), repr(text)
+        assert splitter.text == text
@@ -0,0 +1,102 @@
+import math
+import random
+
+import numpy as np
+import pytest
+
+from app.stress import LEVELS, StressSignals, compute_stress_index, compute_stress_index_batch
+from app.stress_profile import DEFAULT_PROFILE, SIGNALS, StressProfile
+
+# Values around every built-in band edge, plus the float specials the scalar path accepts.
+_SPECIALS = [0.0, -0.0, math.inf, -math.inf]
+_EDGES = {
+    "blinkPerMin": [6.0, 10.0, 22.0, 30.0, 55.0],
+    "jawOpenness": [0.15, 0.35, 0.6, 1.0],
+    "browTension": [0.0, 1.0],
+}
+_RANGES = {"blinkPerMin": (-5.0, 130.0), "jawOpenness": (-0.2, 1.3), "browTension": (-0.3, 1.3)}
+
+
+def _sample(rng: random.Random, name: str, edges: list[float]) -> float | None:
+    r = rng.random()
+    if r < 0.15:
+        return None
+    if r < 0.25:
+        return rng.choice(_SPECIALS)
+    if r < 0.5:
+        edge = rng.choice(edges)
+        return rng.choice([edge, math.nextafter(edge, -math.inf), math.nextafter(edge, math.inf)])
+    return rng.uniform(*_RANGES[name])
+
+
+def _columns(rng: random.Random, n: int, edges: dict[str, list[float]]) -> list[list[float | None]]:
+    return [[_sample(rng, name, edges[name]) for _ in range(n)] for name in SIGNALS]
+
+
+def _as_array(values: list[float | None]) -> np.ndarray:
+    return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+
+def _assert_bit_identical(columns, profile=None) -> None:
+    index, codes = compute_stress_index_batch(*(_as_array(c) for c in columns), profile=profile)
+    for i, (blink, jaw, brow) in enumerate(zip(*columns)):
+        si, level = compute_stress_index(StressSignals(blink, jaw, brow), profile)
+        if si is None:
+            assert math.isnan(index[i]) and codes[i] == 0, (blink, jaw, brow)
+        else:
+            assert np.float64(si).tobytes() == index[i].tobytes(), (blink, jaw, brow, si, index[i])
+            assert level == LEVELS[codes[i] - 1], (blink, jaw, brow)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_batch_matches_scalar_on_builtin_profile(seed):
+    _assert_bit_identical(_columns(random.Random(seed), 4000, _EDGES))
+
+
+def test_all_missing_and_nan_rows():
+    columns = [[None, None, math.nan], [None, math.nan, None], [None, None, None]]
+    index, codes = compute_stress_index_batch(*(_as_array(c) for c in columns))
+    assert np.isnan(index).all() and (codes == 0).all()
+
+
+def _random_profile(rng: random.Random) -> tuple[dict, dict[str, list[float]]]:
+    signals, edges = {}, {}
+    for name in rng.sample(SIGNALS, rng.randint(1, len(SIGNALS))):
+        lo, hi = _RANGES[name]
+        cuts = sorted(rng.uniform(lo, hi) for _ in range(rng.randint(0, 4)))
+        bands = []
+        for i, cut in enumerate(cuts):
+            band = {rng.choice(["below", "upTo"]): cut}
+            if rng.random() < 0.3:
+                band["value"] = rng.uniform(0, 1)
+            else:
+                band.update(
+                    offset=rng.uniform(-0.5, 0.5),
+                    x0=rng.uniform(lo, hi),
+                    sign=rng.choice([1, -1]),
+                    span=rng.choice([-1, 1]) * rng.uniform(0.05, hi - lo),
+                    scale=rng.uniform(0, 1.5),
+                )
+            bands.append(band)
+        bands.append({"x0": rng.uniform(lo, hi), "span": rng.uniform(0.05, hi - lo)})
+        signals[name] = {"weight": rng.uniform(0.1, 3.0), "bands": bands}
+        edges[name] = cuts or [lo]
+    for name in SIGNALS:
+        edges.setdefault(name, _EDGES[name])
+    cutoffs = sorted(rng.sample(range(1, 100), len(LEVELS) - 1))
+    return {"version": f"random-{rng.random()}", "signals": signals, "levels": cutoffs}, edges
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_batch_matches_scalar_on_random_profiles(seed):
+    rng = random.Random(1000 + seed)
+    spec, edges = _random_profile(rng)
+    profile = StressProfile(spec, len(LEVELS), source="test")
+    _assert_bit_identical(_columns(rng, 1500, edges), profile)
+
+
+def test_default_profile_matches_builtin_store():
+    profile = StressProfile(DEFAULT_PROFILE, len(LEVELS))
+    columns = _columns(random.Random(7), 2000, _EDGES)
+    _assert_bit_identical(columns, profile)
+    _assert_bit_identical(columns)
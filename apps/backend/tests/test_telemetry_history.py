@@ -0,0 +1,35 @@
+from app.face_tracker import FaceTelemetry
+from app.telemetry_history import TelemetryHistory
+
+
+def _tel(ts: float) -> FaceTelemetry:
+    return FaceTelemetry(ts, 12.0, 2.0, 0.1, 0.2, ts - 1000.0, "rendah")
+
+
+def test_backwards_timestamps_keep_buckets_sorted():
+    history = TelemetryHistory(capacity=64)
+    # A looping recording: the same ten seconds, twice.
+    for _ in range(2):
+        for i in range(10):
+            history.append(_tel(1000.0 + i))
+    result = history.query(1000.0, 1010.0, 1.0)
+    assert result["t"] == [1000.0 + i for i in range(10)]
+    assert result["count"] == [1] * 10
+    assert result["fields"]["stressIndex"]["mean"] == [float(i) for i in range(10)]
+
+
+def test_backwards_timestamp_on_a_full_ring():
+    history = TelemetryHistory(capacity=8)
+    for i in range(20):
+        history.append(_tel(1000.0 + i))
+    history.append(_tel(1005.5))
+    assert len(history) == 1
+    result = history.query(1000.0, 1020.0, 1.0)
+    assert result["t"] == [1005.0] and result["count"] == [1]
+
+
+def test_equal_timestamps_are_kept():
+    history = TelemetryHistory(capacity=8)
+    for ts in (1000.0, 1000.0, 1000.5):
+        history.append(_tel(ts))
+    assert history.query(1000.0, 1001.0, 1.0)["count"] == [3]
@@ -0,0 +1,24 @@
+import pytest
+
+from app.face_tracker import FaceTelemetry
+from app.telemetry_log import FILE_HEADER, LOG_MAGIC, LOG_VERSION, RECORD_SIZE, TelemetryLogReader, TelemetryRecorder
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "s.ctlog"
+    recorder = TelemetryRecorder(path)
+    tel = FaceTelemetry(1000.5, 12.0, None, 0.25, 0.5, 40.0, "sedang")
+    recorder.append(tel)
+    recorder.close()
+    with TelemetryLogReader(path) as reader:
+        assert len(reader) == 1
+        got = reader.telemetry(reader.records[0])
+    assert (got.ts, got.blinkPerMin, got.blinkPer10s, got.jawOpenness, got.level) == (1000.5, 12.0, None, 0.25, "sedang")
+
+
+@pytest.mark.parametrize("version, size", [(1, 32), (LOG_VERSION + 1, RECORD_SIZE), (LOG_VERSION, RECORD_SIZE - 4)])
+def test_other_layouts_are_rejected(tmp_path, version, size):
+    path = tmp_path / "old.ctlog"
+    path.write_bytes(FILE_HEADER.pack(LOG_MAGIC, version, size) + bytes(size * 2))
+    with pytest.raises(ValueError, match="unsupported telemetry log"):
+        TelemetryLogReader(path)
@@ -0,0 +1,76 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.face_tracker import FaceTracker
+from app.telemetry_log import LOG_SUFFIX
+from app.tracker_pool import TrackerPool
+
+
+@pytest.fixture
+def pool():
+    return TrackerPool(sources={"default": "camera:0", "door": "camera:2", "clip": "video:a.mp4"}, max_workers=1)
+
+
+@pytest.fixture
+def sessions(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRACK_RECORD_DIR", str(tmp_path))
+    (tmp_path / f"cam-1{LOG_SUFFIX}").write_bytes(b"")
+    return tmp_path
+
+
+def test_camera_index_aliases_resolve_to_the_configured_source(pool):
+    assert pool.resolve("0") == "default"
+    assert pool.resolve("0000") == "default"
+    assert pool.resolve("2") == "door"
+    assert pool.get("02") is pool.get("door")
+
+
+@pytest.mark.parametrize("sid", ["7", "²", "٣", "-1", "1e3", "camera:0", "replay:../etc"])
+def test_unconfigured_or_malformed_ids_are_rejected(pool, sid):
+    with pytest.raises(KeyError):
+        pool.resolve(sid)
+
+
+def test_replay_ids_are_canonical(pool, sessions):
+    assert pool.resolve("replay:cam-1") == "replay:cam-1@1"
+    assert pool.resolve("replay:cam-1@1.0") == "replay:cam-1@1"
+    assert pool.resolve(f"replay:cam-1{LOG_SUFFIX}@0.50") == "replay:cam-1@0.5"
+    for bad in ("replay:cam-1@-1", "replay:cam-1@inf", "replay:cam-1@nan", "replay:cam-1@x", "replay:missing"):
+        with pytest.raises(KeyError):
+            pool.resolve(bad)
+
+
+def test_idle_replay_trackers_are_evicted(pool, sessions):
+    for i in range(50):
+        pool.get(f"replay:cam-1@{i}")
+    assert len(pool._trackers) == 1
+
+
+def test_held_replay_tracker_is_not_evicted(pool, sessions, monkeypatch):
+    monkeypatch.setattr(FaceTracker, "_run", lambda self: self._stop_evt.wait())
+    held = pool.acquire("replay:cam-1@2")
+    try:
+        pool.get("replay:cam-1@3")
+        pool.get("replay:cam-1@4")
+        assert pool.get("replay:cam-1@2.0") is held
+    finally:
+        pool.release("replay:cam-1@2")
+    held._stopping.join(2.0)
+    assert held.idle
+
+
+def test_bad_source_is_a_404_not_a_500():
+    client = TestClient(main.app)
+    for sid in ("²", "99", "replay:nope"):
+        assert client.get("/api/face/stats", params={"source": sid}).status_code == 404
+    with client.websocket_connect("/ws/face?source=%C2%B2") as ws:
+        assert "unknown face source" in ws.receive_json()["error"]
+
+
+def test_pool_stats_endpoint_lists_opened_trackers():
+    client = TestClient(main.app)
+    client.get("/api/face/stats")
+    body = client.get("/api/face/pool").json()
+    assert body["execution"] == main.pool.execution
+    assert body["trackers"]["default"]["running"] is False
@@ -0,0 +1,40 @@
+import os
+import threading
+import time
+
+from app.face_tracker import FaceTelemetry, FaceTracker
+from app.telemetry_log import LOG_SUFFIX, TelemetryLogReader
+
+
+def _one_sample_run(self: FaceTracker) -> None:
+    self._publish(FaceTelemetry(time.time(), 12.0, 2.0, 0.2, 0.1, 20.0, "rendah"))
+    self._stop_evt.wait()
+
+
+def test_release_leaves_the_log_fsync_to_the_worker(tmp_path, monkeypatch):
+    monkeypatch.setenv("TRACK_RECORD_DIR", str(tmp_path))
+    monkeypatch.setattr(FaceTracker, "_run", _one_sample_run)
+    synced_on: list[str] = []
+    real_fsync = os.fsync
+
+    def fsync(fd):
+        synced_on.append(threading.current_thread().name)
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    tracker = FaceTracker(source="camera:0")
+    tracker.acquire()
+    deadline = time.time() + 5.0
+    while tracker.latest() is None and time.time() < deadline:
+        time.sleep(0.01)
+    worker = tracker._thread.name
+
+    tracker.release()
+    # release() runs on the caller (the event loop in /ws/face) and must not touch the disk.
+    assert threading.current_thread().name not in synced_on
+    tracker._stopping.join(5.0)
+    assert synced_on == [worker]
+
+    (path,) = tmp_path.glob(f"*{LOG_SUFFIX}")
+    with TelemetryLogReader(path) as reader:
+        assert len(reader) == 1
@@ -0,0 +1,30 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from app import main
+from app.face_tracker import FaceTelemetry, FaceTracker
+
+
+def _stalled_run(self: FaceTracker) -> None:
+    # One sample, then nothing: a camera that stopped delivering frames.
+    self._publish(FaceTelemetry(time.time(), 12.0, 2.0, 0.2, 0.1, 20.0, "rendah"))
+    self._stop_evt.wait()
+
+
+def test_disconnect_releases_tracker_when_source_stalls(monkeypatch):
+    monkeypatch.setattr(FaceTracker, "_run", _stalled_run)
+    released = threading.Event()
+    original_release = main.pool.release
+
+    def release(sid):
+        original_release(sid)
+        released.set()
+
+    monkeypatch.setattr(main.pool, "release", release)
+    client = TestClient(main.app)
+    with client.websocket_connect("/ws/face") as ws:
+        assert ws.receive_json()["stressIndex"] == 20.0
+    assert released.wait(5.0), "tracker was not released after the client disconnected"
+    assert main.pool.get().stats()["running"] is False
@@ -21,6 +21,23 @@ type Analysis = {
   disclaimer: string
 }
 
+// Fields arrive one by one while the reply streams; missing ones stay unset rather than defaulted.
+type PartialAnalysis = Partial<Analysis>
+
+const STRESS_LEVELS: ReadonlyArray<Analysis['stress_level']> = ['rendah', 'sedang', 'tinggi']
+
+function isCompleteAnalysis(a: PartialAnalysis | null): a is Analysis {
+  return (
+    !!a &&
+    Array.isArray(a.topics) &&
+    typeof a.summary === 'string' &&
+    STRESS_LEVELS.includes(a.stress_level as Analysis['stress_level']) &&
+    Array.isArray(a.early_actions) &&
+    Array.isArray(a.when_to_seek_help) &&
+    typeof a.disclaimer === 'string'
+  )
+}
+
 function tryExtractAnalysis(text: string): Analysis | null {
   // Look for [[ANALYSIS_JSON]] marker
   const marker = '[[ANALYSIS_JSON]]'
@@ -61,7 +78,7 @@ export default function App() {
     }
   ])
   const [isStreaming, setIsStreaming] = useState(false)
-  const [analysis, setAnalysis] = useState<Analysis | null>(null)
+  const [analysis, setAnalysis] = useState<PartialAnalysis | null>(null)
   const [analysisUpdated, setAnalysisUpdated] = useState(false)
   const [trackingEnabled, setTrackingEnabled] = useState(true)
 
@@ -97,6 +114,8 @@ export default function App() {
 
     const userText = input.trim()
     setInput('')
+    // The backend uses the latest summary in place of older turns it no longer sends to the model.
+    const previousSummary = analysis?.summary || undefined
     setAnalysis(null)
 
     const nextMessages: ChatMessage[] = [...messages, { role: 'user', content: userText }, { role: 'assistant', content: '' }]
@@ -129,7 +148,8 @@ export default function App() {
             .map((m) => ({ role: m.role, content: m.content }))
             // Backend supports 'system' but UI doesn't send it.
             .map((m) => m),
-          faceSignals
+          faceSignals,
+          summary: previousSummary
         })
       }, (evt) => {
         console.log('SSE Event received:', evt.event, evt.data) // Debug log
@@ -137,6 +157,11 @@ export default function App() {
           bufferRef.text += evt.data.token
           if (raf == null) raf = requestAnimationFrame(flush)
         }
+        if (evt.event === 'analysis_partial') {
+          // One field of the analysis JSON, sent as soon as the backend has parsed it.
+          const key = evt.data?.key as keyof Analysis | undefined
+          if (key) setAnalysis((prev) => ({ ...prev, [key]: evt.data.value }))
+        }
         if (evt.event === 'analysis') {
           const a = evt.data?.analysis as Analysis | undefined
           console.log('Received analysis event:', a)
@@ -193,8 +218,8 @@ export default function App() {
   }
 
   async function handleExportPDF() {
-    if (!analysis) {
-      alert('Belum ada analisis untuk diekspor. Kirim pesan terlebih dahulu.')
+    if (!isCompleteAnalysis(analysis)) {
+      alert('Belum ada analisis lengkap untuk diekspor. Tunggu sampai asisten selesai menjawab.')
       return
     }
     
@@ -393,7 +418,11 @@ export default function App() {
                   ))}
                 </ul>
                 <div className="muted">{analysis.disclaimer}</div>
-                <button className="exportBtn" onClick={() => void handleExportPDF()}>
+                <button
+                  className="exportBtn"
+                  disabled={isStreaming || !isCompleteAnalysis(analysis)}
+                  onClick={() => void handleExportPDF()}
+                >
                   Export PDF
                 </button>
               </>